@@ -0,0 +1,289 @@
+"""Recursive resolution of BINARY load chains across Qlik Sense applications"""
+
+import asyncio
+import re
+import time
+from datetime import datetime
+from typing import Annotated, Any
+
+from pydantic import BaseModel, Field, field_validator
+
+from .metadata_cache import get_metadata_cache
+from .script_cache import get_section_scan_cache
+from .single_flight import coalesce_calls
+from .tools import list_qlik_applications
+
+GUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+
+APP_FILE_EXTENSIONS = (".qvf", ".qvw")
+
+
+class GetBinaryChainArgs(BaseModel):
+    """Resolve the chain of BINARY loads behind a Qlik Sense application.
+
+    This tool reads the application's script, resolves the app each BINARY
+    statement loads from through the server's document list, and follows those
+    apps' BINARY statements recursively. Every hop reports its data sources,
+    and circular BINARY references are detected and reported.
+    """
+
+    app_id: Annotated[str, Field(
+        description="Qlik Sense application ID (GUID format or app name)",
+        min_length=1,
+        max_length=255,
+    )]
+    max_depth: Annotated[int, Field(
+        default=10,
+        description="Maximum number of BINARY hops to follow from the app.",
+        ge=1,
+        le=50,
+    )] = 10
+    include_data_sources: Annotated[bool, Field(
+        default=True,
+        description="Include each hop's file, database and binary data sources from its lineage.",
+    )] = True
+
+    @field_validator("app_id")
+    @classmethod
+    def validate_app_id(cls, v: str) -> str:
+        """Ensure app_id is not empty and properly formatted."""
+        if not v.strip():
+            raise ValueError("app_id cannot be empty or whitespace")
+        return v.strip()
+
+
+def find_binary_source_apps(source: str, applications: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Find the apps a BINARY source may refer to in a GetDocList result
+
+    A source is matched by the app ID it contains (server paths such as
+    lib://Apps/<id>), by the whole document path (Qlik Sense Desktop app IDs)
+    and finally by its file name without extension against the app titles.
+    More than one result means the title is ambiguous.
+    """
+    by_id = {app.get("app_id", "").lower(): app for app in applications}
+
+    guid = GUID_PATTERN.search(source)
+    if guid and guid.group(0).lower() in by_id:
+        return [by_id[guid.group(0).lower()]]
+
+    path = source.replace("\\", "/").lower()
+    for app_id, app in by_id.items():
+        if app_id.replace("\\", "/") == path:
+            return [app]
+
+    name = path.rsplit("/", 1)[-1]
+    if name.endswith(APP_FILE_EXTENSIONS):
+        name = name.rsplit(".", 1)[0]
+    return [app for app in applications if app.get("name", "").lower() == name]
+
+
+def find_binary_cycles(edges: dict[str, list[str]], root: str) -> list[list[str]]:
+    """Find the circular BINARY references reachable from the root app
+
+    Each cycle is returned as the list of app IDs along it, starting and
+    ending with the same app.
+    """
+    cycles = []
+    path: list[str] = []
+    on_path: set[str] = set()
+    done: set[str] = set()
+
+    def visit(app_id: str):
+        path.append(app_id)
+        on_path.add(app_id)
+        for upstream in edges.get(app_id, []):
+            if upstream in on_path:
+                cycles.append([*path[path.index(upstream):], upstream])
+            elif upstream not in done:
+                visit(upstream)
+        path.pop()
+        on_path.discard(app_id)
+        done.add(app_id)
+
+    visit(root)
+    return cycles
+
+
+async def fetch_binary_hop(app_id: str, include_data_sources: bool = True) -> dict[str, Any]:
+    """Fetch one app's BINARY statements and data sources, cached per app version
+
+    The script and the lineage are requested concurrently on one pooled
+    connection. RESIDENT and inline sources are left out of the data sources
+    since they do not leave the app.
+    """
+    from .connection_pool import get_connection_pool
+
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
+
+    try:
+        if client is None:
+            return {"error": "Failed to connect to Qlik Engine"}
+
+        cache = get_metadata_cache()
+        options = {"include_data_sources": include_data_sources}
+        version = await client.get_app_version()
+        cached = cache.get(app_id, "binary_chain_hop", options, version)
+        if cached is not None:
+            print(f"Using cached BINARY statements for app {app_id}")
+            return {"binary_loads": cached["binary_loads"], "data_sources": cached["data_sources"]}
+
+        if include_data_sources:
+            script_data, lineage = await asyncio.gather(
+                client.get_script(),
+                client.get_lineage(include_resident=False, include_inline_sources=False),
+            )
+            data_sources = lineage["data_sources"]
+        else:
+            script_data = await client.get_script()
+            data_sources = []
+
+        scan, _cache_info = get_section_scan_cache().scan(script_data["script"])
+        hop = {"binary_loads": scan.binary_loads, "data_sources": data_sources}
+        cache.put(app_id, "binary_chain_hop", options, version, hop)
+        return hop
+
+    except Exception as e:
+        return {"error": str(e)}
+
+    finally:
+        # Return the connection to the pool for reuse
+        await pool.release(client)
+
+
+@coalesce_calls
+async def get_binary_chain(
+    app_id: str,
+    max_depth: int = 10,
+    include_data_sources: bool = True,
+) -> dict[str, Any]:
+    """Follow an app's BINARY loads recursively through the upstream apps.
+
+    The document list and the app's own script are fetched concurrently; each
+    further level of upstream apps is then fetched concurrently as well. An app
+    reached along several paths is fetched once, and a BINARY statement leading
+    back to an app already on the path is reported as a cycle instead of being
+    followed.
+
+    Args:
+        app_id: The Qlik Sense application ID
+        max_depth: Maximum number of BINARY hops to follow
+        include_data_sources: Whether to include each hop's lineage data sources
+
+    Returns:
+        JSON object with one hop per app in breadth-first order, the cycles
+        found and the BINARY sources that could not be resolved to an app
+
+    """
+    started = time.perf_counter()
+
+    try:
+        doc_list, root_hop = await asyncio.gather(
+            list_qlik_applications(),
+            fetch_binary_hop(app_id, include_data_sources),
+        )
+        if "error" in doc_list:
+            return {
+                "error": f"Failed to list applications: {doc_list['error']}",
+                "app_id": app_id,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+        if "error" in root_hop:
+            return {
+                "error": root_hop["error"],
+                "app_id": app_id,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+        applications = doc_list["applications"]
+        names = {app.get("app_id", ""): app.get("name", "") for app in applications}
+
+        # App ID -> fetched hop, each app fetched once however often it is reached
+        hops = {app_id: root_hop}
+        depths = {app_id: 0}
+        edges: dict[str, list[str]] = {}
+        chain = []
+        unresolved = []
+        truncated = False
+
+        level = [app_id]
+        while level:
+            next_level = []
+            for current in level:
+                hop = hops[current]
+                entry = {
+                    "app_id": current,
+                    "app_name": names.get(current, ""),
+                    "depth": depths[current],
+                    "binary_loads": [],
+                }
+                if "error" in hop:
+                    entry["error"] = hop["error"]
+                    chain.append(entry)
+                    continue
+
+                edges[current] = []
+                for binary in hop["binary_loads"]:
+                    candidates = find_binary_source_apps(binary["source_app"], applications)
+                    resolved = candidates[0]["app_id"] if len(candidates) == 1 else None
+                    entry["binary_loads"].append({
+                        "source_app": binary["source_app"],
+                        "line_number": binary["line_number"],
+                        "resolved_app_id": resolved,
+                        "resolved_app_name": names.get(resolved, "") if resolved else None,
+                    })
+
+                    if resolved is None:
+                        unresolved.append({
+                            "app_id": current,
+                            "source_app": binary["source_app"],
+                            "line_number": binary["line_number"],
+                            "reason": "ambiguous app name" if candidates else "no matching app",
+                        })
+                        continue
+
+                    edges[current].append(resolved)
+                    if resolved in depths:
+                        continue
+                    if depths[current] >= max_depth:
+                        truncated = True
+                        continue
+                    depths[resolved] = depths[current] + 1
+                    next_level.append(resolved)
+
+                if include_data_sources:
+                    entry["data_sources"] = hop["data_sources"]
+                    entry["data_source_count"] = len(hop["data_sources"])
+                chain.append(entry)
+
+            # Fetch every upstream app of the next level concurrently
+            results = await asyncio.gather(
+                *(fetch_binary_hop(upstream, include_data_sources) for upstream in next_level),
+            )
+            hops.update(zip(next_level, results))
+            level = next_level
+
+        cycles = find_binary_cycles(edges, app_id)
+
+        return {
+            "app_id": app_id,
+            "retrieved_at": datetime.utcnow().isoformat(),
+            "chain": chain,
+            "app_count": len(chain),
+            "max_chain_depth": max(depths.values()),
+            "cycles": cycles,
+            "unresolved_sources": unresolved,
+            "truncated": truncated,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            "options": {
+                "max_depth": max_depth,
+                "include_data_sources": include_data_sources,
+            },
+        }
+
+    except Exception as e:
+        return {
+            "error": str(e),
+            "app_id": app_id,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
@@ -0,0 +1,351 @@
+"""Fleet-wide metadata extraction across many Qlik Sense applications"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated, Any, TextIO
+
+from pydantic import BaseModel, Field
+
+from .connection_pool import get_connection_pool
+from .cpu_pool import configure_cpu_pool
+from .metadata_cache import get_metadata_cache
+from .tools import get_app_snapshot, list_qlik_applications
+
+# Snapshot sections that can be selected for a bulk run
+SNAPSHOT_SECTIONS = (
+    "measures",
+    "dimensions",
+    "variables",
+    "fields",
+    "sheets",
+    "sheet_objects",
+    "script_analysis",
+    "lineage",
+)
+
+# Directory the MCP tool writes its JSONL files to unless QLIK_BULK_OUTPUT_DIR is set
+DEFAULT_OUTPUT_DIR = "~/qlik-fleet-exports"
+
+
+class ExtractFleetMetadataArgs(BaseModel):
+    """Extract metadata from many Qlik Sense applications into a JSONL file.
+
+    This tool lists the applications on the server, selects them with the given
+    filters, and extracts a snapshot of each one concurrently (bounded by one
+    global parallelism limit). Every app is written as one JSON line as soon as it finishes; apps that
+    fail are recorded with an error and do not stop the run.
+    """
+
+    output_path: Annotated[str, Field(
+        description=(
+            "JSONL file to write (one app per line), relative to the server's output directory "
+            "(QLIK_BULK_OUTPUT_DIR). Absolute paths and '..' are rejected."
+        ),
+        min_length=1,
+    )]
+    overwrite: Annotated[bool, Field(
+        default=False,
+        description="Replace the output file if it already exists.",
+    )] = False
+    name_filter: Annotated[str | None, Field(
+        default=None,
+        description="Wildcard pattern matched against app names, e.g. 'Sales*'.",
+    )] = None
+    stream_filter: Annotated[str | None, Field(
+        default=None,
+        description="Wildcard pattern matched against stream names.",
+    )] = None
+    app_ids: Annotated[list[str] | None, Field(
+        default=None,
+        description="Restrict the run to these application IDs.",
+    )] = None
+    limit: Annotated[int | None, Field(
+        default=None,
+        description="Maximum number of apps to process.",
+        ge=1,
+    )] = None
+    sections: Annotated[list[str] | None, Field(
+        default=None,
+        description=f"Snapshot sections to extract: {', '.join(SNAPSHOT_SECTIONS)} (default: all).",
+    )] = None
+    parallelism: Annotated[int | None, Field(
+        default=None,
+        description=(
+            "Maximum apps processed concurrently across the whole run; all apps go through the one "
+            "configured Engine endpoint (default: QLIK_BULK_PARALLELISM or 4)."
+        ),
+        ge=1,
+        le=64,
+    )] = None
+    rebuild_cache: Annotated[bool, Field(
+        default=False,
+        description="Discard cached responses (memory and disk) and extract every app fresh.",
+    )] = False
+    cpu_workers: Annotated[int | None, Field(
+        default=None,
+        description=(
+            "Worker processes for script analysis of large scripts (default: QLIK_CPU_POOL_WORKERS or 0, "
+            "which keeps the work in-process)."
+        ),
+        ge=0,
+        le=64,
+    )] = None
+
+
+def filter_applications(
+    applications: list[dict[str, Any]],
+    name_filter: str | None = None,
+    stream_filter: str | None = None,
+    app_ids: list[str] | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Select applications from a GetDocList result
+
+    Names and streams are matched case-insensitively with shell-style wildcards.
+    """
+    selected = []
+    wanted_ids = set(app_ids or [])
+
+    for app in applications:
+        if wanted_ids and app.get("app_id") not in wanted_ids:
+            continue
+        if name_filter and not fnmatch.fnmatch(app.get("name", "").lower(), name_filter.lower()):
+            continue
+        if stream_filter:
+            stream = app.get("meta", {}).get("stream") or {}
+            if not fnmatch.fnmatch(str(stream.get("name", "")).lower(), stream_filter.lower()):
+                continue
+        selected.append(app)
+
+    return selected[:limit] if limit else selected
+
+
+def resolve_output_path(output_path: str, overwrite: bool = False) -> Path:
+    """Resolve a caller-supplied output file inside the configured output directory
+
+    Used by the MCP tool, whose callers must not be able to write arbitrary files.
+
+    Raises:
+        ValueError: If the path is absolute, leaves the output directory or
+            names an existing file without overwrite
+
+    """
+    base = Path(os.getenv("QLIK_BULK_OUTPUT_DIR", DEFAULT_OUTPUT_DIR)).expanduser().resolve()
+    relative = Path(output_path)
+    if relative.anchor or ".." in relative.parts:
+        raise ValueError("output_path must be a relative path without '..'")
+
+    path = (base / relative).resolve()
+    if not path.is_relative_to(base):
+        raise ValueError("output_path must stay inside the output directory")
+    if path.exists() and not overwrite:
+        raise ValueError(f"{output_path} already exists; set overwrite to replace it")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+async def _extract_app(
+    app: dict[str, Any],
+    sections: tuple[str, ...],
+    limiter: asyncio.Semaphore,
+) -> dict[str, Any]:
+    """Extract one app's snapshot, never raising"""
+    app_id = app.get("app_id", "")
+    async with limiter:
+        started = time.perf_counter()
+        try:
+            # Bypass the metadata cache so a fleet run does not evict the interactive tools' entries
+            snapshot = await get_app_snapshot(
+                app_id,
+                use_cache=False,
+                **{f"include_{section}": section in sections for section in SNAPSHOT_SECTIONS},
+            )
+        except Exception as e:
+            snapshot = {"error": str(e), "app_id": app_id, "timestamp": datetime.utcnow().isoformat()}
+
+    return {
+        "app_name": app.get("name", ""),
+        "last_reload_time": app.get("last_reload_time", ""),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        **snapshot,
+    }
+
+
+async def extract_fleet(
+    applications: list[dict[str, Any]],
+    output: TextIO,
+    sections: tuple[str, ...] = SNAPSHOT_SECTIONS,
+    parallelism: int | None = None,
+) -> dict[str, Any]:
+    """Extract snapshots for many apps concurrently, streaming JSONL to output
+
+    Each app is written as one line as soon as it finishes. Apps that fail are
+    written with an "error" key and do not stop the run.
+    """
+    if parallelism is None:
+        parallelism = int(os.getenv("QLIK_BULK_PARALLELISM", "4"))
+    # Every app is served through the one configured Engine endpoint, so this is
+    # a single limit for the run; which node serves an app is not visible here
+    parallelism = max(1, parallelism)
+    limiter = asyncio.Semaphore(parallelism)
+
+    started = time.perf_counter()
+    succeeded = 0
+    failures = []
+
+    tasks = [asyncio.ensure_future(_extract_app(app, sections, limiter)) for app in applications]
+    for finished in asyncio.as_completed(tasks):
+        record = await finished
+        output.write(json.dumps(record, default=str) + "\n")
+        output.flush()
+
+        if "error" in record:
+            failures.append({"app_id": record.get("app_id", ""), "error": record["error"]})
+        else:
+            succeeded += 1
+
+    return {
+        "apps_selected": len(applications),
+        "succeeded": succeeded,
+        "failed": len(failures),
+        "failures": failures,
+        "parallelism": parallelism,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+async def extract_fleet_metadata(
+    output_path: str,
+    name_filter: str | None = None,
+    stream_filter: str | None = None,
+    app_ids: list[str] | None = None,
+    limit: int | None = None,
+    sections: list[str] | None = None,
+    parallelism: int | None = None,
+    rebuild_cache: bool = False,
+    cpu_workers: int | None = None,
+    overwrite: bool = True,
+) -> dict[str, Any]:
+    """Select apps from the doc list and extract their metadata to a JSONL file.
+
+    Args:
+        output_path: File the JSONL results are written to
+        name_filter: Wildcard pattern matched against app names
+        stream_filter: Wildcard pattern matched against stream names
+        app_ids: Restrict the run to these app IDs
+        limit: Maximum number of apps to process
+        sections: Snapshot sections to extract (default: all)
+        parallelism: Maximum apps processed concurrently
+        rebuild_cache: Discard cached responses (memory and disk) before the run
+        cpu_workers: Worker processes for analyzing large scripts (0 keeps it in-process)
+        overwrite: Whether an existing output file may be replaced
+
+    Returns:
+        JSON object summarizing the run
+
+    """
+    sections = tuple(sections or SNAPSHOT_SECTIONS)
+    unknown = [section for section in sections if section not in SNAPSHOT_SECTIONS]
+    if unknown:
+        return {
+            "error": f"Unknown sections: {', '.join(unknown)}",
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    if rebuild_cache:
+        get_metadata_cache().invalidate()
+
+    if cpu_workers is not None:
+        configure_cpu_pool(workers=cpu_workers)
+
+    doc_list = await list_qlik_applications()
+    if "error" in doc_list:
+        return doc_list
+
+    applications = filter_applications(
+        doc_list["applications"],
+        name_filter=name_filter,
+        stream_filter=stream_filter,
+        app_ids=app_ids,
+        limit=limit,
+    )
+    print(f"Selected {len(applications)} of {doc_list['count']} applications", file=sys.stderr)
+
+    try:
+        with open(output_path, "w" if overwrite else "x", encoding="utf-8") as output:
+            summary = await extract_fleet(applications, output, sections=sections, parallelism=parallelism)
+    except OSError as e:
+        return {
+            "error": f"Cannot write {output_path}: {e}",
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    return {
+        **summary,
+        "output_path": output_path,
+        "sections": list(sections),
+        "completed_at": datetime.utcnow().isoformat(),
+    }
+
+
+def main():
+    """Command line entry point for fleet-wide extraction"""
+    parser = argparse.ArgumentParser(description="Extract metadata from many Qlik Sense apps to JSONL")
+    parser.add_argument("--output", "-o", required=True, help="JSONL file to write results to")
+    parser.add_argument("--name", help="Wildcard filter on app names, e.g. 'Sales*'")
+    parser.add_argument("--stream", help="Wildcard filter on stream names")
+    parser.add_argument("--app-id", action="append", dest="app_ids", help="Only this app ID (repeatable)")
+    parser.add_argument("--limit", type=int, help="Maximum number of apps to process")
+    parser.add_argument(
+        "--sections",
+        default=",".join(SNAPSHOT_SECTIONS),
+        help=f"Comma-separated sections to extract (default: {','.join(SNAPSHOT_SECTIONS)})",
+    )
+    parser.add_argument("--parallelism", type=int, help="Apps processed concurrently (default: 4)")
+    parser.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="Discard cached responses, including the disk cache, before extracting",
+    )
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        help="Worker processes for analyzing large scripts (default: QLIK_CPU_POOL_WORKERS or 0)",
+    )
+    args = parser.parse_args()
+
+    sections = [section.strip() for section in args.sections.split(",") if section.strip()]
+
+    async def run() -> dict[str, Any]:
+        try:
+            return await extract_fleet_metadata(
+                output_path=args.output,
+                name_filter=args.name,
+                stream_filter=args.stream,
+                app_ids=args.app_ids,
+                limit=args.limit,
+                sections=sections,
+                parallelism=args.parallelism,
+                rebuild_cache=args.rebuild_cache,
+                cpu_workers=args.cpu_workers,
+            )
+        finally:
+            # Close the pooled Engine sessions before the event loop goes away
+            await get_connection_pool().close_all()
+
+    summary = asyncio.run(run())
+
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    sys.exit(1 if "error" in summary else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Connection pool for reusing opened Qlik Engine app sessions across tool calls"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from .qlik_client import AsyncQlikClient
+
+
+@dataclass
+class PooledConnection:
+    """An opened Qlik Engine connection tracked by the pool"""
+
+    client: AsyncQlikClient
+    key: tuple[str, str, str]
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class QlikConnectionPool:
+    """Pool of opened app connections keyed by (server, user, app_id)
+
+    Connections are borrowed with acquire() and handed back with release().
+    Idle connections are kept open until they exceed the idle timeout or are
+    evicted (least recently used first) to respect the maximum pool size.
+    Connections that have been idle for longer than the health check interval
+    are verified before being handed out again.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        idle_timeout: float | None = None,
+        health_check_interval: float | None = None,
+        enabled: bool | None = None,
+    ):
+        """Initialize pool with configuration from arguments or environment"""
+        self.max_size = max_size if max_size is not None else int(os.getenv("QLIK_POOL_MAX_SIZE", "8"))
+        self.idle_timeout = (
+            idle_timeout if idle_timeout is not None else float(os.getenv("QLIK_POOL_IDLE_TIMEOUT", "300"))
+        )
+        self.health_check_interval = (
+            health_check_interval
+            if health_check_interval is not None
+            else float(os.getenv("QLIK_POOL_HEALTH_CHECK_INTERVAL", "30"))
+        )
+        self.enabled = (
+            enabled if enabled is not None else os.getenv("QLIK_POOL_ENABLED", "true").lower() == "true"
+        )
+
+        # Idle connections in least-recently-used order (oldest first)
+        self._idle: list[PooledConnection] = []
+        self._in_use: dict[int, PooledConnection] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "created": 0,
+            "reused": 0,
+            "evicted": 0,
+            "expired": 0,
+            "unhealthy": 0,
+        }
+
+    @staticmethod
+    def make_key(client: AsyncQlikClient, app_id: str) -> tuple[str, str, str]:
+        """Build the pool key for an app on the client's server and user"""
+        return (
+            f"{client.server_url}:{client.server_port}",
+            f"{client.user_directory}\\{client.user_id}",
+            app_id,
+        )
+
+    async def acquire(self, app_id: str) -> AsyncQlikClient | None:
+        """Borrow a connection with the app opened, or None if connecting fails"""
+        client = AsyncQlikClient()
+        key = self.make_key(client, app_id)
+
+        if self.enabled:
+            entry = await self._take_idle(key)
+            while entry is not None:
+                if await self._is_healthy(entry):
+                    print(f"Reusing pooled connection for app: {app_id}")
+                    entry.last_used = time.monotonic()
+                    with self._lock:
+                        self._in_use[id(entry.client)] = entry
+                        self.stats["reused"] += 1
+                    return entry.client
+
+                await entry.client.disconnect()
+                with self._lock:
+                    self.stats["unhealthy"] += 1
+                entry = await self._take_idle(key)
+
+        if not await client.connect(app_id):
+            await client.disconnect()
+            return None
+
+        entry = PooledConnection(client=client, key=key)
+        with self._lock:
+            self._in_use[id(client)] = entry
+            self.stats["created"] += 1
+        return client
+
+    async def release(self, client: AsyncQlikClient | None, discard: bool = False):
+        """Return a borrowed connection to the pool (or close it if discarded)"""
+        if client is None:
+            return
+
+        with self._lock:
+            entry = self._in_use.pop(id(client), None)
+
+        if entry is None or discard or not self.enabled or not client.ws:
+            await client.disconnect()
+            return
+
+        entry.last_used = time.monotonic()
+        to_close = []
+        with self._lock:
+            self._idle.append(entry)
+            to_close.extend(self._prune_locked())
+            while len(self._idle) > self.max_size:
+                to_close.append(self._idle.pop(0))
+                self.stats["evicted"] += 1
+
+        for stale in to_close:
+            await stale.client.disconnect()
+
+    async def close_all(self):
+        """Close every idle connection held by the pool"""
+        with self._lock:
+            to_close = self._idle
+            self._idle = []
+
+        for entry in to_close:
+            await entry.client.disconnect()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return pool counters and current sizes"""
+        with self._lock:
+            return {
+                **self.stats,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "max_size": self.max_size,
+            }
+
+    async def _take_idle(self, key: tuple[str, str, str]) -> PooledConnection | None:
+        """Remove and return the most recently used idle connection for a key"""
+        to_close = []
+        entry = None
+        with self._lock:
+            to_close.extend(self._prune_locked())
+            for index in range(len(self._idle) - 1, -1, -1):
+                if self._idle[index].key == key:
+                    entry = self._idle.pop(index)
+                    break
+
+        for stale in to_close:
+            await stale.client.disconnect()
+
+        return entry
+
+    def _prune_locked(self) -> list[PooledConnection]:
+        """Drop idle connections past the idle timeout (caller holds the lock)"""
+        now = time.monotonic()
+        expired = [entry for entry in self._idle if now - entry.last_used > self.idle_timeout]
+        if expired:
+            self._idle = [entry for entry in self._idle if now - entry.last_used <= self.idle_timeout]
+            self.stats["expired"] += len(expired)
+        return expired
+
+    async def _is_healthy(self, entry: PooledConnection) -> bool:
+        """Check an idle connection before reuse if it has been idle a while"""
+        if not entry.client.ws:
+            return False
+        # Connections are bound to the event loop they were opened on
+        if entry.client.loop is not asyncio.get_running_loop():
+            return False
+        if time.monotonic() - entry.last_used < self.health_check_interval:
+            return True
+        return await entry.client.ping()
+
+
+_pool: QlikConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> QlikConnectionPool:
+    """Get the process-wide connection pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = QlikConnectionPool()
+        return _pool
@@ -0,0 +1,109 @@
+"""Process pool for CPU-bound script work in bulk and multi-app requests"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+
+class CpuPool:
+    """Run CPU-bound functions in worker processes once inputs are large enough
+
+    Script lexing, analysis and sanitization hold the GIL, so on the event loop
+    they serialize behind each other and stall the network I/O of other apps.
+    Inputs below the size threshold stay in the calling process, where pickling
+    and transferring them would cost more than it saves. With zero workers every
+    call runs in-process.
+    """
+
+    def __init__(self, workers: int | None = None, threshold_bytes: int | None = None):
+        """Initialize with configuration from arguments or environment"""
+        self.workers = workers if workers is not None else int(os.getenv("QLIK_CPU_POOL_WORKERS", "0"))
+        self.threshold_bytes = (
+            threshold_bytes
+            if threshold_bytes is not None
+            else int(float(os.getenv("QLIK_CPU_POOL_THRESHOLD_KB", "256")) * 1024)
+        )
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "in_process": 0,
+            "offloaded": 0,
+            "fallbacks": 0,
+        }
+
+    async def run(self, func: Callable[..., Any], *args: Any, size: int) -> Any:
+        """Call func(*args) in a worker process, or in-process for small inputs
+
+        func and its arguments must be picklable (module-level functions).
+        If the pool breaks, the call is retried in-process.
+        """
+        if self.workers <= 0 or size < self.threshold_bytes:
+            self.stats["in_process"] += 1
+            return func(*args)
+
+        executor = self._get_executor()
+        self.stats["offloaded"] += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            print("CPU pool broke, running in-process and restarting the pool")
+            self.stats["fallbacks"] += 1
+            self.shutdown()
+            return func(*args)
+
+    def shutdown(self):
+        """Stop the worker processes (they are restarted on the next offloaded call)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return call counters and configuration"""
+        return {
+            **self.stats,
+            "workers": self.workers,
+            "threshold_bytes": self.threshold_bytes,
+            "running": self._executor is not None,
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the executor on first use"""
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers do not inherit the event loop and socket threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+
+_cpu_pool: CpuPool | None = None
+_cpu_pool_lock = threading.Lock()
+
+
+def get_cpu_pool() -> CpuPool:
+    """Get the process-wide CPU pool, creating it on first use"""
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            _cpu_pool = CpuPool()
+        return _cpu_pool
+
+
+def configure_cpu_pool(workers: int | None = None, threshold_bytes: int | None = None) -> CpuPool:
+    """Replace the process-wide CPU pool, e.g. to size it for a bulk run"""
+    global _cpu_pool
+    with _cpu_pool_lock:
+        previous, _cpu_pool = _cpu_pool, CpuPool(workers=workers, threshold_bytes=threshold_bytes)
+    if previous is not None:
+        previous.shutdown()
+    return _cpu_pool
@@ -0,0 +1,335 @@
+"""In-process and on-disk caches of tool responses keyed by app version"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+
+def app_version_stamp(last_reload_time: str, modified_date: str) -> str:
+    """Build the version stamp identifying a saved and reloaded app state"""
+    return f"{last_reload_time or ''}|{modified_date or ''}"
+
+
+def engine_identity() -> str:
+    """Identify the Engine and user whose access rights shaped the responses"""
+    return (
+        f"{os.getenv('QLIK_SERVER_URL', '')}:{os.getenv('QLIK_SERVER_PORT', '4747')}|"
+        f"{os.getenv('QLIK_USER_DIRECTORY', 'INTERNAL')}\\{os.getenv('QLIK_USER_ID', 'sa_engine')}"
+    )
+
+
+class DiskCache:
+    """SQLite store of tool responses that survives server restarts
+
+    Responses are stored as (optionally zlib-compressed) JSON together with the
+    app version they were built from. When the stored payloads exceed the size
+    limit the least recently read entries are deleted first. Each Engine and
+    user gets its own database file, so responses built under one user's access
+    rights are never served to another.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int | None = None,
+        compress: bool | None = None,
+        rebuild: bool | None = None,
+        identity: str | None = None,
+    ):
+        """Open (or create) the cache database for the Engine and user in the given directory"""
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("QLIK_DISK_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.compress = (
+            compress if compress is not None else os.getenv("QLIK_DISK_CACHE_COMPRESS", "true").lower() == "true"
+        )
+        rebuild = rebuild if rebuild is not None else os.getenv("QLIK_DISK_CACHE_REBUILD", "false").lower() == "true"
+
+        self.identity = identity if identity is not None else engine_identity()
+        identity_hash = hashlib.blake2b(self.identity.encode("utf-8"), digest_size=8).hexdigest()
+        self.path = Path(directory).expanduser() / f"metadata_cache_{identity_hash}.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                app_id TEXT NOT NULL,
+                tool TEXT NOT NULL,
+                options TEXT NOT NULL,
+                version TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                compressed INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                cached_at TEXT NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (app_id, tool, options)
+            )
+            """,
+        )
+        self._db.commit()
+
+        if rebuild:
+            print(f"Rebuilding disk cache at {self.path}")
+            self.clear()
+
+    def get(self, key: tuple[str, str, str], version: str) -> dict[str, Any] | None:
+        """Return the stored entry for the key if it matches the app version"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT version, payload, compressed, cached_at FROM entries "
+                "WHERE app_id = ? AND tool = ? AND options = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+
+            stored_version, payload, compressed, cached_at = row
+            if stored_version != version:
+                self._db.execute("DELETE FROM entries WHERE app_id = ? AND tool = ? AND options = ?", key)
+                self._db.commit()
+                return None
+
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE app_id = ? AND tool = ? AND options = ?",
+                (time.time(), *key),
+            )
+            self._db.commit()
+
+        if compressed:
+            payload = zlib.decompress(payload)
+        return {
+            "version": stored_version,
+            "response": json.loads(payload),
+            "cached_at": cached_at,
+        }
+
+    def put(self, key: tuple[str, str, str], version: str, response: dict[str, Any], cached_at: str):
+        """Store a response and evict old entries beyond the size limit"""
+        payload = json.dumps(response, default=str).encode("utf-8")
+        if self.compress:
+            payload = zlib.compress(payload)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, version, payload, int(self.compress), len(payload), cached_at, time.time()),
+            )
+            self._evict_locked()
+            self._db.commit()
+
+    def invalidate(self, app_id: str | None = None):
+        """Delete stored responses for one app, or for every app"""
+        if app_id is None:
+            self.clear()
+            return
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE app_id = ?", (app_id,))
+            self._db.commit()
+
+    def clear(self):
+        """Delete every stored response"""
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._db.execute("VACUUM")
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return entry count and stored size"""
+        with self._lock:
+            count, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {
+            "path": str(self.path),
+            "entries": count,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "compress": self.compress,
+        }
+
+    def _evict_locked(self):
+        """Delete least recently read entries until under the size limit (caller holds the lock)"""
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute(
+            "SELECT app_id, tool, options, size FROM entries ORDER BY last_access",
+        ).fetchall()
+        for app_id, tool, options, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute(
+                "DELETE FROM entries WHERE app_id = ? AND tool = ? AND options = ?",
+                (app_id, tool, options),
+            )
+            total -= size
+
+
+class MetadataCache:
+    """LRU cache of tool responses keyed by (app_id, tool, normalized options)
+
+    Every entry remembers the app version it was built from. A lookup with a
+    different version drops the entry, so a save or reload of the app is never
+    answered from stale data.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        enabled: bool | None = None,
+        disk_cache: DiskCache | None = None,
+    ):
+        """Initialize cache with configuration from arguments or environment
+
+        Without an explicit disk cache one is opened when QLIK_DISK_CACHE_DIR is set.
+        """
+        self.max_entries = (
+            max_entries if max_entries is not None else int(os.getenv("QLIK_CACHE_MAX_ENTRIES", "256"))
+        )
+        self.enabled = (
+            enabled if enabled is not None else os.getenv("QLIK_CACHE_ENABLED", "true").lower() == "true"
+        )
+        if disk_cache is None and os.getenv("QLIK_DISK_CACHE_DIR"):
+            disk_cache = DiskCache(os.getenv("QLIK_DISK_CACHE_DIR"))
+        self.disk_cache = disk_cache
+
+        self._entries: OrderedDict[tuple[str, str, str], dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "evicted": 0,
+            "disk_hits": 0,
+        }
+
+    @staticmethod
+    def make_key(app_id: str, tool: str, options: dict[str, Any] | None = None) -> tuple[str, str, str]:
+        """Build the cache key with options normalized to a stable string"""
+        return (app_id, tool, json.dumps(options or {}, sort_keys=True, default=str))
+
+    def get(
+        self,
+        app_id: str,
+        tool: str,
+        options: dict[str, Any] | None,
+        version: str,
+    ) -> dict[str, Any] | None:
+        """Return the cached response if it was built from the same app version"""
+        if not self.enabled:
+            return None
+
+        key = self.make_key(app_id, tool, options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["version"] != version:
+                del self._entries[key]
+                self.stats["stale"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._served(entry)
+
+        # Fall back to responses persisted by an earlier server process
+        entry = self.disk_cache.get(key, version) if self.disk_cache else None
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._store_locked(key, entry)
+            self.stats["hits"] += 1
+            self.stats["disk_hits"] += 1
+        return self._served(entry)
+
+    def put(
+        self,
+        app_id: str,
+        tool: str,
+        options: dict[str, Any] | None,
+        version: str,
+        response: dict[str, Any],
+    ):
+        """Store a response built from the given app version
+
+        Failed responses ("error") and partial ones with failed sections
+        ("errors") are not stored, so the next call fetches them again.
+        """
+        if not self.enabled or "error" in response or "errors" in response:
+            return
+
+        key = self.make_key(app_id, tool, options)
+        entry = {
+            "version": version,
+            "response": response,
+            "cached_at": datetime.utcnow().isoformat(),
+        }
+        with self._lock:
+            self._store_locked(key, entry)
+
+        if self.disk_cache:
+            self.disk_cache.put(key, version, response, entry["cached_at"])
+
+    def invalidate(self, app_id: str | None = None):
+        """Drop cached responses for one app, or for every app"""
+        with self._lock:
+            if app_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == app_id]:
+                    del self._entries[key]
+
+        if self.disk_cache:
+            self.disk_cache.invalidate(app_id)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return cache counters and current size"""
+        with self._lock:
+            stats = {
+                **self.stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+        if self.disk_cache:
+            stats["disk"] = self.disk_cache.get_stats()
+        return stats
+
+    def _store_locked(self, key: tuple[str, str, str], entry: dict[str, Any]):
+        """Insert an entry and evict beyond max_entries (caller holds the lock)"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evicted"] += 1
+
+    @staticmethod
+    def _served(entry: dict[str, Any]) -> dict[str, Any]:
+        """Build the response returned for a cache hit"""
+        return {
+            **entry["response"],
+            "served_from_cache": True,
+            "cached_at": entry["cached_at"],
+        }
+
+
+_cache: MetadataCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Get the process-wide metadata cache, creating it on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache()
+        return _cache
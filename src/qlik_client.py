@@ -1,19 +1,170 @@
-"""Simplified Qlik WebSocket client for measure retrieval"""
+"""Qlik Engine API clients (asyncio-native with a blocking facade)"""
 
+import asyncio
+import base64
+import binascii
 import json
 import os
 import ssl
+import threading
+from collections.abc import Callable
 from typing import Any
 
-import websocket
 from dotenv import load_dotenv
+from websockets.asyncio.client import ClientConnection
+from websockets.asyncio.client import connect as ws_connect
+
+from .metadata_cache import app_version_stamp
 
 # Load environment variables
 load_dotenv()
 
 
-class QlikClient:
-    """Comprehensive Qlik Engine API client for accessing all Qlik Sense application objects"""
+def categorize_data_source(discriminator: str, statement: str | None = None) -> str:
+    """Categorize a lineage data source as binary, resident, file, inline or other"""
+    discriminator_lower = discriminator.lower()
+
+    # Check for binary sources
+    if statement and statement.lower() == "binary":
+        return "binary"
+
+    # Check for resident sources
+    if discriminator_lower.startswith("resident "):
+        return "resident"
+
+    # Check for inline sources
+    if discriminator_lower.startswith("inline"):
+        return "inline"
+
+    # Check for file sources (paths, URLs, etc.)
+    if any(indicator in discriminator_lower for indicator in [
+        "\\", "/", ".", "lib://", "http://", "https://", "ftp://", ".txt", ".csv", ".xlsx", ".qvd",
+    ]):
+        return "file"
+
+    # Everything else
+    return "other"
+
+
+# Object types whose embedded objects are extracted from their effective properties
+CONTAINER_TYPES = ("vizlibcontainer", "container", "qlik-tabbed-container")
+
+
+def encode_container_cursor(app_id: str, sheet_id: str, container_id: str, depth: int) -> str:
+    """Encode the token a container stub carries for expanding it later"""
+    payload = json.dumps({"app_id": app_id, "sheet_id": sheet_id, "container_id": container_id, "depth": depth})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_container_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a container stub's cursor, raising ValueError if it is malformed"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid container cursor: {e}") from e
+    if not isinstance(payload, dict) or not all(key in payload for key in ("app_id", "container_id", "depth")):
+        raise ValueError("Invalid container cursor: missing fields")
+    return payload
+
+
+class ObjectCache:
+    """Object handles and per-handle results of one Engine session
+
+    Handles are keyed by qId, so an object is opened once per session however
+    often it is referenced. Layouts and properties are kept per handle until the
+    Engine pushes the handle in a change list (its layout is invalid) or a close
+    list (the handle is gone). Handles only exist in the session that opened
+    them, so every connection has its own cache.
+    """
+
+    def __init__(self, enabled: bool | None = None):
+        """Initialize cache with configuration from arguments or environment"""
+        self.enabled = (
+            enabled if enabled is not None else os.getenv("QLIK_OBJECT_CACHE_ENABLED", "true").lower() == "true"
+        )
+
+        self._handles: dict[str, int] = {}
+        self._results: dict[int, dict[str, Any]] = {}
+        # Bumped on every change push, so a result requested before the change is not stored after it
+        self._generations: dict[int, int] = {}
+
+        self.stats = {
+            "handle_hits": 0,
+            "handle_misses": 0,
+            "result_hits": 0,
+            "result_misses": 0,
+            "invalidated": 0,
+            "closed": 0,
+        }
+
+    def get_handle(self, object_id: str) -> int | None:
+        """Return the handle the object was opened with in this session"""
+        if not self.enabled:
+            return None
+        handle = self._handles.get(object_id)
+        self.stats["handle_hits" if handle is not None else "handle_misses"] += 1
+        return handle
+
+    def put_handle(self, object_id: str, handle: int):
+        """Remember the handle an object was opened with"""
+        if self.enabled:
+            self._handles[object_id] = handle
+
+    def get_result(self, handle: int, method: str) -> Any | None:
+        """Return the cached result of a method on a handle, if still valid"""
+        if not self.enabled:
+            return None
+        result = self._results.get(handle, {}).get(method)
+        self.stats["result_hits" if result is not None else "result_misses"] += 1
+        return result
+
+    def generation(self, handle: int) -> int:
+        """Current change count of a handle, taken before requesting a result"""
+        return self._generations.get(handle, 0)
+
+    def put_result(self, handle: int, method: str, result: Any, generation: int):
+        """Store a result unless the handle changed since it was requested"""
+        if self.enabled and result and self._generations.get(handle, 0) == generation:
+            self._results.setdefault(handle, {})[method] = result
+
+    def invalidate(self, handles: list[int]):
+        """Drop the results of handles the Engine reported as changed"""
+        for handle in handles:
+            self._generations[handle] = self._generations.get(handle, 0) + 1
+            if self._results.pop(handle, None) is not None:
+                self.stats["invalidated"] += 1
+
+    def forget(self, handles: list[int]):
+        """Drop handles the Engine reported as closed, with their results"""
+        closed = set(handles)
+        self.invalidate(handles)
+        for object_id, handle in list(self._handles.items()):
+            if handle in closed:
+                del self._handles[object_id]
+                self.stats["closed"] += 1
+
+    def clear(self):
+        """Drop everything, e.g. when the session ends"""
+        self._handles.clear()
+        self._results.clear()
+        self._generations.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return cache counters and current size"""
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "handles": len(self._handles),
+            "results": sum(len(results) for results in self._results.values()),
+        }
+
+
+class AsyncQlikClient:
+    """Comprehensive asyncio Qlik Engine API client for accessing all Qlik Sense application objects
+
+    Every Engine call awaits its response instead of blocking on the socket, so
+    several clients can serve concurrent tool calls on one event loop.
+    """
 
     def __init__(self):
         """Initialize client with configuration from environment"""
@@ -32,45 +183,68 @@ class QlikClient:
         self.recv_timeout = int(os.getenv("WEBSOCKET_RECV_TIMEOUT", "60"))
 
         # Connection state
-        self.ws: websocket.WebSocket | None = None
+        self.ws: ClientConnection | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
         self.request_id = 0
         self.app_handle: int | None = None
+        self.app_id: str | None = None
+
+        # Responses are routed to pending requests by id, so many requests can be in flight
+        self._pending: dict[int, asyncio.Future] = {}
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._reader_task: asyncio.Task | None = None
+
+        # Session objects are reused for the lifetime of the connection so that
+        # pooled connections do not accumulate one list object per call
+        self._session_objects: dict[str, int] = {}
+
+        # Object handles, layouts and properties reused until the Engine reports a change
+        self.object_cache = ObjectCache()
+
+    async def _create_websocket(self, url: str) -> ClientConnection:
+        """Open the WebSocket to the Engine using certificate authentication"""
+        # Setup SSL context with certificates
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_REQUIRED
+        ssl_context.load_verify_locations(self.cert_root)
+        ssl_context.load_cert_chain(self.cert_client, self.cert_key)
+
+        # Setup headers
+        headers = {
+            "X-Qlik-User": f"UserDirectory={self.user_directory}; UserId={self.user_id}",
+        }
 
-    def connect(self, app_id: str) -> bool:
+        # Create WebSocket connection (scripts and layouts can exceed the default frame limit)
+        return await ws_connect(
+            url,
+            ssl=ssl_context,
+            additional_headers=headers,
+            open_timeout=self.timeout,
+            max_size=None,
+            compression=None,
+        )
+
+    async def _open_websocket(self, url: str):
+        """Open the WebSocket and start routing incoming messages"""
+        self.ws = await self._create_websocket(url)
+        self.loop = asyncio.get_running_loop()
+        self._reader_task = asyncio.create_task(self._receive_loop(self.ws))
+
+    async def connect(self, app_id: str) -> bool:
         """Connect to Qlik Engine and open specified app"""
         try:
             # First try connecting to global context and using OpenDoc
             url = f"wss://{self.server_url}:{self.server_port}/app/"
             print(f"Connecting to: {url}")
 
-            # Setup SSL context with certificates
-            sslopt = {
-                "cert_reqs": ssl.CERT_REQUIRED,
-                "ca_certs": self.cert_root,
-                "certfile": self.cert_client,
-                "keyfile": self.cert_key,
-                "check_hostname": False,
-                "ssl_version": ssl.PROTOCOL_TLS,
-            }
-
-            # Setup headers
-            headers = {
-                "X-Qlik-User": f"UserDirectory={self.user_directory}; UserId={self.user_id}",
-            }
-
-            # Create WebSocket connection
-            self.ws = websocket.create_connection(
-                url,
-                sslopt=sslopt,
-                header=headers,
-                timeout=self.timeout,
-            )
+            await self._open_websocket(url)
 
             print("Connected to Qlik Engine")
 
             # Open the app using OpenDoc
             print(f"Opening app: {app_id}")
-            result = self._send_request(
+            result = await self._send_request(
                 "OpenDoc",
                 -1,  # Global handle
                 {"qDocName": app_id},
@@ -78,10 +252,11 @@ class QlikClient:
 
             if result and "qReturn" in result and "qHandle" in result["qReturn"]:
                 self.app_handle = result["qReturn"]["qHandle"]
+                self.app_id = app_id
                 print(f"App opened with handle: {self.app_handle}")
 
                 # Verify by getting app layout
-                layout = self._send_request("GetAppLayout", self.app_handle)
+                layout = await self._send_request("GetAppLayout", self.app_handle)
                 if layout:
                     app_title = layout.get("qTitle", app_id)
                     print(f"Successfully opened app: {app_title}")
@@ -94,43 +269,56 @@ class QlikClient:
             print(f"Connection failed: {e}")
             return False
 
-    def disconnect(self):
+    async def disconnect(self):
         """Close WebSocket connection"""
         if self.ws:
-            self.ws.close()
+            ws = self.ws
             self.ws = None
             self.app_handle = None
+            self.app_id = None
+            self._session_objects = {}
+            self.object_cache.clear()
+            try:
+                await ws.close()
+            except Exception as e:
+                print(f"Error closing connection: {e}")
+            if self._reader_task:
+                self._reader_task.cancel()
+                self._reader_task = None
+            self._fail_pending(ConnectionError("Disconnected from Qlik Engine"))
             print("Disconnected from Qlik Engine")
 
-    def connect_global(self) -> bool:
+    async def ping(self) -> bool:
+        """Check that the connection and the opened app are still usable"""
+        if not self.ws or not self.app_handle:
+            return False
+
+        try:
+            return bool(await self._send_request("GetAppLayout", self.app_handle))
+        except Exception as e:
+            print(f"Health check failed: {e}")
+            return False
+
+    async def get_app_version(self) -> str:
+        """Get a stamp of the opened app's last reload and last modification"""
+        if not self.ws or not self.app_handle:
+            raise ConnectionError("Not connected to Qlik Engine")
+
+        layout = await self._send_request("GetAppLayout", self.app_handle)
+        app_layout = layout.get("qLayout", layout) if layout else {}
+        return app_version_stamp(
+            app_layout.get("qLastReloadTime", ""),
+            app_layout.get("qMeta", {}).get("modifiedDate", ""),
+        )
+
+    async def connect_global(self) -> bool:
         """Connect to Qlik Engine global context (for listing apps)"""
         try:
             # Connect to global context (no specific app)
             url = f"wss://{self.server_url}:{self.server_port}/app/"
             print(f"Connecting to global context: {url}")
 
-            # Setup SSL context with certificates
-            sslopt = {
-                "cert_reqs": ssl.CERT_REQUIRED,
-                "ca_certs": self.cert_root,
-                "certfile": self.cert_client,
-                "keyfile": self.cert_key,
-                "check_hostname": False,
-                "ssl_version": ssl.PROTOCOL_TLS,
-            }
-
-            # Setup headers
-            headers = {
-                "X-Qlik-User": f"UserDirectory={self.user_directory}; UserId={self.user_id}",
-            }
-
-            # Create WebSocket connection
-            self.ws = websocket.create_connection(
-                url,
-                sslopt=sslopt,
-                header=headers,
-                timeout=self.timeout,
-            )
+            await self._open_websocket(url)
 
             print("Connected to Qlik Engine global context")
             return True
@@ -139,7 +327,7 @@ class QlikClient:
             print(f"Global connection failed: {e}")
             return False
 
-    def get_doc_list(self) -> dict[str, Any]:
+    async def get_doc_list(self) -> dict[str, Any]:
         """Get list of all available applications"""
         if not self.ws:
             raise ConnectionError("Not connected to Qlik Engine")
@@ -148,7 +336,7 @@ class QlikClient:
             print("Fetching application list...")
 
             # Get document list using global handle (-1)
-            result = self._send_request("GetDocList", -1)
+            result = await self._send_request("GetDocList", -1)
 
             apps = []
             if result and "qDocList" in result:
@@ -174,7 +362,7 @@ class QlikClient:
             print(f"Error fetching application list: {e}")
             raise
 
-    def get_measures(self, include_expression: bool = True, include_tags: bool = True) -> dict[str, Any]:
+    async def get_measures(self, include_expression: bool = True, include_tags: bool = True) -> dict[str, Any]:
         """Retrieve all measures from the current app"""
         if not self.ws or not self.app_handle:
             raise ConnectionError("Not connected to Qlik Engine")
@@ -209,20 +397,10 @@ class QlikClient:
                 },
             ]
 
-            create_result = self._send_request(
-                "CreateSessionObject",
-                self.app_handle,
-                create_params,
-            )
-
-            if not create_result or "qReturn" not in create_result:
-                raise ValueError("Failed to create MeasureList object")
-
-            measure_list_handle = create_result["qReturn"]["qHandle"]
-            print(f"Created MeasureList with handle: {measure_list_handle}")
+            measure_list_handle = await self._get_session_object_handle(create_params, "MeasureList")
 
             # Get layout containing measure data
-            layout = self._send_request("GetLayout", measure_list_handle)
+            layout = await self._send_request("GetLayout", measure_list_handle)
             # The actual data is nested under qLayout
             actual_layout = layout.get("qLayout", layout) if layout else {}
 
@@ -284,7 +462,7 @@ class QlikClient:
             print(f"Error retrieving measures: {e}")
             raise
 
-    def get_variables(
+    async def get_variables(
         self,
         include_definition: bool = True,
         include_tags: bool = True,
@@ -324,20 +502,10 @@ class QlikClient:
                 },
             ]
 
-            create_result = self._send_request(
-                "CreateSessionObject",
-                self.app_handle,
-                create_params,
-            )
-
-            if not create_result or "qReturn" not in create_result:
-                raise ValueError("Failed to create VariableList object")
-
-            variable_list_handle = create_result["qReturn"]["qHandle"]
-            print(f"Created VariableList with handle: {variable_list_handle}")
+            variable_list_handle = await self._get_session_object_handle(create_params, "VariableList")
 
             # Get layout containing variable data
-            layout = self._send_request("GetLayout", variable_list_handle)
+            layout = await self._send_request("GetLayout", variable_list_handle)
             # The actual data is nested under qLayout
             actual_layout = layout.get("qLayout", layout) if layout else {}
 
@@ -382,7 +550,7 @@ class QlikClient:
             print(f"Error retrieving variables: {e}")
             raise
 
-    def get_fields(
+    async def get_fields(
         self,
         show_system: bool = True,
         show_hidden: bool = True,
@@ -415,20 +583,10 @@ class QlikClient:
                 },
             ]
 
-            create_result = self._send_request(
-                "CreateSessionObject",
-                self.app_handle,
-                create_params,
-            )
-
-            if not create_result or "qReturn" not in create_result:
-                raise ValueError("Failed to create FieldList object")
-
-            field_list_handle = create_result["qReturn"]["qHandle"]
-            print(f"Created FieldList with handle: {field_list_handle}")
+            field_list_handle = await self._get_session_object_handle(create_params, "FieldList")
 
             # Get layout containing field data
-            layout = self._send_request("GetLayout", field_list_handle)
+            layout = await self._send_request("GetLayout", field_list_handle)
             # The actual data is nested under qLayout
             actual_layout = layout.get("qLayout", layout) if layout else {}
 
@@ -488,7 +646,7 @@ class QlikClient:
             print(f"Error retrieving fields: {e}")
             raise
 
-    def get_sheets(
+    async def get_sheets(
         self,
         include_thumbnail: bool = False,
         include_metadata: bool = True,
@@ -498,145 +656,287 @@ class QlikClient:
             raise ConnectionError("Not connected to Qlik Engine")
 
         try:
-            print("Getting sheets using GetAllInfos...")
+            # Fast path: one SheetList session object carries every sheet's metadata
+            try:
+                sheets = await self._get_sheets_from_list(include_thumbnail, include_metadata)
+                retrieval_method = "sheet_list"
+            except Exception as e:
+                print(f"SheetList unavailable ({e}), falling back to per-sheet retrieval")
+                sheets = await self._get_sheets_per_object(include_thumbnail, include_metadata)
+                retrieval_method = "per_sheet"
 
-            # Get all objects in the app
-            all_infos_result = self._send_request("GetAllInfos", self.app_handle)
+            # Sort sheets by rank
+            sheets.sort(key=lambda x: x.get("rank", 0))
 
-            if not all_infos_result or "qInfos" not in all_infos_result:
-                raise ValueError("Failed to get app objects")
+            print(f"Successfully retrieved {len(sheets)} sheets via {retrieval_method}")
 
-            # Filter for sheets
-            all_objects = all_infos_result["qInfos"]
-            sheet_infos = [obj for obj in all_objects if obj.get("qType") == "sheet"]
-            print(f"Found {len(sheet_infos)} sheets")
+            return {
+                "sheets": sheets,
+                "sheet_count": len(sheets),
+                "retrieval_method": retrieval_method,
+            }
 
-            sheets = []
+        except Exception as e:
+            print(f"Error retrieving sheets: {e}")
+            raise
 
-            # Get detailed information for each sheet
-            for sheet_info in sheet_infos:
-                sheet_id = sheet_info.get("qId", "")
-                if not sheet_id:
-                    continue
+    async def _get_sheets_from_list(
+        self,
+        include_thumbnail: bool,
+        include_metadata: bool,
+    ) -> list[dict[str, Any]]:
+        """Read all sheets from a SheetList session object in a single layout"""
+        print("Getting sheets using SheetList...")
 
-                try:
-                    # Get the sheet object to retrieve metadata
-                    sheet_obj_result = self._send_request("GetObject", self.app_handle, [sheet_id])
+        create_params = [
+            {
+                "qInfo": {
+                    "qType": "SheetList",
+                },
+                "qAppObjectListDef": {
+                    "qType": "sheet",
+                    "qData": {
+                        "title": "/qMetaDef/title",
+                        "description": "/qMetaDef/description",
+                        "rank": "/rank",
+                        "thumbnail": "/thumbnail",
+                        "meta": "/qMeta",
+                    },
+                },
+            },
+        ]
 
-                    if sheet_obj_result and "qReturn" in sheet_obj_result:
-                        # Get the handle for the sheet object
-                        sheet_handle = sheet_obj_result["qReturn"]["qHandle"]
+        sheet_list_handle = await self._get_session_object_handle(create_params, "SheetList")
+        layout = await self._send_request("GetLayout", sheet_list_handle)
+        actual_layout = layout.get("qLayout", layout) if layout else {}
 
-                        # Get the layout from the sheet handle
-                        layout_result = self._send_request("GetLayout", sheet_handle)
+        if not actual_layout or "qAppObjectList" not in actual_layout:
+            raise ValueError("No sheet list data returned")
+
+        sheets = []
+        for item in actual_layout["qAppObjectList"].get("qItems", []):
+            q_data = item.get("qData", {})
+            q_meta = {**item.get("qMeta", {}), **(q_data.get("meta") or {})}
+
+            sheet_data = self._build_sheet_data(
+                item.get("qInfo", {}).get("qId", ""),
+                q_data.get("rank", 0),
+                {
+                    **q_meta,
+                    "title": q_data.get("title", q_meta.get("title", "")),
+                    "description": q_data.get("description", q_meta.get("description", "")),
+                },
+                include_metadata,
+            )
+            if include_thumbnail:
+                sheet_data["thumbnail"] = q_data.get("thumbnail", "")
+            sheets.append(sheet_data)
 
-                        if layout_result and "qLayout" in layout_result:
-                            layout = layout_result["qLayout"]
-                            q_meta = layout.get("qMeta", {})
+        return sheets
 
-                            sheet_data = {
-                                "sheet_id": sheet_id,
-                                "title": q_meta.get("title", ""),
-                                "description": q_meta.get("description", ""),
-                                "rank": layout.get("rank", 0),
-                            }
+    async def _get_sheets_per_object(
+        self,
+        include_thumbnail: bool,
+        include_metadata: bool,
+    ) -> list[dict[str, Any]]:
+        """Read sheets by opening each sheet object and fetching its layout"""
+        print("Getting sheets using GetAllInfos...")
 
-                            if include_thumbnail:
-                                sheet_data["thumbnail"] = q_meta.get("thumbnail", "")
+        # Get all objects in the app
+        all_infos_result = await self._send_request("GetAllInfos", self.app_handle)
 
-                            if include_metadata:
-                                sheet_data["created"] = q_meta.get("createdDate", "")
-                                sheet_data["modified"] = q_meta.get("modifiedDate", "")
-                                sheet_data["published"] = q_meta.get("published", False)
-                                sheet_data["approved"] = q_meta.get("approved", False)
+        if not all_infos_result or "qInfos" not in all_infos_result:
+            raise ValueError("Failed to get app objects")
 
-                            sheets.append(sheet_data)
-                        else:
-                            raise ValueError("No layout data returned")
-                    else:
-                        raise ValueError("GetObject failed")
+        # Filter for sheets
+        all_objects = all_infos_result["qInfos"]
+        sheet_infos = [obj for obj in all_objects if obj.get("qType") == "sheet"]
+        print(f"Found {len(sheet_infos)} sheets")
 
-                except Exception as e:
-                    print(f"Warning: Could not get metadata for sheet {sheet_id}: {e}")
-                    # Add basic sheet info even if metadata retrieval fails
-                    sheets.append({
-                        "sheet_id": sheet_id,
-                        "title": sheet_id,  # Use sheet_id as title fallback
-                        "description": "",
-                        "rank": 0,
-                    })
+        sheets = []
+        sheet_ids = [sheet_info.get("qId", "") for sheet_info in sheet_infos if sheet_info.get("qId", "")]
 
-            # Sort sheets by rank
-            sheets.sort(key=lambda x: x.get("rank", 0))
+        # Open every sheet and fetch every layout in two pipelined bursts
+        sheet_layouts = await self._get_objects_with_layouts(sheet_ids)
 
-            print(f"Successfully retrieved {len(sheets)} sheets")
+        for sheet_id, sheet_result in zip(sheet_ids, sheet_layouts):
+            try:
+                if isinstance(sheet_result, Exception):
+                    raise sheet_result
+
+                _, layout_result = sheet_result
+                if layout_result and "qLayout" in layout_result:
+                    layout = layout_result["qLayout"]
+                    q_meta = layout.get("qMeta", {})
+
+                    sheet_data = self._build_sheet_data(sheet_id, layout.get("rank", 0), q_meta, include_metadata)
+                    if include_thumbnail:
+                        sheet_data["thumbnail"] = q_meta.get("thumbnail", "")
+
+                    sheets.append(sheet_data)
+                else:
+                    raise ValueError("No layout data returned")
+
+            except Exception as e:
+                print(f"Warning: Could not get metadata for sheet {sheet_id}: {e}")
+                # Add basic sheet info even if metadata retrieval fails
+                sheets.append({
+                    "sheet_id": sheet_id,
+                    "title": sheet_id,  # Use sheet_id as title fallback
+                    "description": "",
+                    "rank": 0,
+                })
+
+        return sheets
+
+    @staticmethod
+    def _build_sheet_data(
+        sheet_id: str,
+        rank: Any,
+        q_meta: dict[str, Any],
+        include_metadata: bool,
+    ) -> dict[str, Any]:
+        """Build the sheet entry returned by get_sheets"""
+        sheet_data = {
+            "sheet_id": sheet_id,
+            "title": q_meta.get("title", ""),
+            "description": q_meta.get("description", ""),
+            "rank": rank or 0,
+        }
 
-            return {
-                "sheets": sheets,
-                "sheet_count": len(sheets),
-            }
+        if include_metadata:
+            sheet_data["created"] = q_meta.get("createdDate", "")
+            sheet_data["modified"] = q_meta.get("modifiedDate", "")
+            sheet_data["published"] = q_meta.get("published", False)
+            sheet_data["approved"] = q_meta.get("approved", False)
 
-        except Exception as e:
-            print(f"Error retrieving sheets: {e}")
-            raise
+        return sheet_data
 
-    def get_sheet_objects(
+    async def get_sheet_objects(
         self,
         sheet_id: str,
         include_properties: bool = True,
         include_layout: bool = True,
         include_data_definition: bool = True,
         resolve_master_items: bool = True,
+        master_measures_map: dict[str, dict[str, Any]] | None = None,
+        master_dimensions_map: dict[str, dict[str, Any]] | None = None,
+        use_property_tree: bool = False,
+        expand_containers: bool = True,
+        max_depth: int = 3,
+        max_nodes: int = 500,
     ) -> dict[str, Any]:
-        """Retrieve all visualization objects from a specific sheet, including container contents"""
+        """Retrieve all visualization objects from a specific sheet, including container contents
+
+        Master item maps already fetched by the caller can be passed in to avoid
+        fetching them again for every sheet. With use_property_tree, the sheet and
+        all its children come from one GetFullPropertyTree call, and only objects
+        whose output needs computed layout values are laid out separately.
+        Objects opened earlier in the session and unchanged layouts and
+        properties come from the object cache.
+
+        Containers, and containers nested in them, are expanded max_depth levels
+        deep, fetching at most max_nodes embedded objects. Without
+        expand_containers, and for containers beyond these limits, only their
+        structure is returned with a cursor for expand_container.
+        """
         if not self.ws or not self.app_handle:
             raise ConnectionError("Not connected to Qlik Engine")
 
         try:
             # First get the sheet object itself
             print(f"Getting sheet object: {sheet_id}")
-            sheet_result = self._send_request(
-                "GetObject",
-                self.app_handle,
-                [sheet_id],
-            )
-
-            # print(f"GetObject result: {sheet_result}")  # Debug output
-
-            if not sheet_result or "qReturn" not in sheet_result:
+            sheet_handle = (await self._open_objects([sheet_id]))[0]
+            if isinstance(sheet_handle, ValueError):
                 raise ValueError(f"Failed to get sheet object: {sheet_id}")
+            if isinstance(sheet_handle, Exception):
+                raise sheet_handle
 
-            sheet_handle = sheet_result["qReturn"]["qHandle"]
             print(f"Got sheet with handle: {sheet_handle}")
 
-            # Get sheet layout
-            sheet_layout = self._send_request("GetLayout", sheet_handle)
-            sheet_data = sheet_layout.get("qLayout", sheet_layout) if sheet_layout else {}
-
-            sheet_title = ""
-            if "qMeta" in sheet_data:
-                sheet_title = sheet_data["qMeta"].get("title", "")
-
-            # Get child objects (visualizations)
-            child_infos = []
-            if "qChildList" in sheet_data:
-                child_list = sheet_data["qChildList"]
-                if "qItems" in child_list:
-                    child_infos = child_list["qItems"]
-
-            print(f"Found {len(child_infos)} child objects")
+            container_depth = max_depth if expand_containers else 0
+            traversal: dict[str, Any] = {"levels": 0, "containers_expanded": 0, "objects": 0, "truncated": False}
+            master_items = None
+            property_tree = None
+            if use_property_tree:
+                master_items, property_tree = await asyncio.gather(
+                    self._get_master_item_maps(resolve_master_items, master_measures_map, master_dimensions_map),
+                    self._get_full_property_tree(sheet_handle),
+                )
 
-            # Pre-fetch master items if needed for resolution
-            master_measures_cache = {}
-            master_dimensions_cache = {}
-            if resolve_master_items:
-                print("Pre-fetching master items for resolution...")
-                master_measures_cache = self.get_master_measures_map()
-                master_dimensions_cache = self.get_master_dimensions_map()
+            tree_stats = None
+            if property_tree is not None:
+                master_measures_cache, master_dimensions_cache = master_items
+                sheet_title, child_infos, child_layouts, expanded_containers, tree_stats = (
+                    await self._read_property_tree(
+                        property_tree,
+                        include_properties,
+                        include_layout,
+                        include_data_definition,
+                        resolve_master_items,
+                        master_measures_cache,
+                        master_dimensions_cache,
+                        container_depth,
+                        max_nodes,
+                        traversal,
+                    )
+                )
+            else:
+                # Get sheet layout
+                sheet_layout = (await self._send_cached_batch([("GetLayout", sheet_handle)]))[0]
+                if isinstance(sheet_layout, Exception):
+                    raise sheet_layout
+                sheet_data = sheet_layout.get("qLayout", sheet_layout) if sheet_layout else {}
+
+                sheet_title = ""
+                if "qMeta" in sheet_data:
+                    sheet_title = sheet_data["qMeta"].get("title", "")
+
+                # Get child objects (visualizations)
+                child_infos = []
+                if "qChildList" in sheet_data:
+                    child_list = sheet_data["qChildList"]
+                    if "qItems" in child_list:
+                        child_infos = child_list["qItems"]
+
+                print(f"Found {len(child_infos)} child objects")
+
+                # Every child object is opened and laid out in pipelined bursts,
+                # while the master items are fetched
+                child_ids = [child_info.get("qInfo", {}).get("qId", "") for child_info in child_infos]
+                if master_items is None:
+                    master_items, child_layouts = await asyncio.gather(
+                        self._get_master_item_maps(
+                            resolve_master_items, master_measures_map, master_dimensions_map,
+                        ),
+                        self._get_objects_with_layouts(child_ids),
+                    )
+                else:
+                    child_layouts = await self._get_objects_with_layouts(child_ids)
+                master_measures_cache, master_dimensions_cache = master_items
+
+                # Expand every container on the sheet together, one pipelined level at a time
+                containers = []
+                for child_info, child_result in zip(child_infos, child_layouts):
+                    obj_type = child_info.get("qInfo", {}).get("qType", "")
+                    if obj_type.lower() in CONTAINER_TYPES and not isinstance(child_result, Exception):
+                        containers.append((child_info.get("qInfo", {}).get("qId", ""), child_result[0]))
+                expanded_containers = await self._expand_containers(
+                    containers,
+                    include_properties,
+                    include_layout,
+                    include_data_definition,
+                    resolve_master_items,
+                    master_measures_cache,
+                    master_dimensions_cache,
+                    max_depth=container_depth,
+                    max_nodes=max_nodes,
+                    stats=traversal,
+                )
 
             # Process each visualization object
             objects = []
-            for child_info in child_infos:
+            for child_info, child_result in zip(child_infos, child_layouts):
                 obj_id = child_info.get("qInfo", {}).get("qId", "")
                 obj_type = child_info.get("qInfo", {}).get("qType", "")
 
@@ -647,115 +947,102 @@ class QlikClient:
 
                 # Process ALL objects including containers
                 try:
-                    # Get the object
-                    obj_result = self._send_request(
-                        "GetObject",
-                        self.app_handle,
-                        [obj_id],
-                    )
+                    if isinstance(child_result, Exception):
+                        raise child_result
+
+                    obj_handle, obj_layout = child_result
+                    obj_layout_data = obj_layout.get("qLayout", obj_layout) if obj_layout else {}
+
+                    # Extract title and subtitle
+                    if "title" in obj_layout_data:
+                        obj_data["title"] = obj_layout_data["title"]
+                    if "subtitle" in obj_layout_data:
+                        obj_data["subtitle"] = obj_layout_data["subtitle"]
+
+                    # Extract layout information
+                    if include_layout and "qInfo" in obj_layout_data:
+                        obj_data["layout"] = {
+                            "x": child_info.get("qData", {}).get("col", 0),
+                            "y": child_info.get("qData", {}).get("row", 0),
+                            "width": child_info.get("qData", {}).get("colspan", 0),
+                            "height": child_info.get("qData", {}).get("rowspan", 0),
+                        }
 
-                    if obj_result and "qReturn" in obj_result:
-                        obj_handle = obj_result["qReturn"]["qHandle"]
-
-                        # Get object layout for detailed info
-                        obj_layout = self._send_request("GetLayout", obj_handle)
-                        obj_layout_data = obj_layout.get("qLayout", obj_layout) if obj_layout else {}
-
-                        # Extract title and subtitle
-                        if "title" in obj_layout_data:
-                            obj_data["title"] = obj_layout_data["title"]
-                        if "subtitle" in obj_layout_data:
-                            obj_data["subtitle"] = obj_layout_data["subtitle"]
-
-                        # Extract layout information
-                        if include_layout and "qInfo" in obj_layout_data:
-                            obj_data["layout"] = {
-                                "x": child_info.get("qData", {}).get("col", 0),
-                                "y": child_info.get("qData", {}).get("row", 0),
-                                "width": child_info.get("qData", {}).get("colspan", 0),
-                                "height": child_info.get("qData", {}).get("rowspan", 0),
-                            }
-
-                        # Check if this is a VizlibContainer or similar container
-                        if obj_type.lower() in ["vizlibcontainer", "container", "qlik-tabbed-container"]:
-                            print(f"Processing container object: {obj_id} (type: {obj_type})")
-                            obj_data["is_container"] = True
-
-                            # Get effective properties for the container
-                            effective_props = self.get_effective_properties(obj_handle)
-
-                            # Process container contents
-                            container_objects = self._process_container_contents(
-                                obj_handle,
-                                obj_id,
-                                effective_props,
-                                include_properties,
-                                include_layout,
-                                include_data_definition,
-                                resolve_master_items,
-                                master_measures_cache,
-                                master_dimensions_cache,
+                    # Check if this is a VizlibContainer or similar container
+                    if obj_type.lower() in CONTAINER_TYPES:
+                        print(f"Processing container object: {obj_id} (type: {obj_type})")
+                        obj_data["is_container"] = True
+
+                        # Effective properties and contents were fetched with the other containers
+                        effective_props, container_objects = expanded_containers.get(obj_id, ({}, None))
+
+                        if container_objects is None:
+                            # Left for the caller to expand through the cursor
+                            obj_data["expanded"] = False
+                            obj_data["cursor"] = encode_container_cursor(self.app_id, sheet_id, obj_id, 1)
+                        elif container_objects:
+                            container_objects = [dict(embedded_obj) for embedded_obj in container_objects]
+                            self._attach_container_contents(
+                                container_objects, expanded_containers, sheet_id, 1, {obj_id}, traversal,
                             )
+                            obj_data["embedded_objects"] = container_objects
+                            obj_data["embedded_object_count"] = len(container_objects)
+
+                        # Store container structure if available
+                        if effective_props:
+                            obj_data["container_structure"] = self._extract_container_structure(effective_props)
+
+                    # Process regular visualization objects
+                    # Extract measures and dimensions
+                    elif include_data_definition:
+                        measures = []
+                        dimensions = []
+
+                        # Get measures from HyperCubeDef
+                        if "qHyperCubeDef" in obj_layout_data:
+                            hc_def = obj_layout_data["qHyperCubeDef"]
+
+                            # Extract measures
+                            if "qMeasures" in hc_def:
+                                for measure in hc_def["qMeasures"]:
+                                    measure_data = self._process_measure(
+                                        measure,
+                                        resolve_master_items,
+                                        master_measures_cache,
+                                    )
+                                    measures.append(measure_data)
+
+                            # Extract dimensions
+                            if "qDimensions" in hc_def:
+                                for dimension in hc_def["qDimensions"]:
+                                    dimension_data = self._process_dimension(
+                                        dimension,
+                                        resolve_master_items,
+                                        master_dimensions_cache,
+                                    )
+                                    dimensions.append(dimension_data)
+
+                        if measures:
+                            obj_data["measures"] = measures
+                        if dimensions:
+                            obj_data["dimensions"] = dimensions
+
+                    # Extract properties if requested
+                    if include_properties:
+                        properties = {}
+
+                        # Extract color settings
+                        if "color" in obj_layout_data:
+                            properties["color"] = obj_layout_data["color"]
 
-                            if container_objects:
-                                obj_data["embedded_objects"] = container_objects
-                                obj_data["embedded_object_count"] = len(container_objects)
-
-                            # Store container structure if available
-                            if effective_props:
-                                obj_data["container_structure"] = self._extract_container_structure(effective_props)
-
-                        # Process regular visualization objects
-                        # Extract measures and dimensions
-                        elif include_data_definition:
-                            measures = []
-                            dimensions = []
-
-                            # Get measures from HyperCubeDef
-                            if "qHyperCubeDef" in obj_layout_data:
-                                hc_def = obj_layout_data["qHyperCubeDef"]
-
-                                # Extract measures
-                                if "qMeasures" in hc_def:
-                                    for measure in hc_def["qMeasures"]:
-                                        measure_data = self._process_measure(
-                                            measure,
-                                            resolve_master_items,
-                                            master_measures_cache,
-                                        )
-                                        measures.append(measure_data)
-
-                                # Extract dimensions
-                                if "qDimensions" in hc_def:
-                                    for dimension in hc_def["qDimensions"]:
-                                        dimension_data = self._process_dimension(
-                                            dimension,
-                                            resolve_master_items,
-                                            master_dimensions_cache,
-                                        )
-                                        dimensions.append(dimension_data)
-
-                            if measures:
-                                obj_data["measures"] = measures
-                            if dimensions:
-                                obj_data["dimensions"] = dimensions
-
-                        # Extract properties if requested
-                        if include_properties:
-                            properties = {}
-
-                            # Extract color settings
-                            if "color" in obj_layout_data:
-                                properties["color"] = obj_layout_data["color"]
-
-                            # Extract other visualization-specific properties
-                            if "qHyperCubeDef" in obj_layout_data:
-                                hc_def = obj_layout_data["qHyperCubeDef"]
-                                if "qInterColumnSortOrder" in hc_def:
-                                    properties["sortOrder"] = hc_def["qInterColumnSortOrder"]
-
-                            if properties:
-                                obj_data["properties"] = properties
+                        # Extract other visualization-specific properties
+                        if "qHyperCubeDef" in obj_layout_data:
+                            hc_def = obj_layout_data["qHyperCubeDef"]
+                            if "qInterColumnSortOrder" in hc_def:
+                                properties["sortOrder"] = hc_def["qInterColumnSortOrder"]
+
+                        if properties:
+                            obj_data["properties"] = properties
 
                 except Exception as e:
                     print(f"Warning: Could not get details for object {obj_id}: {e}")
@@ -763,225 +1050,692 @@ class QlikClient:
 
                 objects.append(obj_data)
 
-            return {
+            result = {
                 "sheet_title": sheet_title,
                 "objects": objects,
                 "object_count": len(objects),
             }
+            if expanded_containers:
+                result["container_traversal"] = {**traversal, "max_depth": container_depth, "max_nodes": max_nodes}
+            if tree_stats is not None:
+                result["property_tree"] = tree_stats
+            return result
 
         except Exception as e:
             print(f"Error retrieving sheet objects: {e}")
             raise
 
-    def _process_container_contents(
+    async def _get_master_item_maps(
+        self,
+        resolve_master_items: bool,
+        master_measures_map: dict[str, dict[str, Any]] | None,
+        master_dimensions_map: dict[str, dict[str, Any]] | None,
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+        """Get the master item maps for resolution, unless the caller passed them in"""
+        if not resolve_master_items:
+            return {}, {}
+        if master_measures_map is not None and master_dimensions_map is not None:
+            return master_measures_map, master_dimensions_map
+        print("Pre-fetching master items for resolution...")
+        measures_map, dimensions_map = await asyncio.gather(
+            self.get_master_measures_map(),
+            self.get_master_dimensions_map(),
+        )
+        return measures_map, dimensions_map
+
+    async def expand_container(
         self,
-        container_handle: int,
         container_id: str,
-        effective_props: dict[str, Any],
+        tabs: list[str] | None = None,
+        include_properties: bool = True,
+        include_layout: bool = True,
+        include_data_definition: bool = True,
+        resolve_master_items: bool = True,
+        master_measures_map: dict[str, dict[str, Any]] | None = None,
+        master_dimensions_map: dict[str, dict[str, Any]] | None = None,
+        sheet_id: str = "",
+        depth: int = 1,
+        max_depth: int = 1,
+        max_nodes: int = 500,
+    ) -> dict[str, Any]:
+        """Expand the embedded objects of one container, optionally of some tabs only
+
+        Used to follow the cursor of a container stub whose contents are at the
+        given depth. On the session that returned the stub, the container's
+        handle and properties come from the object cache, so only the embedded
+        objects of the requested tabs are fetched. Nested containers are
+        expanded max_depth levels deep counted from this container; deeper ones
+        are returned as stubs.
+        """
+        if not self.ws or not self.app_handle:
+            raise ConnectionError("Not connected to Qlik Engine")
+
+        handle = (await self._open_objects([container_id]))[0]
+        if isinstance(handle, ValueError):
+            raise ValueError(f"Failed to get container object: {container_id}")
+        if isinstance(handle, Exception):
+            raise handle
+
+        layout_results, master_items = await asyncio.gather(
+            self._send_cached_batch([("GetLayout", handle)]),
+            self._get_master_item_maps(resolve_master_items, master_measures_map, master_dimensions_map),
+        )
+        if isinstance(layout_results[0], Exception):
+            raise layout_results[0]
+        layout = layout_results[0].get("qLayout", layout_results[0]) if layout_results[0] else {}
+
+        traversal: dict[str, Any] = {}
+        expanded = await self._expand_containers(
+            [(container_id, handle)],
+            include_properties,
+            include_layout,
+            include_data_definition,
+            resolve_master_items,
+            *master_items,
+            max_depth=max_depth,
+            max_nodes=max_nodes,
+            tabs=tabs,
+            stats=traversal,
+        )
+        effective_props, embedded_objects = expanded[container_id]
+        embedded_objects = [dict(embedded_obj) for embedded_obj in embedded_objects or []]
+        self._attach_container_contents(embedded_objects, expanded, sheet_id, depth, {container_id}, traversal)
+
+        structure = self._extract_container_structure(effective_props) if effective_props else {}
+        result = {
+            "container_id": container_id,
+            "object_type": layout.get("qInfo", {}).get("qType", ""),
+            "title": layout.get("title", ""),
+            "container_structure": structure,
+            "embedded_objects": embedded_objects,
+            "embedded_object_count": len(embedded_objects),
+            "container_traversal": {**traversal, "max_depth": max_depth, "max_nodes": max_nodes},
+        }
+        if tabs is not None:
+            known = {"main"}
+            for tab in structure.get("tabs", []):
+                known.update(str(tab.get(key, "")).lower() for key in ("id", "label"))
+            result["unmatched_tabs"] = [tab for tab in tabs if tab.lower() not in known]
+        return result
+
+    @staticmethod
+    def _reference_in_tabs(reference: dict[str, Any], tabs: list[str]) -> bool:
+        """Check whether a container reference is in one of the tabs, by tab id or label"""
+        wanted = {tab.lower() for tab in tabs}
+        return reference.get("tab_id", "").lower() in wanted or reference["tab_label"].lower() in wanted
+
+    async def _get_objects_with_layouts(
+        self,
+        object_ids: list[str],
+    ) -> list[tuple[int, dict[str, Any]] | Exception]:
+        """Open several objects and fetch their layouts in two pipelined bursts
+
+        Returns one (handle, layout) pair per object id in the same order, or the
+        exception raised while opening or laying out that object. Objects already
+        opened in this session and unchanged layouts are served from the object
+        cache, so only the rest are requested.
+        """
+        handles = await self._open_objects(object_ids)
+
+        opened = [handle for handle in handles if not isinstance(handle, Exception)]
+        layout_results = iter(await self._send_cached_batch([("GetLayout", handle) for handle in opened]))
+
+        results: list[tuple[int, dict[str, Any]] | Exception] = []
+        for handle in handles:
+            if isinstance(handle, Exception):
+                results.append(handle)
+                continue
+            layout_result = next(layout_results)
+            results.append(layout_result if isinstance(layout_result, Exception) else (handle, layout_result))
+
+        return results
+
+    async def _open_objects(self, object_ids: list[str]) -> list[int | Exception]:
+        """Get a handle for each object id, opening those not yet open in one burst
+
+        Returns one handle per object id in the same order, or the exception
+        raised while opening that object. Each object is opened once per session.
+        """
+        handles: dict[str, int | Exception] = {}
+        for object_id in object_ids:
+            handle = self.object_cache.get_handle(object_id)
+            if handle is not None:
+                handles[object_id] = handle
+
+        missing = [object_id for object_id in dict.fromkeys(object_ids) if object_id not in handles]
+        object_results = await self._send_batch(
+            [("GetObject", self.app_handle, [object_id]) for object_id in missing],
+        )
+        for object_id, object_result in zip(missing, object_results):
+            if isinstance(object_result, Exception):
+                handles[object_id] = object_result
+            elif not object_result or "qReturn" not in object_result:
+                handles[object_id] = ValueError(f"GetObject failed for {object_id}")
+            else:
+                handles[object_id] = object_result["qReturn"]["qHandle"]
+                self.object_cache.put_handle(object_id, handles[object_id])
+
+        return [handles[object_id] for object_id in object_ids]
+
+    async def _send_cached_batch(self, requests: list[tuple[str, int]]) -> list[dict[str, Any] | Exception]:
+        """Send parameterless object requests in one burst, serving cached results
+
+        Results stay valid until the Engine reports the handle as changed, so
+        only requests without a cached result are sent. Returns one entry per
+        request like _send_batch.
+        """
+        results: list[dict[str, Any] | Exception | None] = [
+            self.object_cache.get_result(handle, method) for method, handle in requests
+        ]
+        missing = [index for index, result in enumerate(results) if result is None]
+        generations = [self.object_cache.generation(requests[index][1]) for index in missing]
+
+        sent = await self._send_batch([(*requests[index], None) for index in missing])
+        for index, generation, result in zip(missing, generations, sent):
+            results[index] = result
+            if not isinstance(result, Exception):
+                method, handle = requests[index]
+                self.object_cache.put_result(handle, method, result, generation)
+
+        return results
+
+    async def _expand_containers(
+        self,
+        containers: list[tuple[str, int | None]],
         include_properties: bool,
         include_layout: bool,
         include_data_definition: bool,
         resolve_master_items: bool,
         master_measures_cache: dict[str, dict[str, Any]],
         master_dimensions_cache: dict[str, dict[str, Any]],
-    ) -> list[dict[str, Any]]:
-        """Process and extract embedded objects from a container"""
-        embedded_objects = []
+        max_depth: int = 1,
+        max_nodes: int | None = None,
+        tabs: list[str] | None = None,
+        depth: int = 1,
+        visited: set[str] | None = None,
+        stats: dict[str, Any] | None = None,
+    ) -> dict[str, tuple[dict[str, Any], list[dict[str, Any]] | None]]:
+        """Expand containers and the containers inside them, one pipelined level at a time
+
+        The effective properties and child infos of a level's containers are
+        requested in one burst, then every embedded object of the level is opened
+        and laid out in one more pair of bursts (each object once, however often
+        it is referenced). Containers among them form the next level, whose
+        contents are at depth + 1, until contents would lie below max_depth.
+        Each container is expanded once however often it is reached, so a
+        self-referencing container ends the traversal instead of repeating it.
+        Containers whose contents would take the fetched objects past max_nodes
+        are left unexpanded. tabs (ids or labels) filters the first level only.
+
+        Returns (effective properties, embedded objects) by container id for
+        every container reached; unexpanded containers have None as objects.
+        """
+        expanded: dict[str, tuple[dict[str, Any], list[dict[str, Any]] | None]] = {}
+        visited = visited if visited is not None else set()
+        visited.update(container_id for container_id, _handle in containers)
+        stats = stats if stats is not None else {}
+        for key in ("levels", "containers_expanded", "objects"):
+            stats.setdefault(key, 0)
+        stats.setdefault("truncated", False)
+        layouts: dict[str, tuple[int | None, dict[str, Any]] | Exception] = {}
+
+        level = containers
+        first_level = True
+        while level:
+            # Containers built from a property tree have not been opened yet
+            unopened = [container_id for container_id, handle in level if handle is None]
+            if unopened:
+                opened = dict(zip(unopened, await self._open_objects(unopened)))
+                level = [(container_id, opened.get(container_id, handle)) for container_id, handle in level]
+                level = [(container_id, handle) for container_id, handle in level if not isinstance(handle, Exception)]
+
+            requests = []
+            for _container_id, handle in level:
+                requests.append(("GetEffectiveProperties", handle))
+                requests.append(("GetChildInfos", handle))
+            results = await self._send_cached_batch(requests)
+
+            plans = []
+            for index, (container_id, _handle) in enumerate(level):
+                effective_props, child_infos = results[2 * index], results[2 * index + 1]
+                if isinstance(effective_props, Exception) or not effective_props:
+                    print(f"Error getting effective properties: {effective_props}")
+                    effective_props = {}
+                if isinstance(child_infos, Exception):
+                    child_infos = []
+                elif isinstance(child_infos, dict):
+                    child_infos = child_infos.get("qInfos", [])
+                references = self._container_references(container_id, effective_props, child_infos or [])
+                if first_level and tabs is not None:
+                    references = [reference for reference in references if self._reference_in_tabs(reference, tabs)]
+                plans.append((container_id, effective_props, references))
+
+            # Expand containers in order while the object budget lasts
+            expand_plans = []
+            if depth <= max_depth:
+                expand_plans = self._plans_within_budget(plans, set(layouts), max_nodes, stats)
+            expand_ids = {plan[0] for plan in expand_plans}
+            for container_id, effective_props, _references in plans:
+                if container_id not in expand_ids:
+                    expanded[container_id] = (effective_props, None)
+            if not expand_plans:
+                break
+
+            object_ids = [
+                object_id
+                for object_id in dict.fromkeys(
+                    reference["object_id"] for *_, references in expand_plans for reference in references
+                )
+                if object_id not in layouts
+            ]
+            layouts.update(zip(object_ids, await self._get_objects_with_layouts(object_ids)))
+            stats["levels"] += 1
+            stats["containers_expanded"] += len(expand_plans)
+            stats["objects"] += len(object_ids)
+
+            contents = self._build_container_contents(
+                expand_plans,
+                layouts,
+                include_properties,
+                include_layout,
+                include_data_definition,
+                resolve_master_items,
+                master_measures_cache,
+                master_dimensions_cache,
+            )
+            expanded.update(contents)
+
+            # Embedded containers not reached before form the next level
+            level = []
+            for _effective_props, embedded_objects in contents.values():
+                for embedded_obj in embedded_objects:
+                    object_id = embedded_obj["object_id"]
+                    layout_result = layouts.get(object_id)
+                    if (
+                        embedded_obj.get("object_type", "").lower() in CONTAINER_TYPES
+                        and object_id not in visited
+                        and layout_result is not None
+                        and not isinstance(layout_result, Exception)
+                    ):
+                        visited.add(object_id)
+                        level.append((object_id, layout_result[0]))
+            depth += 1
+            first_level = False
+
+        return expanded
+
+    @staticmethod
+    def _plans_within_budget(
+        plans: list[tuple[str, dict[str, Any], list[dict[str, Any]]]],
+        fetched: set[str],
+        max_nodes: int | None,
+        stats: dict[str, Any],
+    ) -> list[tuple[str, dict[str, Any], list[dict[str, Any]]]]:
+        """Pick the container plans to expand, in order, while the object budget lasts"""
+        fetched = set(fetched)
+        selected = []
+        for plan in plans:
+            new_ids = {reference["object_id"] for reference in plan[2]} - fetched
+            if max_nodes is not None and len(fetched) + len(new_ids) > max_nodes:
+                stats["truncated"] = True
+                continue
+            fetched |= new_ids
+            selected.append(plan)
+        return selected
 
-        try:
-            # Try to extract tabs/panels structure from effective properties
-            tabs = []
-            vizlib_container_objects = []
+    def _attach_container_contents(
+        self,
+        objects: list[dict[str, Any]],
+        expanded: dict[str, tuple[dict[str, Any], list[dict[str, Any]] | None]],
+        sheet_id: str,
+        depth: int,
+        path: set[str],
+        stats: dict[str, Any],
+    ):
+        """Nest the expanded contents into the embedded containers among objects
+
+        objects are contents at the given depth inside the containers on path.
+        Each occurrence of a container gets its own copies of the contents; a
+        container on its own path is flagged as a circular reference, and one
+        left unexpanded becomes a stub with a cursor for expand_container.
+        """
+        for obj in objects:
+            object_id = obj["object_id"]
+            if obj.get("object_type", "").lower() not in CONTAINER_TYPES:
+                continue
+            obj["is_container"] = True
 
+            if object_id in path:
+                obj["circular_reference"] = True
+                stats.setdefault("circular_references", [])
+                if object_id not in stats["circular_references"]:
+                    stats["circular_references"].append(object_id)
+                continue
+
+            effective_props, contents = expanded.get(object_id, ({}, None))
             if effective_props:
-                # Check for VizlibContainer specific structure
-                if "qProp" in effective_props:
-                    qprop = effective_props.get("qProp", {})
-                    if "containerObjects" in qprop:
-                        vizlib_container_objects = qprop.get("containerObjects", [])
-
-                # Look for common container structures
-                if not vizlib_container_objects:
-                    if "tabs" in effective_props:
-                        tabs = effective_props.get("tabs", [])
-                    elif "panels" in effective_props:
-                        tabs = effective_props.get("panels", [])
-                    elif "qProperty" in effective_props:
-                        prop = effective_props.get("qProperty", {})
-                        if "tabs" in prop:
-                            tabs = prop.get("tabs", [])
-                        elif "panels" in prop:
-                            tabs = prop.get("panels", [])
-                    elif "props" in effective_props:
-                        props = effective_props.get("props", {})
-                        if "tabs" in props:
-                            tabs = props.get("tabs", [])
-
-            # Process VizlibContainer objects if found
-            if vizlib_container_objects:
-                print(f"Found {len(vizlib_container_objects)} VizlibContainer tabs in container {container_id}")
-                for tab_idx, container_obj in enumerate(vizlib_container_objects):
-                    tab_label = container_obj.get("label", f"Tab_{tab_idx + 1}")
-                    tab_id = container_obj.get("cId", f"{container_id}_tab_{tab_idx + 1}")
-
-                    print(f"Processing VizlibContainer tab: {tab_label}")
-
-                    # Extract master items from gridView
-                    grid_view = container_obj.get("gridView", {})
-                    master_items = grid_view.get("masterItems", [])
-
-                    for master_item in master_items:
-                        master_item_id = master_item.get("masterItemId")
-                        if master_item_id:
-                            print(f"  Found master item: {master_item_id}")
-                            # Try to get the master item object
-                            try:
-                                obj_result = self._send_request(
-                                    "GetObject",
-                                    self.app_handle,
-                                    [master_item_id],
-                                )
-                                if obj_result and "qReturn" in obj_result:
-                                    obj_handle = obj_result["qReturn"]["qHandle"]
-                                    if obj_handle:
-                                        obj_layout = self._send_request("GetLayout", obj_handle)
-
-                                        embedded_obj = self._create_object_from_layout(
-                                            master_item_id,
-                                            obj_layout,
-                                            container_id,
-                                            tab_label,
-                                            include_properties,
-                                            include_layout,
-                                            include_data_definition,
-                                            resolve_master_items,
-                                            master_measures_cache,
-                                            master_dimensions_cache,
-                                        )
-                                        if embedded_obj:
-                                            embedded_obj["container_tab"] = tab_label
-                                            embedded_obj["container_tab_id"] = tab_id
-                                            embedded_obj["cell_label"] = master_item.get("label", "")
-                                            embedded_objects.append(embedded_obj)
-                            except Exception as e:
-                                print(f"Could not get master item {master_item_id}: {e}")
-            else:
-                print(f"Found {len(tabs)} tabs/panels in container {container_id}")
-
-            # Process each tab/panel
-            for tab_idx, tab in enumerate(tabs):
-                tab_objects = []
-
-                # Extract tab metadata
-                tab_label = tab.get("label", f"Tab_{tab_idx + 1}")
-                tab_id = tab.get("id", f"{container_id}_tab_{tab_idx + 1}")
-
-                # Look for embedded objects in the tab
-                if "objects" in tab:
-                    for obj in tab.get("objects", []):
-                        embedded_obj = self._process_embedded_object(
-                            obj,
-                            container_id,
-                            tab_label,
-                            include_properties,
-                            include_layout,
-                            include_data_definition,
-                            resolve_master_items,
-                            master_measures_cache,
-                            master_dimensions_cache,
-                        )
-                        if embedded_obj:
-                            tab_objects.append(embedded_obj)
+                obj["container_structure"] = self._extract_container_structure(effective_props)
+            if contents is None:
+                obj["expanded"] = False
+                obj["cursor"] = encode_container_cursor(self.app_id, sheet_id, object_id, depth + 1)
+                continue
 
-                # Also check for object references
-                elif "objectId" in tab or "qObjectId" in tab:
-                    obj_id = tab.get("objectId") or tab.get("qObjectId")
-                    if obj_id:
-                        # Try to get the referenced object
-                        try:
-                            obj_result = self._send_request(
-                                "GetObject",
-                                self.app_handle,
-                                [obj_id],
-                            )
-                            if obj_result and "qReturn" in obj_result:
-                                obj_handle = obj_result["qReturn"]["qHandle"]
-                                obj_layout = self._send_request("GetLayout", obj_handle)
-
-                                embedded_obj = self._create_object_from_layout(
-                                    obj_id,
-                                    obj_layout,
-                                    container_id,
-                                    tab_label,
-                                    include_properties,
-                                    include_layout,
-                                    include_data_definition,
-                                    resolve_master_items,
-                                    master_measures_cache,
-                                    master_dimensions_cache,
-                                )
-                                if embedded_obj:
-                                    tab_objects.append(embedded_obj)
-                        except Exception as e:
-                            print(f"Could not get embedded object {obj_id}: {e}")
+            nested = [dict(content) for content in contents]
+            self._attach_container_contents(nested, expanded, sheet_id, depth + 1, path | {object_id}, stats)
+            if nested:
+                obj["embedded_objects"] = nested
+                obj["embedded_object_count"] = len(nested)
 
-                # Add tab objects to main list
-                for obj in tab_objects:
-                    obj["container_tab"] = tab_label
-                    obj["container_tab_id"] = tab_id
-                    embedded_objects.append(obj)
+    def _build_container_contents(
+        self,
+        plans: list[tuple[str, dict[str, Any], list[dict[str, Any]]]],
+        layouts: dict[str, tuple[int | None, dict[str, Any]] | Exception],
+        include_properties: bool,
+        include_layout: bool,
+        include_data_definition: bool,
+        resolve_master_items: bool,
+        master_measures_cache: dict[str, dict[str, Any]],
+        master_dimensions_cache: dict[str, dict[str, Any]],
+    ) -> dict[str, tuple[dict[str, Any], list[dict[str, Any]]]]:
+        """Build the embedded objects of planned containers from fetched layouts
 
-            # If no tabs structure found, try to get child objects directly
-            if not tabs and container_handle:
-                try:
-                    # Try GetChildInfos to see if there are child objects
-                    child_info_result = self._send_request("GetChildInfos", container_handle)
-                    if child_info_result:
-                        for child in child_info_result:
-                            child_id = child.get("qId", "")
-                            if child_id:
-                                try:
-                                    obj_result = self._send_request(
-                                        "GetObject",
-                                        self.app_handle,
-                                        [child_id],
-                                    )
-                                    if obj_result and "qReturn" in obj_result:
-                                        obj_handle = obj_result["qReturn"]["qHandle"]
-                                        obj_layout = self._send_request("GetLayout", obj_handle)
-
-                                        embedded_obj = self._create_object_from_layout(
-                                            child_id,
-                                            obj_layout,
-                                            container_id,
-                                            "Main",
-                                            include_properties,
-                                            include_layout,
-                                            include_data_definition,
-                                            resolve_master_items,
-                                            master_measures_cache,
-                                            master_dimensions_cache,
-                                        )
-                                        if embedded_obj:
-                                            embedded_obj["container_tab"] = "Main"
-                                            embedded_objects.append(embedded_obj)
-                                except Exception as e:
-                                    print(f"Could not process child object {child_id}: {e}")
-                except Exception:
-                    pass  # GetChildInfos might not be available
+        Returns (effective properties, embedded objects) by container id.
+        """
+        expanded = {}
+        for container_id, effective_props, references in plans:
+            embedded_objects = []
+            for reference in references:
+                embedded_obj = self._build_embedded_object(
+                    reference,
+                    layouts[reference["object_id"]],
+                    container_id,
+                    include_properties,
+                    include_layout,
+                    include_data_definition,
+                    resolve_master_items,
+                    master_measures_cache,
+                    master_dimensions_cache,
+                )
+                if embedded_obj:
+                    embedded_objects.append(embedded_obj)
 
             print(f"Extracted {len(embedded_objects)} embedded objects from container {container_id}")
+            expanded[container_id] = (effective_props, embedded_objects)
 
+        return expanded
+
+    async def _get_full_property_tree(self, object_handle: int) -> dict[str, Any] | None:
+        """Get an object's properties with all its children's, or None if unavailable"""
+        try:
+            result = (await self._send_cached_batch([("GetFullPropertyTree", object_handle)]))[0]
+            if isinstance(result, Exception):
+                raise result
         except Exception as e:
-            print(f"Error processing container contents: {e}")
+            print(f"GetFullPropertyTree failed, falling back to layouts: {e}")
+            return None
+        if not result or "qPropEntry" not in result:
+            print("GetFullPropertyTree returned no tree, falling back to layouts")
+            return None
+        return result["qPropEntry"]
+
+    @staticmethod
+    def _needs_computed_layout(properties: dict[str, Any]) -> bool:
+        """Check whether an object's output depends on values only its layout computes
+
+        Titles given as expressions are only evaluated in the layout, and objects
+        linked to a master visualization keep their definition in the master.
+        """
+        if properties.get("qExtendsId"):
+            return True
+        return any(isinstance(properties.get(key), dict) for key in ("title", "subtitle"))
+
+    async def _read_property_tree(
+        self,
+        tree: dict[str, Any],
+        include_properties: bool,
+        include_layout: bool,
+        include_data_definition: bool,
+        resolve_master_items: bool,
+        master_measures_cache: dict[str, dict[str, Any]],
+        master_dimensions_cache: dict[str, dict[str, Any]],
+        max_depth: int = 1,
+        max_nodes: int | None = None,
+        traversal: dict[str, Any] | None = None,
+    ) -> tuple[
+        str,
+        list[dict[str, Any]],
+        list[tuple[int | None, dict[str, Any]] | Exception],
+        dict[str, tuple[dict[str, Any], list[dict[str, Any]] | None]],
+        dict[str, Any],
+    ]:
+        """Build a sheet's children and container contents from its full property tree
+
+        Objects found in the tree are built from their properties; master items
+        referenced by VizlibContainers, objects outside the tree and objects that
+        need computed layout values are opened and laid out in one pair of bursts.
+        The tree covers the sheet's own containers; containers nested in them are
+        expanded through _expand_containers, within the same depth and object
+        limits. The round trip figures cover the first level only.
+
+        Returns the sheet title, child infos, child layouts, expanded containers
+        and the round trips saved compared to the layout walk.
+        """
+        sheet_props = tree.get("qProperty", {})
+        sheet_title = sheet_props.get("qMetaDef", {}).get("title", "")
+        cells = {cell.get("name"): cell for cell in sheet_props.get("cells", [])}
+
+        # Every object in the tree by id, with its child entries
+        nodes: dict[str, tuple[dict[str, Any], list[dict[str, Any]]]] = {}
+        pending = list(tree.get("qChildren", []))
+        while pending:
+            entry = pending.pop()
+            properties = entry.get("qProperty", {})
+            object_id = properties.get("qInfo", {}).get("qId", "")
+            if object_id and object_id not in nodes:
+                nodes[object_id] = (properties, entry.get("qChildren", []))
+                pending.extend(entry.get("qChildren", []))
+
+        child_infos = []
+        for entry in tree.get("qChildren", []):
+            info = entry.get("qProperty", {}).get("qInfo", {})
+            cell = cells.get(info.get("qId"), {})
+            child_infos.append({
+                "qInfo": {"qId": info.get("qId", ""), "qType": info.get("qType", "")},
+                "qData": {key: cell[key] for key in ("col", "row", "colspan", "rowspan") if key in cell},
+            })
+        print(f"Found {len(child_infos)} child objects in the property tree")
+
+        plans = []
+        for child_info in child_infos:
+            object_id = child_info["qInfo"]["qId"]
+            if child_info["qInfo"]["qType"].lower() in CONTAINER_TYPES and object_id in nodes:
+                properties, children = nodes[object_id]
+                effective_props = {"qProp": properties}
+                child_refs = [{"qId": child.get("qProperty", {}).get("qInfo", {}).get("qId", "")} for child in children]
+                plans.append((object_id, effective_props, self._container_references(
+                    object_id, effective_props, child_refs,
+                )))
+
+        # Objects built from their properties, laid out only where needed
+        layouts: dict[str, tuple[int | None, dict[str, Any]] | Exception] = {
+            object_id: (None, {"qLayout": properties})
+            for object_id, (properties, _children) in nodes.items()
+            if not self._needs_computed_layout(properties)
+        }
+        traversal = traversal if traversal is not None else {}
+        expand_plans = self._plans_within_budget(plans, set(), max_nodes, traversal) if max_depth >= 1 else []
+        expand_ids = {plan[0] for plan in expand_plans}
+
+        needed = [child_info["qInfo"]["qId"] for child_info in child_infos]
+        needed.extend(reference["object_id"] for *_, references in expand_plans for reference in references)
+        fallback_ids = [object_id for object_id in dict.fromkeys(needed) if object_id not in layouts]
+        layouts.update(zip(fallback_ids, await self._get_objects_with_layouts(fallback_ids)))
+
+        child_layouts = [layouts[child_info["qInfo"]["qId"]] for child_info in child_infos]
+        expanded_containers = self._build_container_contents(
+            expand_plans,
+            layouts,
+            include_properties,
+            include_layout,
+            include_data_definition,
+            resolve_master_items,
+            master_measures_cache,
+            master_dimensions_cache,
+        )
+        for object_id, effective_props, _references in plans:
+            if object_id not in expand_ids:
+                expanded_containers[object_id] = (effective_props, None)
+
+        # What the layout walk would have sent: the sheet, every child, every
+        # container's properties and child infos, and every embedded object
+        embedded_ids = {reference["object_id"] for *_, references in expand_plans for reference in references}
+        layout_requests = 2 + 2 * len(child_infos) + 2 * len(plans) + 2 * len(embedded_ids)
+        layout_round_trips = 2 + (2 if child_infos else 0) + ((3 if embedded_ids else 1) if plans else 0)
+        requests = 2 + 2 * len(fallback_ids)
+        round_trips = 2 + (2 if fallback_ids else 0)
+        tree_stats = {
+            "objects_from_tree": len(set(needed) - set(fallback_ids)),
+            "layout_fallbacks": fallback_ids,
+            "requests": requests,
+            "round_trips": round_trips,
+            "requests_saved": layout_requests - requests,
+            "round_trips_saved": layout_round_trips - round_trips,
+        }
 
-        return embedded_objects
+        # Containers nested in the sheet's containers continue one level down
+        if expand_plans:
+            traversal["levels"] = traversal.get("levels", 0) + 1
+            traversal["containers_expanded"] = traversal.get("containers_expanded", 0) + len(expand_plans)
+            traversal["objects"] = traversal.get("objects", 0) + len(embedded_ids)
+            visited = {plan[0] for plan in plans}
+            nested = []
+            for object_id in dict.fromkeys(
+                reference["object_id"] for *_, references in expand_plans for reference in references
+            ):
+                layout_result = layouts.get(object_id)
+                if isinstance(layout_result, tuple):
+                    layout_data = layout_result[1].get("qLayout", layout_result[1])
+                    object_type = layout_data.get("qInfo", {}).get("qType", "")
+                    if object_type.lower() in CONTAINER_TYPES and object_id not in visited:
+                        visited.add(object_id)
+                        nested.append((object_id, layout_result[0]))
+            expanded_containers.update(await self._expand_containers(
+                nested,
+                include_properties,
+                include_layout,
+                include_data_definition,
+                resolve_master_items,
+                master_measures_cache,
+                master_dimensions_cache,
+                max_depth=max_depth,
+                max_nodes=None if max_nodes is None else max_nodes - len(embedded_ids),
+                depth=2,
+                visited=visited,
+                stats=traversal,
+            ))
 
-    def _process_embedded_object(
+        return sheet_title, child_infos, child_layouts, expanded_containers, tree_stats
+
+    def _container_references(
         self,
-        obj_data: dict[str, Any],
         container_id: str,
-        tab_label: str,
+        effective_props: dict[str, Any],
+        child_infos: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """List the objects embedded in a container, in the order they are reported
+
+        VizlibContainer tabs reference master visualizations through their grid
+        view; standard containers list tab/panel objects or object references.
+        Child infos are only used when the container has no tabs or panels.
+        """
+        references = []
+        tabs = []
+        vizlib_container_objects = []
+
+        if effective_props:
+            # Check for VizlibContainer specific structure
+            if "qProp" in effective_props:
+                qprop = effective_props.get("qProp", {})
+                if "containerObjects" in qprop:
+                    vizlib_container_objects = qprop.get("containerObjects", [])
+
+            # Look for common container structures
+            if not vizlib_container_objects:
+                if "tabs" in effective_props:
+                    tabs = effective_props.get("tabs", [])
+                elif "panels" in effective_props:
+                    tabs = effective_props.get("panels", [])
+                elif "qProperty" in effective_props:
+                    prop = effective_props.get("qProperty", {})
+                    if "tabs" in prop:
+                        tabs = prop.get("tabs", [])
+                    elif "panels" in prop:
+                        tabs = prop.get("panels", [])
+                elif "props" in effective_props:
+                    props = effective_props.get("props", {})
+                    if "tabs" in props:
+                        tabs = props.get("tabs", [])
+                elif "tabs" in effective_props.get("qProp", {}):
+                    tabs = effective_props["qProp"].get("tabs", [])
+                elif "panels" in effective_props.get("qProp", {}):
+                    tabs = effective_props["qProp"].get("panels", [])
+
+        # VizlibContainer tabs reference master items from their grid view
+        if vizlib_container_objects:
+            print(f"Found {len(vizlib_container_objects)} VizlibContainer tabs in container {container_id}")
+        else:
+            print(f"Found {len(tabs)} tabs/panels in container {container_id}")
+        for tab_idx, container_obj in enumerate(vizlib_container_objects):
+            tab_label = container_obj.get("label", f"Tab_{tab_idx + 1}")
+            tab_id = container_obj.get("cId", f"{container_id}_tab_{tab_idx + 1}")
+            for master_item in container_obj.get("gridView", {}).get("masterItems", []):
+                master_item_id = master_item.get("masterItemId")
+                if master_item_id:
+                    references.append({
+                        "kind": "master_item",
+                        "object_id": master_item_id,
+                        "tab_label": tab_label,
+                        "tab_id": tab_id,
+                        "cell_label": master_item.get("label", ""),
+                    })
+
+        # Standard tabs/panels embed objects or reference one object each
+        for tab_idx, tab in enumerate(tabs):
+            tab_label = tab.get("label", f"Tab_{tab_idx + 1}")
+            tab_id = tab.get("id", f"{container_id}_tab_{tab_idx + 1}")
+            if "objects" in tab:
+                for obj in tab.get("objects", []):
+                    obj_id = obj.get("id") or obj.get("qId", "")
+                    if obj_id:
+                        references.append({
+                            "kind": "tab_object",
+                            "object_id": obj_id,
+                            "object_type": obj.get("type") or obj.get("qType", ""),
+                            "tab_label": tab_label,
+                            "tab_id": tab_id,
+                        })
+            elif tab.get("objectId") or tab.get("qObjectId"):
+                references.append({
+                    "kind": "tab_reference",
+                    "object_id": tab.get("objectId") or tab.get("qObjectId"),
+                    "tab_label": tab_label,
+                    "tab_id": tab_id,
+                })
+
+        # If no tabs structure found, use the container's child objects
+        if not tabs and not vizlib_container_objects:
+            for child in child_infos:
+                child_id = child.get("qId", "")
+                if child_id:
+                    references.append({"kind": "child", "object_id": child_id, "tab_label": "Main"})
+
+        return references
+
+    def _build_embedded_object(
+        self,
+        reference: dict[str, Any],
+        layout_result: tuple[int, dict[str, Any]] | Exception,
+        container_id: str,
         include_properties: bool,
         include_layout: bool,
         include_data_definition: bool,
@@ -989,52 +1743,41 @@ class QlikClient:
         master_measures_cache: dict[str, dict[str, Any]],
         master_dimensions_cache: dict[str, dict[str, Any]],
     ) -> dict[str, Any] | None:
-        """Process an embedded object definition from container"""
-        try:
-            obj_id = obj_data.get("id") or obj_data.get("qId", "")
-            obj_type = obj_data.get("type") or obj_data.get("qType", "")
+        """Build one embedded object from its container reference and fetched layout"""
+        obj_id = reference["object_id"]
+        tab_label = reference["tab_label"]
 
-            if not obj_id:
+        if isinstance(layout_result, Exception):
+            if reference["kind"] != "tab_object":
+                print(f"Could not get embedded object {obj_id}: {layout_result}")
                 return None
-
+            # Objects listed in a tab keep their basic info when they cannot be opened
             embedded_obj = {
                 "object_id": obj_id,
-                "object_type": obj_type,
+                "object_type": reference["object_type"],
                 "parent_container": container_id,
                 "is_embedded": True,
             }
+        else:
+            embedded_obj = self._create_object_from_layout(
+                obj_id,
+                layout_result[1],
+                container_id,
+                tab_label,
+                include_properties,
+                include_layout,
+                include_data_definition,
+                resolve_master_items,
+                master_measures_cache,
+                master_dimensions_cache,
+            )
 
-            # Try to get more details about the object
-            try:
-                obj_result = self._send_request(
-                    "GetObject",
-                    self.app_handle,
-                    [obj_id],
-                )
-                if obj_result and "qReturn" in obj_result:
-                    obj_handle = obj_result["qReturn"]["qHandle"]
-                    obj_layout = self._send_request("GetLayout", obj_handle)
-
-                    return self._create_object_from_layout(
-                        obj_id,
-                        obj_layout,
-                        container_id,
-                        tab_label,
-                        include_properties,
-                        include_layout,
-                        include_data_definition,
-                        resolve_master_items,
-                        master_measures_cache,
-                        master_dimensions_cache,
-                    )
-            except Exception:
-                pass  # Continue with basic info if detailed fetch fails
-
-            return embedded_obj
-
-        except Exception as e:
-            print(f"Error processing embedded object: {e}")
-            return None
+        embedded_obj["container_tab"] = tab_label
+        if "tab_id" in reference:
+            embedded_obj["container_tab_id"] = reference["tab_id"]
+        if "cell_label" in reference:
+            embedded_obj["cell_label"] = reference["cell_label"]
+        return embedded_obj
 
     def _create_object_from_layout(
         self,
@@ -1150,6 +1893,10 @@ class QlikClient:
                         tabs = prop.get("tabs", [])
                     elif "panels" in prop:
                         tabs = prop.get("panels", [])
+                elif "tabs" in effective_props.get("qProp", {}):
+                    tabs = effective_props["qProp"].get("tabs", [])
+                elif "panels" in effective_props.get("qProp", {}):
+                    tabs = effective_props["qProp"].get("panels", [])
 
                 for tab in tabs:
                     tab_info = {
@@ -1183,11 +1930,7 @@ class QlikClient:
 
         # Check if this is a master measure reference
         if library_id and resolve_master_items:
-            resolution = self.resolve_master_item_reference(
-                library_id,
-                "measure",
-                master_measures_cache,
-            )
+            resolution = self._lookup_master_item(library_id, master_measures_cache)
             if resolution.get("resolved"):
                 master_item = resolution.get("master_item", {})
                 measure_data["library_id"] = library_id
@@ -1218,11 +1961,7 @@ class QlikClient:
 
         # Check if this is a master dimension reference
         if library_id and resolve_master_items:
-            resolution = self.resolve_master_item_reference(
-                library_id,
-                "dimension",
-                master_dimensions_cache,
-            )
+            resolution = self._lookup_master_item(library_id, master_dimensions_cache)
             if resolution.get("resolved"):
                 master_item = resolution.get("master_item", {})
                 dimension_data["library_id"] = library_id
@@ -1238,26 +1977,51 @@ class QlikClient:
 
         return dimension_data
 
-    def get_effective_properties(self, object_handle: int) -> dict[str, Any]:
+    async def _get_session_object_handle(self, create_params: list[dict[str, Any]], object_type: str) -> int:
+        """Create a session object, reusing an identical one already created on this connection"""
+        cache_key = json.dumps(create_params, sort_keys=True)
+        if cache_key in self._session_objects:
+            handle = self._session_objects[cache_key]
+            print(f"Reusing {object_type} with handle: {handle}")
+            return handle
+
+        create_result = await self._send_request(
+            "CreateSessionObject",
+            self.app_handle,
+            create_params,
+        )
+
+        if not create_result or "qReturn" not in create_result:
+            raise ValueError(f"Failed to create {object_type} object")
+
+        handle = create_result["qReturn"]["qHandle"]
+        self._session_objects[cache_key] = handle
+        print(f"Created {object_type} with handle: {handle}")
+        return handle
+
+    async def get_effective_properties(self, object_handle: int) -> dict[str, Any]:
         """Get effective properties of an object (especially useful for containers)"""
         if not self.ws:
             raise ConnectionError("Not connected to Qlik Engine")
 
         try:
-            result = self._send_request("GetEffectiveProperties", object_handle)
+            result = await self._send_request("GetEffectiveProperties", object_handle)
             return result if result else {}
         except Exception as e:
             print(f"Error getting effective properties: {e}")
             return {}
 
-    def get_master_measures_map(self) -> dict[str, dict[str, Any]]:
-        """Get all master measures and return as a map keyed by ID"""
+    async def get_master_measures_map(self, raise_errors: bool = False) -> dict[str, dict[str, Any]]:
+        """Get all master measures and return as a map keyed by ID
+
+        Fetch errors yield an empty map unless raise_errors is set.
+        """
         if not self.ws or not self.app_handle:
             raise ConnectionError("Not connected to Qlik Engine")
 
         try:
             print("Fetching master measures for reference resolution...")
-            measures_result = self.get_measures(include_expression=True, include_tags=False)
+            measures_result = await self.get_measures(include_expression=True, include_tags=False)
             measures_map = {}
 
             for measure in measures_result.get("measures", []):
@@ -1275,16 +2039,21 @@ class QlikClient:
 
         except Exception as e:
             print(f"Error fetching master measures map: {e}")
+            if raise_errors:
+                raise
             return {}
 
-    def get_master_dimensions_map(self) -> dict[str, dict[str, Any]]:
-        """Get all master dimensions and return as a map keyed by ID"""
+    async def get_master_dimensions_map(self, raise_errors: bool = False) -> dict[str, dict[str, Any]]:
+        """Get all master dimensions and return as a map keyed by ID
+
+        Fetch errors yield an empty map unless raise_errors is set.
+        """
         if not self.ws or not self.app_handle:
             raise ConnectionError("Not connected to Qlik Engine")
 
         try:
             print("Fetching master dimensions for reference resolution...")
-            dimensions_result = self.get_dimensions(
+            dimensions_result = await self.get_dimensions(
                 include_title=True,
                 include_tags=False,
                 include_grouping=True,
@@ -1321,9 +2090,11 @@ class QlikClient:
 
         except Exception as e:
             print(f"Error fetching master dimensions map: {e}")
+            if raise_errors:
+                raise
             return {}
 
-    def resolve_master_item_reference(
+    async def resolve_master_item_reference(
         self,
         library_id: str,
         item_type: str,
@@ -1346,23 +2117,15 @@ class QlikClient:
         try:
             if item_type == "measure":
                 if master_items_cache is None:
-                    master_items_cache = self.get_master_measures_map()
+                    master_items_cache = await self.get_master_measures_map()
 
-                if library_id in master_items_cache:
-                    return {
-                        "resolved": True,
-                        "master_item": master_items_cache[library_id],
-                    }
+                return self._lookup_master_item(library_id, master_items_cache)
 
             elif item_type == "dimension":
                 if master_items_cache is None:
-                    master_items_cache = self.get_master_dimensions_map()
+                    master_items_cache = await self.get_master_dimensions_map()
 
-                if library_id in master_items_cache:
-                    return {
-                        "resolved": True,
-                        "master_item": master_items_cache[library_id],
-                    }
+                return self._lookup_master_item(library_id, master_items_cache)
 
             return {"resolved": False, "reason": "Master item not found"}
 
@@ -1370,7 +2133,21 @@ class QlikClient:
             print(f"Error resolving master item {library_id}: {e}")
             return {"resolved": False, "reason": str(e)}
 
-    def get_dimensions(
+    @staticmethod
+    def _lookup_master_item(
+        library_id: str,
+        master_items_cache: dict[str, dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Look up a master item reference in a pre-fetched map of master items"""
+        if library_id in master_items_cache:
+            return {
+                "resolved": True,
+                "master_item": master_items_cache[library_id],
+            }
+
+        return {"resolved": False, "reason": "Master item not found"}
+
+    async def get_dimensions(
         self,
         include_title: bool = True,
         include_tags: bool = True,
@@ -1411,20 +2188,10 @@ class QlikClient:
                 },
             ]
 
-            create_result = self._send_request(
-                "CreateSessionObject",
-                self.app_handle,
-                create_params,
-            )
-
-            if not create_result or "qReturn" not in create_result:
-                raise ValueError("Failed to create DimensionList object")
-
-            dimension_list_handle = create_result["qReturn"]["qHandle"]
-            print(f"Created DimensionList with handle: {dimension_list_handle}")
+            dimension_list_handle = await self._get_session_object_handle(create_params, "DimensionList")
 
             # Get layout containing dimension data
-            layout = self._send_request("GetLayout", dimension_list_handle)
+            layout = await self._send_request("GetLayout", dimension_list_handle)
             # The actual data is nested under qLayout
             actual_layout = layout.get("qLayout", layout) if layout else {}
 
@@ -1478,7 +2245,7 @@ class QlikClient:
             print(f"Error retrieving dimensions: {e}")
             raise
 
-    def get_script(self) -> dict[str, Any]:
+    async def get_script(self) -> dict[str, Any]:
         """Retrieve the script from the current app"""
         if not self.ws or not self.app_handle:
             raise ConnectionError("Not connected to Qlik Engine")
@@ -1487,7 +2254,7 @@ class QlikClient:
             print("Getting app script...")
 
             # Call GetScript method on the app handle
-            script_result = self._send_request("GetScript", self.app_handle)
+            script_result = await self._send_request("GetScript", self.app_handle)
 
             if not script_result:
                 raise ValueError("Failed to get app script")
@@ -1506,7 +2273,7 @@ class QlikClient:
             print(f"Error retrieving script: {e}")
             raise
 
-    def get_lineage(
+    async def get_lineage(
         self,
         include_resident: bool = True,
         include_file_sources: bool = True,
@@ -1521,7 +2288,7 @@ class QlikClient:
             print("Getting app data sources lineage...")
 
             # Call GetLineage method on the app handle (no parameters needed)
-            lineage_result = self._send_request("GetLineage", self.app_handle)
+            lineage_result = await self._send_request("GetLineage", self.app_handle)
 
             if not lineage_result:
                 raise ValueError("Failed to get app lineage")
@@ -1584,34 +2351,82 @@ class QlikClient:
 
     def _categorize_data_source(self, discriminator: str, statement: str = None) -> str:
         """Categorize data source based on discriminator and statement"""
-        discriminator_lower = discriminator.lower()
+        return categorize_data_source(discriminator, statement)
+
+    async def get_table_row_counts(self) -> dict[str, int]:
+        """Get the number of rows of every table in the app's data model"""
+        if not self.ws or not self.app_handle:
+            raise ConnectionError("Not connected to Qlik Engine")
+
+        result = await self._send_request(
+            "GetTablesAndKeys",
+            self.app_handle,
+            {
+                "qWindowSize": {"qcx": 0, "qcy": 0},
+                "qNullSize": {"qcx": 0, "qcy": 0},
+                "qCellHeight": 0,
+                "qSyntheticMode": False,
+                "qIncludeSysVars": False,
+            },
+        )
+        return {table.get("qName", ""): table.get("qNoOfRows", 0) for table in result.get("qtr", [])}
+
+    async def get_variable_values(self, names: list[str], batch_size: int | None = None) -> dict[str, Any]:
+        """Evaluate variables in pipelined bursts of GetVariableByName and GetLayout calls"""
+        if not self.ws or not self.app_handle:
+            raise ConnectionError("Not connected to Qlik Engine")
 
-        # Check for binary sources
-        if statement and statement.lower() == "binary":
-            return "binary"
+        if batch_size is None:
+            batch_size = int(os.getenv("QLIK_VARIABLE_BATCH_SIZE", "500"))
 
-        # Check for resident sources
-        if discriminator_lower.startswith("resident "):
-            return "resident"
+        values: dict[str, dict[str, Any]] = {}
+        round_trips = 0
+        for start in range(0, len(names), batch_size):
+            batch = names[start:start + batch_size]
+            variable_results = await self._send_batch(
+                [("GetVariableByName", self.app_handle, {"qName": name}) for name in batch],
+            )
+            round_trips += 1
+
+            handles = {}
+            for name, result in zip(batch, variable_results):
+                if isinstance(result, Exception):
+                    values[name] = {"error": str(result)}
+                elif not result or not result.get("qReturn", {}).get("qHandle"):
+                    values[name] = {"error": f"Variable not found: {name}"}
+                else:
+                    handles[name] = result["qReturn"]["qHandle"]
+
+            if not handles:
+                continue
 
-        # Check for inline sources
-        if discriminator_lower.startswith("inline"):
-            return "inline"
+            # The variable layouts hold the values the Engine evaluated
+            layout_results = await self._send_batch([("GetLayout", handle, None) for handle in handles.values()])
+            round_trips += 1
+            for name, result in zip(handles, layout_results):
+                if isinstance(result, Exception):
+                    values[name] = {"error": str(result)}
+                    continue
+                layout = result.get("qLayout", result) if result else {}
+                values[name] = {
+                    "text": layout.get("qText", ""),
+                    "number": layout.get("qNum"),
+                    "is_script_created": layout.get("qIsScriptCreated", False),
+                }
 
-        # Check for file sources (paths, URLs, etc.)
-        if any(indicator in discriminator_lower for indicator in [
-            "\\", "/", ".", "lib://", "http://", "https://", "ftp://", ".txt", ".csv", ".xlsx", ".qvd",
-        ]):
-            return "file"
+        return {"values": values, "round_trips": round_trips}
 
-        # Everything else
-        return "other"
+    def add_notification_listener(self, listener: Callable[[dict[str, Any]], None]):
+        """Register a callback for Engine notifications and change pushes"""
+        self._listeners.append(listener)
 
-    def _send_request(self, method: str, handle: int = -1, params: Any | None = None) -> dict[str, Any]:
-        """Send JSON-RPC request and wait for response"""
-        if not self.ws:
-            raise ConnectionError("WebSocket is not connected")
+    def remove_notification_listener(self, listener: Callable[[dict[str, Any]], None]):
+        """Unregister a notification callback"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
+    def _build_request(self, method: str, handle: int = -1, params: Any | None = None) -> dict[str, Any]:
+        """Build a JSON-RPC request with the next request id"""
         self.request_id += 1
 
         # Handle params based on method type
@@ -1651,31 +2466,288 @@ class QlikClient:
                 "params": params if params is not None else {},
             }
 
-        # Send request
-        request_json = json.dumps(request)
-        self.ws.send(request_json)
+        return request
 
-        # Set receive timeout
-        if hasattr(self.ws, "sock") and self.ws.sock:
-            self.ws.sock.settimeout(self.recv_timeout)
+    async def _send(self, method: str, handle: int = -1, params: Any | None = None) -> asyncio.Future:
+        """Send a JSON-RPC request and return a future resolved by the receive loop"""
+        if not self.ws:
+            raise ConnectionError("WebSocket is not connected")
 
-        # Wait for response
-        while True:
-            response_str = self.ws.recv()
-            response = json.loads(response_str)
+        request = self._build_request(method, handle, params)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request["id"]] = future
 
-            # Skip connection messages
-            if response.get("method") == "OnConnected":
-                continue
+        try:
+            await self.ws.send(json.dumps(request))
+        except Exception:
+            self._pending.pop(request["id"], None)
+            raise
+
+        return future
+
+    async def _wait(self, future: asyncio.Future) -> dict[str, Any]:
+        """Wait for a pending response, dropping it from the dispatcher on timeout"""
+        try:
+            return await asyncio.wait_for(future, timeout=self.recv_timeout)
+        except asyncio.TimeoutError:
+            for request_id, pending in list(self._pending.items()):
+                if pending is future:
+                    del self._pending[request_id]
+            raise
+
+    async def _send_request(self, method: str, handle: int = -1, params: Any | None = None) -> dict[str, Any]:
+        """Send JSON-RPC request and wait for response"""
+        future = await self._send(method, handle, params)
+        return await self._wait(future)
+
+    async def _send_batch(
+        self,
+        requests: list[tuple[str, int, Any | None]],
+    ) -> list[dict[str, Any] | Exception]:
+        """Send several JSON-RPC requests in one burst and wait for all responses
+
+        Returns one entry per request in the same order: the result, or the
+        exception raised for that request, so one failure does not hide the rest.
+        """
+        if not requests:
+            return []
+
+        futures = []
+        for method, handle, params in requests:
+            futures.append(await self._send(method, handle, params))
+
+        return await asyncio.gather(*(self._wait(future) for future in futures), return_exceptions=True)
+
+    async def _receive_loop(self, ws: ClientConnection):
+        """Route every incoming message to its pending request or to listeners"""
+        try:
+            async for message in ws:
+                response = json.loads(message)
+
+                # Change pushes ride on responses too, and must invalidate before the response resolves
+                if "change" in response:
+                    self.object_cache.invalidate(response["change"])
+                if "close" in response:
+                    self.object_cache.forget(response["close"])
+
+                # Notifications (OnConnected, OnClosed, ...) and change pushes go to listeners
+                if "method" in response or "change" in response or "close" in response:
+                    for listener in list(self._listeners):
+                        try:
+                            listener(response)
+                        except Exception as e:
+                            print(f"Notification listener failed: {e}")
+
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+
+                # Check for errors
+                if "error" in response:
+                    error = response["error"]
+                    future.set_exception(Exception(f"Engine API Error: {error.get('message', 'Unknown error')}"))
+                else:
+                    future.set_result(response.get("result", {}))
+
+        except Exception as e:
+            print(f"Receive loop stopped: {e}")
+
+        finally:
+            self._fail_pending(ConnectionError("WebSocket connection closed"))
+
+    def _fail_pending(self, error: Exception):
+        """Fail every request still waiting for a response"""
+        pending = self._pending
+        self._pending = {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+
+class QlikClient:
+    """Blocking Qlik Engine API client for scripts and synchronous callers
+
+    Wraps AsyncQlikClient and runs its coroutines on a private event loop
+    thread, so it can be used from plain functions and from inside a running
+    event loop alike.
+    """
+
+    def __init__(self):
+        """Initialize client with configuration from environment"""
+        self._client = AsyncQlikClient()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        """Expose configuration and connection state of the wrapped client"""
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    def _run(self, coro) -> Any:
+        """Run a coroutine on the client's event loop thread and wait for the result"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def connect(self, app_id: str) -> bool:
+        """Connect to Qlik Engine and open specified app"""
+        return self._run(self._client.connect(app_id))
+
+    def connect_global(self) -> bool:
+        """Connect to Qlik Engine global context (for listing apps)"""
+        return self._run(self._client.connect_global())
+
+    def disconnect(self):
+        """Close WebSocket connection and stop the event loop thread"""
+        if self._loop is None:
+            return
+        self._run(self._client.disconnect())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+    def get_app_version(self) -> str:
+        """Get a stamp of the opened app's last reload and last modification"""
+        return self._run(self._client.get_app_version())
+
+    def ping(self) -> bool:
+        """Check that the connection and the opened app are still usable"""
+        return self._run(self._client.ping())
+
+    def get_doc_list(self) -> dict[str, Any]:
+        """Get list of all available applications"""
+        return self._run(self._client.get_doc_list())
+
+    def get_measures(self, include_expression: bool = True, include_tags: bool = True) -> dict[str, Any]:
+        """Retrieve all measures from the current app"""
+        return self._run(self._client.get_measures(include_expression, include_tags))
+
+    def get_variables(
+        self,
+        include_definition: bool = True,
+        include_tags: bool = True,
+        show_reserved: bool = True,
+        show_config: bool = True,
+    ) -> dict[str, Any]:
+        """Retrieve all variables from the current app"""
+        return self._run(self._client.get_variables(include_definition, include_tags, show_reserved, show_config))
+
+    def get_fields(
+        self,
+        show_system: bool = True,
+        show_hidden: bool = True,
+        show_derived_fields: bool = True,
+        show_semantic: bool = True,
+        show_src_tables: bool = True,
+        show_implicit: bool = True,
+    ) -> dict[str, Any]:
+        """Retrieve all fields from the current app"""
+        return self._run(self._client.get_fields(
+            show_system, show_hidden, show_derived_fields, show_semantic, show_src_tables, show_implicit,
+        ))
+
+    def get_sheets(self, include_thumbnail: bool = False, include_metadata: bool = True) -> dict[str, Any]:
+        """Retrieve all sheets from the current app"""
+        return self._run(self._client.get_sheets(include_thumbnail, include_metadata))
+
+    def get_sheet_objects(
+        self,
+        sheet_id: str,
+        include_properties: bool = True,
+        include_layout: bool = True,
+        include_data_definition: bool = True,
+        resolve_master_items: bool = True,
+        use_property_tree: bool = False,
+        expand_containers: bool = True,
+        max_depth: int = 3,
+        max_nodes: int = 500,
+    ) -> dict[str, Any]:
+        """Retrieve all visualization objects from a specific sheet, including container contents"""
+        return self._run(self._client.get_sheet_objects(
+            sheet_id, include_properties, include_layout, include_data_definition, resolve_master_items,
+            use_property_tree=use_property_tree,
+            expand_containers=expand_containers,
+            max_depth=max_depth,
+            max_nodes=max_nodes,
+        ))
+
+    def expand_container(
+        self,
+        container_id: str,
+        tabs: list[str] | None = None,
+        include_properties: bool = True,
+        include_layout: bool = True,
+        include_data_definition: bool = True,
+        resolve_master_items: bool = True,
+        max_depth: int = 1,
+        max_nodes: int = 500,
+    ) -> dict[str, Any]:
+        """Expand the embedded objects of one container, optionally of some tabs only"""
+        return self._run(self._client.expand_container(
+            container_id, tabs, include_properties, include_layout, include_data_definition, resolve_master_items,
+            max_depth=max_depth,
+            max_nodes=max_nodes,
+        ))
+
+    def get_effective_properties(self, object_handle: int) -> dict[str, Any]:
+        """Get effective properties of an object (especially useful for containers)"""
+        return self._run(self._client.get_effective_properties(object_handle))
+
+    def get_master_measures_map(self) -> dict[str, dict[str, Any]]:
+        """Get all master measures and return as a map keyed by ID"""
+        return self._run(self._client.get_master_measures_map())
+
+    def get_master_dimensions_map(self) -> dict[str, dict[str, Any]]:
+        """Get all master dimensions and return as a map keyed by ID"""
+        return self._run(self._client.get_master_dimensions_map())
+
+    def resolve_master_item_reference(
+        self,
+        library_id: str,
+        item_type: str,
+        master_items_cache: dict[str, dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """Resolve a master item reference to its full definition"""
+        return self._run(self._client.resolve_master_item_reference(library_id, item_type, master_items_cache))
+
+    def get_dimensions(
+        self,
+        include_title: bool = True,
+        include_tags: bool = True,
+        include_grouping: bool = True,
+        include_info: bool = True,
+    ) -> dict[str, Any]:
+        """Retrieve all dimensions from the current app"""
+        return self._run(self._client.get_dimensions(include_title, include_tags, include_grouping, include_info))
+
+    def get_script(self) -> dict[str, Any]:
+        """Retrieve the script from the current app"""
+        return self._run(self._client.get_script())
+
+    def get_lineage(
+        self,
+        include_resident: bool = True,
+        include_file_sources: bool = True,
+        include_binary_sources: bool = True,
+        include_inline_sources: bool = True,
+    ) -> dict[str, Any]:
+        """Retrieve data sources lineage from the current app"""
+        return self._run(self._client.get_lineage(
+            include_resident, include_file_sources, include_binary_sources, include_inline_sources,
+        ))
 
-            # Check for errors
-            if "error" in response:
-                error = response["error"]
-                raise Exception(f"Engine API Error: {error.get('message', 'Unknown error')}")
+    def get_table_row_counts(self) -> dict[str, int]:
+        """Get the number of rows of every table in the app's data model"""
+        return self._run(self._client.get_table_row_counts())
 
-            # Check if this is our response
-            if response.get("id") == self.request_id:
-                return response.get("result", {})
+    def get_variable_values(self, names: list[str], batch_size: int | None = None) -> dict[str, Any]:
+        """Evaluate variables in pipelined bursts of GetVariableByName and GetLayout calls"""
+        return self._run(self._client.get_variable_values(names, batch_size))
 
 
 def test_connection():
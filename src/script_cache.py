@@ -0,0 +1,247 @@
+"""Script analysis and line indexes cached per section hash and app version"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from .script_lexer import LineIndex, ScriptScan, scan_script
+
+
+def split_script_sections(script: str) -> list[tuple[int, str]]:
+    """Split a script at ///$tab marker lines into (start_line, text) chunks
+
+    Each chunk starts with its marker line (text before the first marker forms
+    its own chunk), so joining the chunks with newlines gives back the script.
+    """
+    lines = script.split("\n")
+    starts = [0]
+    starts.extend(i for i, line in enumerate(lines) if i and line.lstrip().startswith("///$tab"))
+    starts.append(len(lines))
+
+    return [
+        (starts[index] + 1, "\n".join(lines[starts[index]:starts[index + 1]]))
+        for index in range(len(starts) - 1)
+    ]
+
+
+def section_hash(text: str) -> str:
+    """Content hash identifying a section independently of its position"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _shift_lines(items: list[dict[str, Any]], key: str, offset: int) -> list[dict[str, Any]]:
+    """Copy extracted items with their line numbers moved by offset"""
+    return [{**item, key: item[key] + offset} for item in items]
+
+
+def merge_section_scans(parts: list[tuple[int, ScriptScan]]) -> ScriptScan:
+    """Combine per-section scans into the scan of the whole script
+
+    Line numbers in each part are relative to its section and are shifted by
+    the section's start line; the cached parts themselves are never modified.
+    """
+    merged = ScriptScan()
+    for start_line, scan in parts:
+        offset = start_line - 1
+        merged.total_lines += scan.total_lines
+        merged.empty_lines += scan.empty_lines
+        merged.comment_lines += scan.comment_lines
+        merged.load_statements += scan.load_statements
+        merged.store_statements += scan.store_statements
+        merged.drop_statements += scan.drop_statements
+        merged.binary_loads.extend(_shift_lines(scan.binary_loads, "line_number", offset))
+        merged.set_variables.extend(_shift_lines(scan.set_variables, "line", offset))
+        merged.let_variables.extend(_shift_lines(scan.let_variables, "line", offset))
+        merged.connections.extend(scan.connections)
+        merged.includes.extend(scan.includes)
+        merged.subroutines.extend(scan.subroutines)
+        merged.connection_statements.extend(_shift_lines(scan.connection_statements, "line", offset))
+        merged.include_statements.extend(_shift_lines(scan.include_statements, "line", offset))
+        merged.subroutine_definitions.extend(_shift_lines(scan.subroutine_definitions, "line", offset))
+        merged.tab_markers.extend((line + offset, name) for line, name in scan.tab_markers)
+    return merged
+
+
+class SectionScanCache:
+    """LRU cache of section scans keyed by section content hash
+
+    A script edited in one tab keeps the hashes of every other tab, so only the
+    edited tab is scanned again. Sections are scanned independently, which
+    matches a whole-script scan as long as no statement spans a ///$tab marker.
+    """
+
+    def __init__(self, max_entries: int | None = None, enabled: bool | None = None):
+        """Initialize cache with configuration from arguments or environment"""
+        self.max_entries = (
+            max_entries if max_entries is not None else int(os.getenv("QLIK_SCRIPT_CACHE_MAX_SECTIONS", "2048"))
+        )
+        self.enabled = (
+            enabled if enabled is not None else os.getenv("QLIK_SCRIPT_CACHE_ENABLED", "true").lower() == "true"
+        )
+
+        self._entries: OrderedDict[str, ScriptScan] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evicted": 0,
+        }
+
+    def scan(self, script: str) -> tuple[ScriptScan, dict[str, int]]:
+        """Scan a script section by section, reusing cached section scans
+
+        Returns the merged scan and the number of sections scanned and served
+        from cache.
+        """
+        if not self.enabled:
+            return scan_script(script), {"sections": 1, "from_cache": 0}
+
+        parts = []
+        from_cache = 0
+        for start_line, text in split_script_sections(script):
+            key = section_hash(text)
+            with self._lock:
+                scan = self._entries.get(key)
+                if scan is not None:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    from_cache += 1
+
+            if scan is None:
+                scan = scan_script(text)
+                with self._lock:
+                    self.stats["misses"] += 1
+                    self._entries[key] = scan
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.stats["evicted"] += 1
+
+            parts.append((start_line, scan))
+
+        return merge_section_scans(parts), {"sections": len(parts), "from_cache": from_cache}
+
+    def clear(self):
+        """Drop every cached section scan"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return cache counters and current size"""
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+class ScriptIndex:
+    """An app script with its line index and section map
+
+    Built once per app version so line ranges and sections can be sliced out
+    of a large script without downloading or splitting it again. Slices are
+    sanitized by the caller, so no sanitized copy of the whole script is kept.
+    """
+
+    def __init__(self, script: str, sections: dict[str, tuple[int, int]]):
+        """Index the script
+
+        Args:
+            script: Script as returned by the Engine
+            sections: Section name to (start_line, end_line), 1-based and inclusive
+
+        """
+        self.script = script
+        self.sections = sections
+        self.line_index = LineIndex(script)
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the script"""
+        return self.line_index.line_count
+
+    def slice_lines(self, start_line: int, end_line: int) -> str:
+        """Text of the 1-based inclusive line range"""
+        return self.script[self.line_index.line_start(start_line):self.line_index.line_end(end_line)]
+
+
+class ScriptIndexCache:
+    """LRU cache of script indexes keyed by app ID and app version"""
+
+    def __init__(self, max_entries: int | None = None):
+        """Initialize cache with configuration from arguments or environment"""
+        self.max_entries = (
+            max_entries if max_entries is not None else int(os.getenv("QLIK_SCRIPT_INDEX_MAX_ENTRIES", "16"))
+        )
+
+        self._entries: OrderedDict[str, tuple[str, ScriptIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evicted": 0,
+        }
+
+    def get(self, app_id: str, version: str) -> ScriptIndex | None:
+        """Return the app's script index if it was built from the same version"""
+        with self._lock:
+            entry = self._entries.get(app_id)
+            if entry is None or entry[0] != version:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(app_id)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(self, app_id: str, version: str, index: ScriptIndex):
+        """Store the script index built from the given app version"""
+        with self._lock:
+            self._entries[app_id] = (version, index)
+            self._entries.move_to_end(app_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+
+    def clear(self):
+        """Drop every cached script index"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return cache counters and current size"""
+        with self._lock:
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+_section_cache: SectionScanCache | None = None
+_section_cache_lock = threading.Lock()
+
+
+def get_section_scan_cache() -> SectionScanCache:
+    """Get the process-wide section scan cache, creating it on first use"""
+    global _section_cache
+    with _section_cache_lock:
+        if _section_cache is None:
+            _section_cache = SectionScanCache()
+        return _section_cache
+
+
+_index_cache: ScriptIndexCache | None = None
+_index_cache_lock = threading.Lock()
+
+
+def get_script_index_cache() -> ScriptIndexCache:
+    """Get the process-wide script index cache, creating it on first use"""
+    global _index_cache
+    with _index_cache_lock:
+        if _index_cache is None:
+            _index_cache = ScriptIndexCache()
+        return _index_cache
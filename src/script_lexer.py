@@ -0,0 +1,315 @@
+"""Single-pass lexer and analyzer for Qlik load scripts"""
+
+import re
+from bisect import bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+# One alternation tried at every position; order matters (paths before comments,
+# comments before symbols). Unterminated strings and comments run to the end.
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<space>[ \t\r\f\v\n]+)
+    | (?P<path>[A-Za-z][\w+.-]*://[^\s;,()'"\[\]]*)
+    | (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))
+    | (?P<string>'(?:[^']|'')*(?:'|\Z)|"(?:[^"]|"")*(?:"|\Z))
+    | (?P<bracket>\[(?:[^\]]|\]\])*(?:\]|\Z))
+    | (?P<backtick>`[^`]*(?:`|\Z))
+    | (?P<dollar>\$\((?:[^()\n]|\([^()\n]*\))*\))
+    | (?P<word>[^\W\d][\w.]*|\$[\w.]+|@\d+)
+    | (?P<number>\d[\w.]*)
+    | (?P<symbol>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# REM comments out everything up to the end of the statement
+REM_BODY_PATTERN = re.compile(r"[^;]*;?")
+
+INCLUDE_PATTERN = re.compile(r"^\$\(\s*(?:Must_)?Include\s*=\s*(.*?)\s*\)$", re.IGNORECASE | re.DOTALL)
+
+CONNECT_PREFIXES = {"LIB", "ODBC", "OLEDB", "CUSTOM"}
+
+NEWLINE_PATTERN = re.compile("\n")
+
+
+class LineIndex:
+    """Offsets of every line start, for offset-to-line lookups by binary search
+
+    Built once per script so any extractor can turn a character offset into a
+    line number in O(log n) instead of counting newlines in the prefix.
+    """
+
+    def __init__(self, text: str):
+        """Index the start offset of each line in the text"""
+        self.line_starts = [0]
+        self.line_starts.extend(match.end() for match in NEWLINE_PATTERN.finditer(text))
+        self.length = len(text)
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the text"""
+        return len(self.line_starts)
+
+    def line_of(self, offset: int) -> int:
+        """1-based line number containing the character offset"""
+        return bisect_right(self.line_starts, offset)
+
+    def line_start(self, line: int) -> int:
+        """Character offset where a 1-based line starts"""
+        return self.line_starts[line - 1]
+
+    def line_end(self, line: int) -> int:
+        """Character offset where a 1-based line ends (excluding its newline)"""
+        if line < len(self.line_starts):
+            return self.line_starts[line] - 1
+        return self.length
+
+
+@dataclass(slots=True)
+class Token:
+    """A lexical token of a Qlik script"""
+
+    kind: str
+    text: str
+    start: int
+    end: int
+    line: int
+    end_line: int
+
+
+@dataclass
+class ScriptScan:
+    """Counts and extractions gathered in one pass over a script"""
+
+    total_lines: int = 0
+    empty_lines: int = 0
+    comment_lines: int = 0
+    load_statements: int = 0
+    store_statements: int = 0
+    drop_statements: int = 0
+    binary_loads: list[dict[str, Any]] = field(default_factory=list)
+    set_variables: list[dict[str, Any]] = field(default_factory=list)
+    let_variables: list[dict[str, Any]] = field(default_factory=list)
+    connections: list[str] = field(default_factory=list)
+    includes: list[str] = field(default_factory=list)
+    subroutines: list[str] = field(default_factory=list)
+    connection_statements: list[dict[str, Any]] = field(default_factory=list)
+    include_statements: list[dict[str, Any]] = field(default_factory=list)
+    subroutine_definitions: list[dict[str, Any]] = field(default_factory=list)
+    tab_markers: list[tuple[int, str | None]] = field(default_factory=list)
+
+
+def tokenize(script: str) -> Iterator[Token]:
+    """Split a script into tokens, skipping whitespace
+
+    Comments (//, /* */ and REM statements), string literals and [bracketed]
+    identifiers each come back as a single token, so keywords inside them are
+    never mistaken for code. Line numbers are tracked incrementally while
+    scanning, so tokenizing stays linear in the script length.
+    """
+    pos = 0
+    line = 1
+    length = len(script)
+    statement_start = True
+    last_line = 0
+    match_token = TOKEN_PATTERN.match
+
+    while pos < length:
+        match = match_token(script, pos)
+        kind = match.lastgroup
+        text = match.group()
+        end = match.end()
+        newlines = text.count("\n") if kind in ("space", "comment", "string", "bracket", "backtick") else 0
+
+        if kind == "space":
+            pos = end
+            line += newlines
+            continue
+
+        if kind == "word" and (statement_start or line != last_line) and text.upper() == "REM":
+            rem = REM_BODY_PATTERN.match(script, pos)
+            kind, text, end = "comment", rem.group(), rem.end()
+            newlines = text.count("\n")
+
+        yield Token(kind, text, pos, end, line, line + newlines)
+
+        if kind != "comment":
+            statement_start = text == ";"
+        pos = end
+        line += newlines
+        last_line = line
+
+
+def _strip_quotes(value: str) -> str:
+    """Remove surrounding quotes the way the original extractors did"""
+    return value.strip().strip('"').strip("'")
+
+
+def _clean_binary_source(value: str) -> str:
+    """Normalize a BINARY source to the bare path or app name"""
+    source = value.strip()
+    if source.upper().startswith("LOAD "):
+        source = source[5:].lstrip()
+        if source.upper().startswith("FROM "):
+            source = source[5:].lstrip()
+    if source.startswith("[") and source.endswith("]"):
+        source = source[1:-1]
+    return source.strip('"').strip("'")
+
+
+@dataclass(slots=True)
+class _PendingStatement:
+    """A statement whose value runs until its terminating semicolon"""
+
+    kind: str
+    start: int
+    value_start: int | None
+    name: str = ""
+
+
+def scan_script(script: str) -> ScriptScan:
+    """Gather every script statistic and extraction in a single sweep
+
+    A statement starts at the beginning of the script, after a semicolon, or at
+    the first token of a line. SET, LET, SUB, BINARY and CONNECT are recognized
+    only at statement starts; LOAD, STORE and DROP are counted wherever they
+    occur as code. Extractors record character offsets and resolve them to
+    line numbers through one LineIndex built for the script.
+    """
+    result = ScriptScan()
+    line_index = LineIndex(script)
+    line_of = line_index.line_of
+    result.total_lines = line_index.line_count
+
+    # Per-line flags: 1 = code, 2 = comment
+    line_flags = bytearray(result.total_lines + 2)
+
+    previous_line = 0
+    after_semicolon = True
+    statement_words: list[str] = []
+    statement_offset = 0
+    pending: _PendingStatement | None = None
+    expect_sub_name = False
+
+    def finish(statement: _PendingStatement, end: int):
+        value = script[statement.value_start:end]
+        line = line_of(statement.start)
+        if statement.kind in ("SET", "LET"):
+            target = result.set_variables if statement.kind == "SET" else result.let_variables
+            target.append({"name": statement.name, "value": value.strip(), "line": line})
+        elif statement.kind == "CONNECT":
+            target = _strip_quotes(value)
+            result.connections.append(target)
+            result.connection_statements.append({"target": target, "line": line})
+        elif statement.kind == "BINARY":
+            terminator = ";" if script.startswith(";", end) else ""
+            result.binary_loads.append({
+                "line_number": line,
+                "source_app": _clean_binary_source(value),
+                "full_statement": script[statement.start:end].strip() + terminator,
+            })
+
+    for token in tokenize(script):
+        first_on_line = token.line != previous_line
+        previous_line = token.end_line
+
+        flag = 2 if token.kind == "comment" else 1
+        for line_number in range(token.line, token.end_line + 1):
+            line_flags[line_number] |= flag
+
+        if token.kind == "comment":
+            if first_on_line and token.text.startswith("///$tab"):
+                parts = token.text.strip().split(None, 1)
+                result.tab_markers.append((token.line, parts[1] if len(parts) > 1 else None))
+            continue
+
+        # BINARY statements may omit the semicolon, so they also end with their line
+        if pending and pending.kind == "BINARY" and first_on_line:
+            finish(pending, script.rfind("\n", 0, token.start))
+            pending = None
+
+        if token.text == ";":
+            if pending and pending.value_start is not None:
+                finish(pending, token.start)
+            pending = None
+            after_semicolon = True
+            statement_words = []
+            expect_sub_name = False
+            continue
+
+        statement_start = (after_semicolon or first_on_line) and pending is None
+        after_semicolon = False
+
+        if token.kind == "dollar":
+            include = INCLUDE_PATTERN.match(token.text)
+            if include:
+                path = _strip_quotes(include.group(1))
+                result.includes.append(path)
+                result.include_statements.append({"path": path, "line": line_of(token.start)})
+
+        upper = token.text.upper() if token.kind == "word" else ""
+        if upper == "LOAD":
+            result.load_statements += 1
+        elif upper == "STORE":
+            result.store_statements += 1
+        elif upper == "DROP":
+            result.drop_statements += 1
+
+        # SET/LET: expect "name =" before the value starts
+        if pending and pending.value_start is None:
+            if upper and not pending.name:
+                pending.name = token.text
+            elif token.text == "=" and pending.name:
+                pending.value_start = token.end
+            else:
+                pending = None
+            continue
+
+        if pending:
+            continue
+
+        if expect_sub_name:
+            if upper:
+                result.subroutines.append(token.text)
+                result.subroutine_definitions.append({"name": token.text, "line": line_of(statement_offset)})
+            expect_sub_name = False
+            continue
+
+        if statement_start:
+            statement_words = []
+            statement_offset = token.start
+        if not upper:
+            continue
+        if len(statement_words) < 3:
+            statement_words.append(upper)
+
+        if statement_start and upper in ("SET", "LET"):
+            pending = _PendingStatement(upper, token.start, None)
+        elif statement_start and upper == "SUB":
+            expect_sub_name = True
+        elif statement_start and upper == "BINARY":
+            pending = _PendingStatement(upper, token.start, token.end)
+        elif upper == "TO" and _is_connect(statement_words):
+            pending = _PendingStatement("CONNECT", statement_offset, token.end)
+
+    if pending and pending.value_start is not None:
+        finish(pending, len(script))
+
+    for line_number in range(1, result.total_lines + 1):
+        if line_flags[line_number] == 0:
+            result.empty_lines += 1
+        elif line_flags[line_number] == 2:
+            result.comment_lines += 1
+
+    return result
+
+
+def _is_connect(statement_words: list[str]) -> bool:
+    """Check for CONNECT TO, optionally prefixed by LIB/ODBC/OLEDB/CUSTOM"""
+    words = statement_words[:-1]
+    if words and words[0] in CONNECT_PREFIXES:
+        words = words[1:]
+    return len(words) == 1 and words[0].startswith("CONNECT")
+
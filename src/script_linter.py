@@ -0,0 +1,265 @@
+"""Reload performance checks over the parsed statements of a load script"""
+
+import os
+import re
+from typing import Any
+
+from .qlik_client import categorize_data_source
+from .script_parser import ScriptAst, Statement
+
+# A field loaded as-is (optionally renamed) keeps a QVD load optimized
+PLAIN_FIELD_PATTERN = re.compile(r'^(?:\*|\[[^\]]*\]|"[^"]*"|`[^`]*`|[^\W\d][\w.]*)$')
+
+# WHERE Exists(field) with a single argument keeps a QVD load optimized
+SINGLE_EXISTS_PATTERN = re.compile(r"^\s*(?:NOT\s+)?Exists\s*\(\s*[^,()]+\)\s*$", re.IGNORECASE)
+
+EXISTS_PATTERN = re.compile(r"\bExists\s*\(", re.IGNORECASE)
+
+TEMP_TABLE_PATTERN = re.compile(r"^(?:tmp|temp)|(?:tmp|temp)$", re.IGNORECASE)
+
+APPLYMAP_PATTERN = re.compile(r"\bApplyMap\s*\(", re.IGNORECASE)
+
+TABLE_SUFFIXES = ("JOIN", "KEEP", "CONCATENATE")
+
+
+def source_category(statement: Statement) -> str | None:
+    """Lineage category (binary/resident/file/inline/other) of a LOAD or SELECT source"""
+    source = statement.attributes.get("source")
+    if not source:
+        return None
+    if source["type"] == "RESIDENT":
+        return "resident"
+    if source["type"] == "INLINE":
+        return "inline"
+    if source["type"] == "FROM":
+        return categorize_data_source(source["target"] or "")
+    return "other"
+
+
+def is_qvd_load(statement: Statement) -> bool:
+    """Check whether a LOAD reads a QVD file"""
+    source = statement.attributes.get("source") or {}
+    if source.get("type") != "FROM":
+        return False
+    target = (source.get("target") or "").lower()
+    return "qvd" in (source.get("format") or "").lower() or target.endswith(".qvd")
+
+
+def _prefix_keywords(statement: Statement) -> list[str]:
+    """Upper-cased prefix keywords of a statement"""
+    return [prefix["keyword"] for prefix in statement.prefixes]
+
+
+def _finding(statement: Statement, rule: str, severity: str, message: str, table: str | None) -> dict[str, Any]:
+    """Build one finding located at the statement"""
+    return {
+        "rule": rule,
+        "severity": severity,
+        "message": message,
+        "table": table,
+        "line": statement.line,
+        "end_line": statement.end_line,
+        "section": statement.section,
+    }
+
+
+def _sequences(statements: list[Statement]) -> list[list[Statement]]:
+    """Every statement list of the tree (top level and each block body)"""
+    sequences = [statements]
+    for statement in statements:
+        for nested in (statement.body, *[branch.body for branch in statement.branches]):
+            if nested:
+                sequences.extend(_sequences(nested))
+    return sequences
+
+
+def lint_script_performance(
+    ast: ScriptAst,
+    table_rows: dict[str, int] | None = None,
+    large_table_rows: int | None = None,
+) -> list[dict[str, Any]]:
+    """Flag statements that slow down a reload
+
+    Rules:
+        non_optimized_qvd_load: a QVD load with a WHERE other than one
+            single-argument Exists(), computed fields, ApplyMap or a preceding LOAD
+        resident_large_table: a RESIDENT load of a table with at least
+            large_table_rows rows (or, when its row count is unknown, of a file/database table)
+        join_without_key_pruning: a JOIN/KEEP load of all fields (*) or without
+            an Exists() filter on the join keys
+        missing_drop_temp_table: a temporary or intermediate table never dropped
+
+    Args:
+        ast: Parsed script
+        table_rows: Row counts by table name from the app's data model
+        large_table_rows: Row count from which a table counts as large
+
+    Returns:
+        Findings in source order, each with rule, severity, message, table, line,
+        end_line and section
+
+    """
+    if large_table_rows is None:
+        large_table_rows = int(os.getenv("QLIK_LINT_LARGE_TABLE_ROWS", "1000000"))
+
+    findings = []
+    # Table name -> statement creating it, with the lineage category of its source
+    tables: dict[str, tuple[Statement, str | None]] = {}
+    resident_sources: set[str] = set()
+    dropped: set[str] = set()
+
+    for sequence in _sequences(ast.statements):
+        chain_label = None
+        chain_prefixes: list[str] = []
+        preceded = False
+
+        for statement in sequence:
+            if statement.kind == "DROP" and statement.attributes["target"] == "TABLE":
+                dropped.update(statement.attributes["names"])
+            if statement.kind not in ("LOAD", "SELECT"):
+                chain_label, chain_prefixes, preceded = None, [], False
+                continue
+
+            # A LOAD without a source reads from the statement after it (preceding load)
+            if statement.kind == "LOAD" and statement.attributes["source"] is None:
+                chain_label = chain_label or statement.label
+                chain_prefixes = chain_prefixes or _prefix_keywords(statement)
+                preceded = True
+                continue
+
+            label = chain_label or statement.label
+            prefixes = chain_prefixes or _prefix_keywords(statement)
+            category = source_category(statement)
+
+            if statement.kind == "LOAD" and is_qvd_load(statement):
+                reasons = _qvd_deoptimizers(statement, preceded)
+                if reasons:
+                    findings.append(_finding(
+                        statement,
+                        "non_optimized_qvd_load",
+                        "warning",
+                        "QVD load is not optimized: " + "; ".join(reasons),
+                        label,
+                    ))
+
+            if category == "resident":
+                resident = statement.attributes["source"]["target"]
+                resident_sources.add(resident)
+                finding = _resident_finding(statement, resident, tables, table_rows, large_table_rows)
+                if finding:
+                    findings.append(finding)
+
+            if any(keyword.endswith(("JOIN", "KEEP")) for keyword in prefixes) and statement.kind == "LOAD":
+                finding = _join_finding(statement, prefixes, label)
+                if finding:
+                    findings.append(finding)
+
+            creates_table = not any(keyword.endswith(TABLE_SUFFIXES) for keyword in prefixes)
+            if label and creates_table and "MAPPING" not in prefixes and label not in tables:
+                tables[label] = (statement, category)
+
+            chain_label, chain_prefixes, preceded = None, [], False
+
+    for name, (statement, _category) in tables.items():
+        if name in dropped:
+            continue
+        if TEMP_TABLE_PATTERN.search(name):
+            findings.append(_finding(
+                statement,
+                "missing_drop_temp_table",
+                "warning",
+                f"Temporary table '{name}' is never dropped and stays in the data model",
+                name,
+            ))
+        elif name in resident_sources:
+            findings.append(_finding(
+                statement,
+                "missing_drop_temp_table",
+                "info",
+                f"Table '{name}' is reloaded with RESIDENT but never dropped; drop it if it is intermediate",
+                name,
+            ))
+
+    findings.sort(key=lambda finding: finding["line"])
+    return findings
+
+
+def _qvd_deoptimizers(statement: Statement, preceded: bool) -> list[str]:
+    """Reasons a QVD load falls back to the unoptimized path"""
+    reasons = []
+    where = statement.attributes.get("where")
+    if where and not SINGLE_EXISTS_PATTERN.match(where):
+        reasons.append(f"WHERE clause other than a single-argument Exists(): {where.strip()}")
+    if statement.attributes.get("while"):
+        reasons.append("WHILE clause")
+    if statement.attributes.get("group_by") or statement.attributes.get("order_by"):
+        reasons.append("GROUP BY/ORDER BY clause")
+
+    for field in statement.attributes["fields"]:
+        expression = field["expression"].strip()
+        if APPLYMAP_PATTERN.search(expression):
+            reasons.append(f"ApplyMap in field list: {expression}")
+        elif not PLAIN_FIELD_PATTERN.match(expression):
+            reasons.append(f"computed field: {expression}")
+
+    if preceded:
+        reasons.append("preceding LOAD on top of the QVD load")
+    return reasons
+
+
+def _resident_finding(
+    statement: Statement,
+    resident: str,
+    tables: dict[str, tuple[Statement, str | None]],
+    table_rows: dict[str, int] | None,
+    large_table_rows: int,
+) -> dict[str, Any] | None:
+    """Flag a RESIDENT load of a large table"""
+    rows = (table_rows or {}).get(resident)
+    if rows is not None:
+        if rows < large_table_rows:
+            return None
+        return _finding(
+            statement,
+            "resident_large_table",
+            "warning",
+            f"RESIDENT reload of '{resident}' ({rows:,} rows); consider loading from the source QVD instead",
+            resident,
+        )
+
+    origin = tables.get(resident)
+    if origin and origin[1] in ("file", "other"):
+        return _finding(
+            statement,
+            "resident_large_table",
+            "info",
+            f"RESIDENT reload of '{resident}', loaded from a {origin[1]} source at line {origin[0].line}; "
+            "row count unknown",
+            resident,
+        )
+    return None
+
+
+def _join_finding(statement: Statement, prefixes: list[str], label: str | None) -> dict[str, Any] | None:
+    """Flag a JOIN/KEEP load that does not prune the keys it joins on"""
+    join = next(keyword for keyword in prefixes if keyword.endswith(("JOIN", "KEEP")))
+    fields = [field["expression"].strip() for field in statement.attributes["fields"]]
+    where = statement.attributes.get("where") or ""
+
+    if "*" in fields:
+        return _finding(
+            statement,
+            "join_without_key_pruning",
+            "warning",
+            f"{join} loads all fields (*), so every shared field name becomes a join key",
+            label,
+        )
+    if not EXISTS_PATTERN.search(where) and statement.attributes["source"]["type"] in ("FROM", "RESIDENT"):
+        return _finding(
+            statement,
+            "join_without_key_pruning",
+            "info",
+            f"{join} reads all rows of its source; filter the keys with WHERE Exists() before joining",
+            label,
+        )
+    return None
@@ -0,0 +1,503 @@
+"""Statement-level parser for Qlik load scripts built on the script lexer"""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from .script_cache import section_hash
+from .script_lexer import Token, tokenize
+
+# Table prefixes that can precede LOAD/SELECT; those in PREFIX_ARGUMENTS take a
+# parenthesized argument, FIRST and SAMPLE take a number
+TABLE_PREFIXES = {
+    "ADD", "BUFFER", "CONCATENATE", "CROSSTABLE", "FIRST", "GENERIC", "HIERARCHY",
+    "HIERARCHYBELONGSTO", "INTERVALMATCH", "JOIN", "KEEP", "MAPPING", "MERGE",
+    "NOCONCATENATE", "ONLY", "REPLACE", "SAMPLE", "SEMANTIC",
+}
+JOIN_QUALIFIERS = {"LEFT", "RIGHT", "INNER", "OUTER"}
+PREFIX_ARGUMENTS = {
+    "BUFFER", "CONCATENATE", "CROSSTABLE", "HIERARCHY", "HIERARCHYBELONGSTO", "INTERVALMATCH", "JOIN", "KEEP", "MERGE",
+}
+
+# Control statements end at a semicolon, at the end of their line, or after THEN
+CONTROL_KEYWORDS = {"IF", "ELSEIF", "ELSE", "END", "ENDIF", "FOR", "NEXT", "SUB", "ENDSUB", "BINARY"}
+
+LOAD_CLAUSES = {"FROM", "RESIDENT", "INLINE", "AUTOGENERATE", "EXTENSION", "WHERE", "WHILE", "GROUP", "ORDER"}
+
+
+@dataclass(slots=True)
+class Statement:
+    """One statement of a load script
+
+    kind is LOAD, SELECT, STORE, DROP, SET, LET, SUB, CALL, IF, ELSEIF, ELSE,
+    FOR, BINARY, CONNECT or OTHER. Kind-specific details (fields, source,
+    clauses, names, conditions...) are kept in attributes. Blocks (SUB, IF,
+    FOR) hold their statements in body; IF keeps its ELSEIF/ELSE branches in
+    branches, each with its own body.
+    """
+
+    kind: str
+    keyword: str
+    line: int
+    end_line: int
+    text: str
+    section: str | None = None
+    label: str | None = None
+    prefixes: list[dict[str, Any]] = field(default_factory=list)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    body: list["Statement"] = field(default_factory=list)
+    branches: list["Statement"] = field(default_factory=list)
+
+
+@dataclass
+class ScriptAst:
+    """Top-level statements of a script in source order"""
+
+    statements: list[Statement] = field(default_factory=list)
+    total_lines: int = 0
+
+    def walk(self) -> Iterator[Statement]:
+        """Yield every statement, including those nested in blocks, in source order"""
+        return walk_statements(self.statements)
+
+    def count_by_kind(self) -> dict[str, int]:
+        """Number of statements of each kind"""
+        counts: dict[str, int] = {}
+        for statement in self.walk():
+            counts[statement.kind] = counts.get(statement.kind, 0) + 1
+        return counts
+
+
+def walk_statements(statements: list[Statement]) -> Iterator[Statement]:
+    """Depth-first iteration over statements and their nested bodies"""
+    for statement in statements:
+        yield statement
+        yield from walk_statements(statement.body)
+        yield from walk_statements(statement.branches)
+
+
+def _name(token: Token) -> str:
+    """Identifier text without surrounding brackets or quotes"""
+    text = token.text
+    if token.kind in ("bracket", "string", "backtick") and len(text) >= 2:
+        return text[1:-1]
+    return text
+
+
+def _upper(token: Token) -> str:
+    """Upper-cased keyword text of a word token, empty for anything else"""
+    return token.text.upper() if token.kind == "word" else ""
+
+
+def _closing_paren(tokens: list[Token], index: int) -> int:
+    """Index of the parenthesis closing the one at index (or the last token)"""
+    depth = 0
+    for position in range(index, len(tokens)):
+        if tokens[position].text == "(":
+            depth += 1
+        elif tokens[position].text == ")":
+            depth -= 1
+            if depth == 0:
+                return position
+    return len(tokens) - 1
+
+
+def _split_top_level(tokens: list[Token], separator: str = ",") -> list[list[Token]]:
+    """Split tokens on a separator outside parentheses"""
+    parts: list[list[Token]] = [[]]
+    depth = 0
+    for token in tokens:
+        if token.text == "(":
+            depth += 1
+        elif token.text == ")":
+            depth -= 1
+        elif token.text == separator and depth == 0:
+            parts.append([])
+            continue
+        parts[-1].append(token)
+    return [part for part in parts if part]
+
+
+class _Parser:
+    """Turns the token stream of one script into statements"""
+
+    def __init__(self, script: str):
+        self.script = script
+
+    def span(self, tokens: list[Token]) -> str:
+        """Source text covered by the tokens"""
+        if not tokens:
+            return ""
+        return self.script[tokens[0].start:tokens[-1].end]
+
+    def parse(self) -> ScriptAst:
+        """Segment the tokens into statements and nest the blocks"""
+        ast = ScriptAst(total_lines=self.script.count("\n") + 1)
+        stack: list[Statement] = []
+        marker_count = 0
+        section: str | None = None
+
+        for tokens in self.segments():
+            if tokens[0].kind == "comment":
+                marker_count += 1
+                parts = tokens[0].text.strip().split(None, 1)
+                section = parts[1] if len(parts) > 1 else f"Section_{marker_count}"
+                continue
+
+            statement = self.build(tokens)
+            statement.section = section
+            self.nest(ast, stack, statement)
+
+        if marker_count == 0:
+            for statement in ast.walk():
+                statement.section = "Main"
+        return ast
+
+    def segments(self) -> Iterator[list[Token]]:
+        """Yield the tokens of each statement, and ///$tab markers on their own"""
+        current: list[Token] = []
+        control = False
+        previous_line = 0
+
+        for token in tokenize(self.script):
+            first_on_line = token.line != previous_line
+            previous_line = token.end_line
+
+            if token.kind == "comment":
+                if first_on_line and token.text.startswith("///$tab"):
+                    if current:
+                        yield current
+                        current = []
+                    yield [token]
+                continue
+
+            if current and control and first_on_line:
+                yield current
+                current = []
+
+            if token.text == ";":
+                if current:
+                    yield current
+                current = []
+                continue
+
+            if not current:
+                control = _upper(token) in CONTROL_KEYWORDS
+            current.append(token)
+
+            if control and _upper(token) == "THEN":
+                yield current
+                current = []
+
+        if current:
+            yield current
+
+    def nest(self, ast: ScriptAst, stack: list[Statement], statement: Statement):
+        """Attach a statement to the innermost open block, opening or closing blocks"""
+        if statement.kind == "END":
+            closes = statement.attributes["closes"]
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth].kind == closes:
+                    stack[depth].end_line = statement.end_line
+                    del stack[depth:]
+                    return
+            statement.kind = "OTHER"
+
+        if statement.kind in ("ELSEIF", "ELSE") and stack and stack[-1].kind == "IF":
+            stack[-1].branches.append(statement)
+            stack[-1].end_line = statement.end_line
+            return
+
+        if stack:
+            block = stack[-1]
+            target = block.branches[-1].body if block.branches else block.body
+        else:
+            target = ast.statements
+        target.append(statement)
+
+        if statement.kind in ("IF", "FOR", "SUB"):
+            stack.append(statement)
+
+    def build(self, tokens: list[Token]) -> Statement:
+        """Build one statement from its tokens"""
+        statement = Statement(
+            kind="OTHER",
+            keyword="",
+            line=tokens[0].line,
+            end_line=tokens[-1].end_line,
+            text=self.span(tokens),
+        )
+
+        index = 0
+        if len(tokens) > 2 and tokens[1].text == ":" and tokens[0].kind in ("word", "bracket", "string"):
+            statement.label = _name(tokens[0])
+            index = 2
+
+        index = self.prefixes(tokens, index, statement)
+        rest = tokens[index:]
+        if not rest:
+            return statement
+
+        keyword = _upper(rest[0])
+        if keyword == "SQL" and len(rest) > 1:
+            rest = rest[1:]
+            keyword = _upper(rest[0])
+        statement.keyword = keyword
+
+        handler = getattr(self, f"parse_{keyword.lower()}", None) if keyword else None
+        if handler is not None:
+            handler(rest, statement)
+        elif "CONNECT" in keyword and any(_upper(token) == "TO" for token in rest[:3]):
+            statement.kind = "CONNECT"
+            to = next(position for position, token in enumerate(rest) if _upper(token) == "TO")
+            statement.attributes["target"] = self.span(rest[to + 1:]).strip().strip("'\"")
+        elif keyword in ("ODBC", "OLEDB", "LIB", "CUSTOM") and len(rest) > 1 and "CONNECT" in _upper(rest[1]):
+            statement.kind = "CONNECT"
+            statement.attributes["target"] = self.span(rest[3:]).strip().strip("'\"")
+        return statement
+
+    def prefixes(self, tokens: list[Token], index: int, statement: Statement) -> int:
+        """Consume table prefixes, returning the index of the statement keyword"""
+        while index < len(tokens):
+            word = _upper(tokens[index])
+            if word in JOIN_QUALIFIERS and index + 1 < len(tokens) and _upper(tokens[index + 1]) in ("JOIN", "KEEP"):
+                keyword = f"{word} {_upper(tokens[index + 1])}"
+                index += 2
+            elif word in TABLE_PREFIXES:
+                keyword = word
+                index += 1
+            else:
+                return index
+
+            argument = None
+            if index < len(tokens) and tokens[index].text == "(" and keyword.split()[-1] in PREFIX_ARGUMENTS:
+                close = _closing_paren(tokens, index)
+                argument = self.span(tokens[index + 1:close]) or None
+                index = close + 1
+            elif keyword in ("FIRST", "SAMPLE") and index < len(tokens):
+                argument = tokens[index].text
+                index += 1
+            if argument and argument.startswith("[") and argument.endswith("]"):
+                argument = argument[1:-1]
+            statement.prefixes.append({"keyword": keyword, "argument": argument})
+        return index
+
+    def parse_load(self, tokens: list[Token], statement: Statement):
+        """LOAD [DISTINCT] fields [FROM|RESIDENT|INLINE|AUTOGENERATE ...] [WHERE ...]"""
+        statement.kind = "LOAD"
+        index = 1
+        if index < len(tokens) and _upper(tokens[index]) == "DISTINCT":
+            statement.attributes["distinct"] = True
+            index += 1
+
+        clauses: list[tuple[str, int]] = []
+        depth = 0
+        for position in range(index, len(tokens)):
+            token = tokens[position]
+            if token.text == "(":
+                depth += 1
+            elif token.text == ")":
+                depth -= 1
+            elif depth == 0 and _upper(token) in LOAD_CLAUSES:
+                word = _upper(token)
+                # GROUP and ORDER are only clauses when followed by BY
+                if word in ("GROUP", "ORDER") and not (
+                    position + 1 < len(tokens) and _upper(tokens[position + 1]) == "BY"
+                ):
+                    continue
+                clauses.append((word, position))
+
+        field_end = clauses[0][1] if clauses else len(tokens)
+        statement.attributes["fields"] = [self.field(part) for part in _split_top_level(tokens[index:field_end])]
+        statement.attributes["source"] = None
+
+        for number, (word, position) in enumerate(clauses):
+            end = clauses[number + 1][1] if number + 1 < len(clauses) else len(tokens)
+            body = tokens[position + 1:end]
+            if word in ("GROUP", "ORDER"):
+                statement.attributes[f"{word.lower()}_by"] = self.span(body[1:])
+            elif word in ("WHERE", "WHILE"):
+                statement.attributes[word.lower()] = self.span(body)
+            elif word == "FROM":
+                statement.attributes["source"] = self.file_source("FROM", body)
+            elif word == "RESIDENT":
+                statement.attributes["source"] = {"type": "RESIDENT", "target": _name(body[0]) if body else ""}
+            elif word == "INLINE":
+                statement.attributes["source"] = {"type": "INLINE", "target": None, "data": self.span(body)}
+            else:
+                statement.attributes["source"] = {"type": word, "target": self.span(body)}
+
+    def field(self, tokens: list[Token]) -> dict[str, Any]:
+        """One field of a LOAD list: its expression and alias"""
+        if len(tokens) >= 3 and _upper(tokens[-2]) == "AS":
+            return {"expression": self.span(tokens[:-2]), "alias": _name(tokens[-1])}
+        return {"expression": self.span(tokens), "alias": None}
+
+    def file_source(self, kind: str, tokens: list[Token]) -> dict[str, Any]:
+        """FROM target with its optional (format) specification"""
+        fmt = None
+        target_tokens = tokens
+        for position, token in enumerate(tokens):
+            if token.text == "(" and position > 0:
+                target_tokens = tokens[:position]
+                fmt = self.span(tokens[position + 1:_closing_paren(tokens, position)])
+                break
+        target = _name(target_tokens[0]) if len(target_tokens) == 1 else self.span(target_tokens)
+        return {"type": kind, "target": target, "format": fmt}
+
+    def parse_select(self, tokens: list[Token], statement: Statement):
+        """SQL SELECT ... FROM table ..."""
+        statement.kind = "SELECT"
+        source = None
+        depth = 0
+        for position, token in enumerate(tokens):
+            if token.text == "(":
+                depth += 1
+            elif token.text == ")":
+                depth -= 1
+            elif depth == 0 and _upper(token) == "FROM" and position + 1 < len(tokens):
+                source = {"type": "SQL", "target": _name(tokens[position + 1])}
+                break
+        statement.attributes["source"] = source
+
+    def parse_store(self, tokens: list[Token], statement: Statement):
+        """STORE [fields FROM] table INTO target [(format)]"""
+        statement.kind = "STORE"
+        into = next((position for position, token in enumerate(tokens) if _upper(token) == "INTO"), len(tokens))
+        table_tokens = tokens[1:into]
+        from_position = next(
+            (position for position, token in enumerate(table_tokens) if _upper(token) == "FROM"),
+            None,
+        )
+        if from_position is not None:
+            table_tokens = table_tokens[from_position + 1:]
+        statement.attributes["table"] = _name(table_tokens[0]) if len(table_tokens) == 1 else self.span(table_tokens)
+        statement.attributes["target"] = self.file_source("INTO", tokens[into + 1:]) if into < len(tokens) else None
+
+    def parse_drop(self, tokens: list[Token], statement: Statement):
+        """DROP TABLE[S] names / DROP FIELD[S] names [FROM tables]"""
+        statement.kind = "DROP"
+        target = _upper(tokens[1]) if len(tokens) > 1 else ""
+        statement.attributes["target"] = "FIELD" if target.startswith("FIELD") else "TABLE"
+        rest = tokens[2:]
+        from_position = next((position for position, token in enumerate(rest) if _upper(token) == "FROM"), None)
+        names = rest if from_position is None else rest[:from_position]
+        statement.attributes["names"] = [_name(part[0]) for part in _split_top_level(names)]
+        if from_position is not None:
+            statement.attributes["from"] = [_name(part[0]) for part in _split_top_level(rest[from_position + 1:])]
+
+    def parse_set(self, tokens: list[Token], statement: Statement):
+        """SET name = value"""
+        statement.kind = tokens[0].text.upper()
+        equals = next((position for position, token in enumerate(tokens) if token.text == "="), None)
+        statement.attributes["name"] = _name(tokens[1]) if len(tokens) > 1 else ""
+        statement.attributes["value"] = self.span(tokens[equals + 1:]) if equals is not None else ""
+
+    parse_let = parse_set
+
+    def parse_call(self, tokens: list[Token], statement: Statement):
+        """CALL name[(arguments)]"""
+        statement.kind = "CALL"
+        self.callable(tokens, statement, "arguments")
+
+    def parse_sub(self, tokens: list[Token], statement: Statement):
+        """SUB name[(parameters)] opens a block closed by END SUB"""
+        statement.kind = "SUB"
+        self.callable(tokens, statement, "parameters")
+
+    def callable(self, tokens: list[Token], statement: Statement, list_name: str):
+        """Name and parenthesized argument list of CALL and SUB"""
+        statement.attributes["name"] = _name(tokens[1]) if len(tokens) > 1 else ""
+        values = []
+        if len(tokens) > 2 and tokens[2].text == "(":
+            values = [self.span(part) for part in _split_top_level(tokens[3:_closing_paren(tokens, 2)])]
+        statement.attributes[list_name] = values
+
+    def parse_if(self, tokens: list[Token], statement: Statement):
+        """IF condition THEN opens a block closed by END IF"""
+        statement.kind = tokens[0].text.upper()
+        end = len(tokens) - 1 if _upper(tokens[-1]) == "THEN" else len(tokens)
+        statement.attributes["condition"] = self.span(tokens[1:end])
+
+    parse_elseif = parse_if
+
+    def parse_else(self, tokens: list[Token], statement: Statement):
+        """ELSE branch of an IF block"""
+        statement.kind = "ELSE"
+
+    def parse_for(self, tokens: list[Token], statement: Statement):
+        """FOR var = start TO end [STEP n] / FOR EACH var IN values, closed by NEXT"""
+        statement.kind = "FOR"
+        if len(tokens) > 2 and _upper(tokens[1]) == "EACH":
+            statement.attributes["variable"] = _name(tokens[2])
+            statement.attributes["values"] = self.span(tokens[4:])
+            return
+
+        statement.attributes["variable"] = _name(tokens[1]) if len(tokens) > 1 else ""
+        bounds = {"from": [], "to": [], "step": []}
+        current = None
+        for token in tokens[2:]:
+            word = _upper(token)
+            if current is None and token.text == "=":
+                current = "from"
+            elif word in ("TO", "STEP"):
+                current = word.lower()
+            elif current:
+                bounds[current].append(token)
+        statement.attributes.update({name: self.span(part) or None for name, part in bounds.items()})
+
+    def parse_next(self, tokens: list[Token], statement: Statement):
+        """NEXT closes a FOR block"""
+        statement.kind = "END"
+        statement.attributes["closes"] = "FOR"
+
+    def parse_end(self, tokens: list[Token], statement: Statement):
+        """END IF / END SUB close their block"""
+        target = _upper(tokens[1]) if len(tokens) > 1 else ""
+        if target in ("IF", "SUB"):
+            statement.kind = "END"
+            statement.attributes["closes"] = target
+
+    def parse_endif(self, tokens: list[Token], statement: Statement):
+        """ENDIF spelled as one word"""
+        statement.kind = "END"
+        statement.attributes["closes"] = "IF"
+
+    def parse_endsub(self, tokens: list[Token], statement: Statement):
+        """ENDSUB spelled as one word"""
+        statement.kind = "END"
+        statement.attributes["closes"] = "SUB"
+
+    def parse_binary(self, tokens: list[Token], statement: Statement):
+        """BINARY source"""
+        statement.kind = "BINARY"
+        statement.attributes["source"] = self.span(tokens[1:]).strip("[]'\"")
+
+
+_parse_cache: OrderedDict[str, ScriptAst] = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def parse_script(script: str) -> ScriptAst:
+    """Parse a script into statements, memoized by script content hash
+
+    The returned tree is shared between callers and must not be modified.
+    """
+    key = section_hash(script)
+    with _parse_cache_lock:
+        ast = _parse_cache.get(key)
+        if ast is not None:
+            _parse_cache.move_to_end(key)
+            return ast
+
+    ast = _Parser(script).parse()
+
+    max_entries = int(os.getenv("QLIK_SCRIPT_PARSE_CACHE_SIZE", "32"))
+    with _parse_cache_lock:
+        _parse_cache[key] = ast
+        while len(_parse_cache) > max_entries:
+            _parse_cache.popitem(last=False)
+    return ast
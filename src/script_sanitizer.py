@@ -0,0 +1,134 @@
+"""Single-pass masking of credentials in load scripts"""
+
+import os
+import re
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+MASK = "[MASKED]"
+
+# Key/value separator of connection strings and variable assignments
+DEFAULT_SEPARATOR = r"\s*[=:]\s*"
+
+# Quoted values are masked whole; unquoted values run to a separator or space.
+# Values never span lines, which is what lets the script be sanitized in chunks.
+VALUE_PATTERN = r"""'[^'\n]*'|"[^"\n]*"|\{[^}\n]*\}|[^'",;\s)]+"""
+
+
+@dataclass(frozen=True)
+class SanitizerRule:
+    """A credential whose value is masked wherever one of its keys appears
+
+    Keys are matched case-insensitively, also inside longer names (so "SECRET"
+    covers "Client_Secret"); a space in a key matches any whitespace. With
+    suffix set, the key may continue with more word characters before the
+    separator ("TOKEN" then also covers "Token_Value").
+    """
+
+    name: str
+    keys: tuple[str, ...]
+    separator: str = DEFAULT_SEPARATOR
+    suffix: bool = False
+
+    def key_pattern(self) -> str:
+        """Regular expression matching any of the rule's keys"""
+        keys = sorted(self.keys, key=len, reverse=True)
+        pattern = "|".join(r"\s+".join(re.escape(word) for word in key.split()) for key in keys)
+        return f"(?:{pattern})\\w*" if self.suffix else f"(?:{pattern})"
+
+
+DEFAULT_RULES = (
+    SanitizerRule("password", ("PASSWORD", "PASSWD", "PWD")),
+    SanitizerRule("user_id", ("USER ID", "UID")),
+    SanitizerRule("secret", ("SECRET",), suffix=True),
+    SanitizerRule("token", ("TOKEN",), suffix=True),
+    SanitizerRule("api_key", (
+        "APIKEY", "API_KEY", "API-KEY", "ACCESSKEY", "ACCESS_KEY", "ACCOUNTKEY", "ACCOUNT_KEY", "SHAREDACCESSSIGNATURE",
+    )),
+    SanitizerRule("bearer", ("BEARER",), separator=r"\s+"),
+)
+
+
+class ScriptSanitizer:
+    """Mask every configured credential in one scan of the text
+
+    All rules are compiled into one alternation, so the text is scanned once
+    however many rules there are; a lookahead on the keys' first letters lets
+    the scan skip quickly over positions where no key can start. Masked
+    values keep their key, e.g. "Pwd=abc" becomes "Pwd=[MASKED]".
+    """
+
+    def __init__(self, rules: Iterable[SanitizerRule] | None = None):
+        """Compile the rules (default: DEFAULT_RULES plus QLIK_SANITIZE_EXTRA_KEYS)"""
+        if rules is None:
+            rules = list(DEFAULT_RULES)
+            extra = tuple(key.strip() for key in os.getenv("QLIK_SANITIZE_EXTRA_KEYS", "").split(",") if key.strip())
+            if extra:
+                rules.append(SanitizerRule("extra", extra))
+        self.rules = tuple(rules)
+
+        first_letters = sorted({key[0].lower() for rule in self.rules for key in rule.keys if key})
+        alternatives = [
+            f"(?P<rule_{index}>{rule.key_pattern()}){rule.separator}" for index, rule in enumerate(self.rules)
+        ]
+        self.pattern = re.compile(
+            rf"(?=[{re.escape(''.join(first_letters))}])"
+            rf"(?P<prefix>{'|'.join(alternatives)})(?P<value>{VALUE_PATTERN})",
+            re.IGNORECASE,
+        )
+
+        self._lock = threading.Lock()
+        self.stats = {rule.name: 0 for rule in self.rules}
+
+    def sanitize(self, text: str) -> str:
+        """Return the text with every credential value masked"""
+        counts: dict[str, int] = {}
+
+        def mask(match: re.Match) -> str:
+            name = next(rule.name for index, rule in enumerate(self.rules) if match.group(f"rule_{index}"))
+            counts[name] = counts.get(name, 0) + 1
+            return match.group("prefix") + MASK
+
+        sanitized = self.pattern.sub(mask, text)
+        if counts:
+            with self._lock:
+                for name, count in counts.items():
+                    self.stats[name] = self.stats.get(name, 0) + count
+        return sanitized
+
+    def sanitize_chunks(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Sanitize text arriving in chunks, yielding sanitized chunks
+
+        Each chunk is cut after its last newline and the remainder carried into
+        the next one, so a credential split across chunks is still masked and
+        only about one chunk is held at a time.
+        """
+        carry = ""
+        for chunk in chunks:
+            carry += chunk
+            cut = carry.rfind("\n") + 1
+            if cut:
+                yield self.sanitize(carry[:cut])
+                carry = carry[cut:]
+        if carry:
+            yield self.sanitize(carry)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return the number of values masked per rule"""
+        with self._lock:
+            return {"masked": dict(self.stats), "rules": [rule.name for rule in self.rules]}
+
+
+_sanitizer: ScriptSanitizer | None = None
+_sanitizer_lock = threading.Lock()
+
+
+def get_script_sanitizer() -> ScriptSanitizer:
+    """Get the process-wide sanitizer, creating it on first use"""
+    global _sanitizer
+    with _sanitizer_lock:
+        if _sanitizer is None:
+            _sanitizer = ScriptSanitizer()
+        return _sanitizer
@@ -4,6 +4,8 @@
 import os
 import pathlib
 import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 
@@ -11,23 +13,33 @@ from dotenv import load_dotenv
 from fastmcp import FastMCP
 
 # Import tools and argument models
+from .binary_chain import GetBinaryChainArgs, get_binary_chain
+from .bulk import ExtractFleetMetadataArgs, extract_fleet_metadata, resolve_output_path
+from .connection_pool import get_connection_pool
 from .tools import (
+    ExpandContainerArgs,
     GetAppDataSourcesArgs,
     GetAppDimensionsArgs,
     GetAppFieldsArgs,
     GetAppMeasuresArgs,
     GetAppScriptArgs,
     GetAppSheetsArgs,
+    GetAppSnapshotArgs,
     GetAppVariablesArgs,
     GetSheetObjectsArgs,
+    GetVariableGraphArgs,
+    expand_container,
     get_app_data_sources,
     get_app_dimensions,
     get_app_fields,
     get_app_measures,
     get_app_script,
     get_app_sheets,
+    get_app_snapshot,
     get_app_variables,
+    get_server_stats,
     get_sheet_objects,
+    get_variable_graph,
     list_qlik_applications,
 )
 
@@ -36,10 +48,21 @@ project_root = pathlib.Path(__file__).parent.parent
 env_path = project_root / ".env"
 load_dotenv(env_path)
 
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    """Close the pooled Engine sessions when the server shuts down"""
+    try:
+        yield {}
+    finally:
+        await get_connection_pool().close_all()
+
+
 # Create MCP server instance
 mcp = FastMCP(
     name=os.getenv("MCP_SERVER_NAME", "qlik-sense"),
     version=os.getenv("MCP_SERVER_VERSION", "1.0.0"),
+    lifespan=lifespan,
 )
 
 # Register the get_app_measures tool
@@ -153,6 +176,55 @@ async def handle_get_app_variables(args: GetAppVariablesArgs) -> dict[str, Any]:
         return error_response
 
 
+@mcp.tool()
+async def handle_get_variable_graph(args: GetVariableGraphArgs) -> dict[str, Any]:
+    """MCP tool handler for building a Qlik Sense variable dependency graph.
+
+    This tool combines the application's variables with the SET/LET statements
+    of its load script and returns their $(variable) dependencies, expansions
+    and nesting depth in dependency order, reporting circular expansions.
+    """
+    print(f"🕸️ Building variable graph for app: {args.app_id}", file=sys.stderr)
+
+    try:
+        # Call the actual implementation
+        result = await get_variable_graph(
+            app_id=args.app_id,
+            include_script_variables=args.include_script_variables,
+            include_expansions=args.include_expansions,
+            evaluate=args.evaluate,
+            variable_names=args.variable_names,
+        )
+
+        if "error" in result:
+            print(f"❌ Error: {result['error']}", file=sys.stderr)
+        else:
+            print(
+                f"✅ Ordered {result['variable_count']} variables, nested up to {result['max_depth']} levels",
+                file=sys.stderr,
+            )
+            for cycle in result["cycles"]:
+                print(f"⚠️ Circular expansion: {' -> '.join(cycle)}", file=sys.stderr)
+            if "evaluation" in result:
+                evaluation = result["evaluation"]
+                print(
+                    f"   Evaluated {evaluation['evaluated']} variables in {evaluation['round_trips']} round trips",
+                    file=sys.stderr,
+                )
+
+        return result
+
+    except Exception as e:
+        error_response = {
+            "error": f"Unexpected error: {e!s}",
+            "app_id": args.app_id,
+        }
+        print(f"❌ Unexpected error in MCP handler: {e}", file=sys.stderr)
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}", file=sys.stderr)
+        return error_response
+
+
 # Register the get_app_fields tool
 @mcp.tool()
 async def handle_get_app_fields(args: GetAppFieldsArgs) -> dict[str, Any]:
@@ -254,12 +326,30 @@ async def handle_get_sheet_objects(args: GetSheetObjectsArgs) -> dict[str, Any]:
             include_layout=args.include_layout,
             include_data_definition=args.include_data_definition,
             resolve_master_items=args.resolve_master_items,
+            use_property_tree=args.use_property_tree,
+            expand_containers=args.expand_containers,
+            max_depth=args.max_depth,
+            max_nodes=args.max_nodes,
         )
 
         if "error" in result:
             print(f"❌ Error: {result['error']}", file=sys.stderr)
         else:
             print(f"✅ Retrieved {result['object_count']} objects from sheet", file=sys.stderr)
+            if "container_traversal" in result:
+                traversal = result["container_traversal"]
+                print(
+                    f"   Expanded {traversal['containers_expanded']} containers over {traversal['levels']} levels"
+                    f"{' (truncated)' if traversal['truncated'] else ''}",
+                    file=sys.stderr,
+                )
+            if "property_tree" in result:
+                tree = result["property_tree"]
+                print(
+                    f"   Property tree saved {tree['round_trips_saved']} round trips "
+                    f"({tree['requests_saved']} requests), {len(tree['layout_fallbacks'])} layout fallbacks",
+                    file=sys.stderr,
+                )
 
         return result
 
@@ -275,6 +365,50 @@ async def handle_get_sheet_objects(args: GetSheetObjectsArgs) -> dict[str, Any]:
         return error_response
 
 
+@mcp.tool()
+async def handle_expand_container(args: ExpandContainerArgs) -> dict[str, Any]:
+    """MCP tool handler for expanding a container stub from get_sheet_objects.
+
+    This tool follows the cursor of a container returned without its contents
+    and retrieves the embedded objects of the requested tabs only.
+    """
+    print(f"🗂️ Expanding container in app: {args.app_id} (tabs: {args.tabs or 'all'})", file=sys.stderr)
+
+    try:
+        # Call the actual implementation
+        result = await expand_container(
+            app_id=args.app_id,
+            cursor=args.cursor,
+            tabs=args.tabs,
+            include_properties=args.include_properties,
+            include_layout=args.include_layout,
+            include_data_definition=args.include_data_definition,
+            resolve_master_items=args.resolve_master_items,
+            max_depth=args.max_depth,
+            max_nodes=args.max_nodes,
+        )
+
+        if "error" in result:
+            print(f"❌ Error: {result['error']}", file=sys.stderr)
+        else:
+            print(
+                f"✅ Expanded {result['embedded_object_count']} objects from container {result['container_id']}",
+                file=sys.stderr,
+            )
+
+        return result
+
+    except Exception as e:
+        error_response = {
+            "error": f"Unexpected error: {e!s}",
+            "app_id": args.app_id,
+        }
+        print(f"❌ Unexpected error in MCP handler: {e}", file=sys.stderr)
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}", file=sys.stderr)
+        return error_response
+
+
 @mcp.tool()
 async def handle_get_app_dimensions(args: GetAppDimensionsArgs) -> dict[str, Any]:
     """MCP tool handler for retrieving dimensions from a Qlik Sense application.
@@ -332,6 +466,14 @@ async def handle_get_app_script(args: GetAppScriptArgs) -> dict[str, Any]:
         print("📑 Section parsing enabled", file=sys.stderr)
     if args.max_preview_length:
         print(f"✂️ Preview limited to {args.max_preview_length:,} characters", file=sys.stderr)
+    if args.include_statements:
+        print("🌳 Statement parsing enabled", file=sys.stderr)
+    if args.analyze_performance:
+        print("🐢 Performance linting enabled", file=sys.stderr)
+    if args.section:
+        print(f"📑 Returning section: {args.section}", file=sys.stderr)
+    elif args.start_line or args.end_line:
+        print(f"📑 Returning lines {args.start_line or 1}-{args.end_line or 'end'}", file=sys.stderr)
 
     try:
         # Call the actual implementation with all parameters
@@ -341,6 +483,11 @@ async def handle_get_app_script(args: GetAppScriptArgs) -> dict[str, Any]:
             include_sections=args.include_sections,
             include_line_numbers=args.include_line_numbers,
             max_preview_length=args.max_preview_length,
+            start_line=args.start_line,
+            end_line=args.end_line,
+            section=args.section,
+            include_statements=args.include_statements,
+            analyze_performance=args.analyze_performance,
         )
 
         if "error" in result:
@@ -362,6 +509,12 @@ async def handle_get_app_script(args: GetAppScriptArgs) -> dict[str, Any]:
                     for binary in analysis["binary_load_statements"]:
                         print(f"      - Line {binary['line_number']}: {binary['source_app']}", file=sys.stderr)
 
+            if "performance" in result:
+                performance = result["performance"]
+                print(f"🐢 Performance findings: {performance['finding_count']}", file=sys.stderr)
+                for finding in performance["findings"]:
+                    print(f"   - Line {finding['line']} [{finding['rule']}]: {finding['message']}", file=sys.stderr)
+
             if result.get("is_truncated"):
                 print(f"⚠️ Script truncated to {args.max_preview_length:,} characters", file=sys.stderr)
 
@@ -423,6 +576,185 @@ async def handle_get_app_data_sources(args: GetAppDataSourcesArgs) -> dict[str,
         return error_response
 
 
+@mcp.tool()
+async def handle_get_app_snapshot(args: GetAppSnapshotArgs) -> dict[str, Any]:
+    """MCP tool handler for retrieving a whole-app metadata snapshot.
+
+    This tool connects to a Qlik Sense server, opens the specified application
+    once, and retrieves measures, dimensions, variables, fields, sheets, sheet
+    objects, script analysis and lineage over a single session, reporting the
+    time spent on each section.
+    """
+    print(f"📸 Retrieving snapshot for app: {args.app_id}", file=sys.stderr)
+    print(f"📸 Environment check: QLIK_SERVER_URL={os.getenv('QLIK_SERVER_URL')}", file=sys.stderr)
+
+    try:
+        # Call the actual implementation
+        result = await get_app_snapshot(
+            app_id=args.app_id,
+            include_measures=args.include_measures,
+            include_dimensions=args.include_dimensions,
+            include_variables=args.include_variables,
+            include_fields=args.include_fields,
+            include_sheets=args.include_sheets,
+            include_sheet_objects=args.include_sheet_objects,
+            include_script_analysis=args.include_script_analysis,
+            include_lineage=args.include_lineage,
+        )
+
+        if "error" in result:
+            print(f"❌ Error: {result['error']}", file=sys.stderr)
+        else:
+            timings = result.get("timings_ms", {})
+            print(
+                f"✅ Retrieved {len(result['sections'])} sections in {timings.get('total', 0):,.0f} ms",
+                file=sys.stderr,
+            )
+            for section, elapsed in timings.items():
+                print(f"   • {section}: {elapsed:,.0f} ms", file=sys.stderr)
+            for section, error in result.get("errors", {}).items():
+                print(f"⚠️ {section} failed: {error}", file=sys.stderr)
+
+        return result
+
+    except Exception as e:
+        error_response = {
+            "error": f"Unexpected error: {e!s}",
+            "app_id": args.app_id,
+        }
+        print(f"❌ Unexpected error in MCP handler: {e}", file=sys.stderr)
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}", file=sys.stderr)
+        return error_response
+
+
+@mcp.tool()
+async def handle_get_binary_chain(args: GetBinaryChainArgs) -> dict[str, Any]:
+    """MCP tool handler for resolving the BINARY load chain behind an application.
+
+    This tool follows the application's BINARY statements to the apps they load
+    from, recursively, resolving app paths and names through the document list.
+    Each hop reports its data sources, and circular references are detected.
+    """
+    print(f"🔗 Resolving BINARY chain for app: {args.app_id}", file=sys.stderr)
+
+    try:
+        # Call the actual implementation
+        result = await get_binary_chain(
+            app_id=args.app_id,
+            max_depth=args.max_depth,
+            include_data_sources=args.include_data_sources,
+        )
+
+        if "error" in result:
+            print(f"❌ Error: {result['error']}", file=sys.stderr)
+        else:
+            print(
+                f"✅ Resolved {result['app_count']} apps over {result['max_chain_depth']} BINARY hops "
+                f"in {result['elapsed_ms']:,.0f} ms",
+                file=sys.stderr,
+            )
+            for cycle in result["cycles"]:
+                print(f"⚠️ Circular BINARY reference: {' -> '.join(cycle)}", file=sys.stderr)
+            for source in result["unresolved_sources"]:
+                print(f"⚠️ Unresolved BINARY source: {source['source_app']} ({source['reason']})", file=sys.stderr)
+
+        return result
+
+    except Exception as e:
+        error_response = {
+            "error": f"Unexpected error: {e!s}",
+            "app_id": args.app_id,
+        }
+        print(f"❌ Unexpected error in MCP handler: {e}", file=sys.stderr)
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}", file=sys.stderr)
+        return error_response
+
+
+@mcp.tool()
+async def handle_extract_fleet_metadata(args: ExtractFleetMetadataArgs) -> dict[str, Any]:
+    """MCP tool handler for extracting metadata from many Qlik Sense applications.
+
+    This tool selects applications from the server's document list and extracts
+    a snapshot of each one concurrently, streaming one JSON line per app to the
+    requested output file. Failing apps are recorded without aborting the run.
+    """
+    try:
+        # Keep the file inside the configured output directory
+        output_path = resolve_output_path(args.output_path, overwrite=args.overwrite)
+    except ValueError as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return {"error": str(e), "output_path": args.output_path}
+
+    print(f"🛰️ Extracting fleet metadata to: {output_path}", file=sys.stderr)
+
+    try:
+        # Call the actual implementation
+        result = await extract_fleet_metadata(
+            output_path=str(output_path),
+            name_filter=args.name_filter,
+            stream_filter=args.stream_filter,
+            app_ids=args.app_ids,
+            limit=args.limit,
+            sections=args.sections,
+            parallelism=args.parallelism,
+            rebuild_cache=args.rebuild_cache,
+            cpu_workers=args.cpu_workers,
+            overwrite=args.overwrite,
+        )
+
+        if "error" in result:
+            print(f"❌ Error: {result['error']}", file=sys.stderr)
+        else:
+            print(
+                f"✅ Extracted {result['succeeded']} of {result['apps_selected']} apps "
+                f"({result['failed']} failed) in {result['elapsed_ms']:,.0f} ms",
+                file=sys.stderr,
+            )
+
+        return result
+
+    except Exception as e:
+        error_response = {
+            "error": f"Unexpected error: {e!s}",
+            "output_path": args.output_path,
+        }
+        print(f"❌ Unexpected error in MCP handler: {e}", file=sys.stderr)
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}", file=sys.stderr)
+        return error_response
+
+
+@mcp.tool()
+async def handle_get_server_stats() -> dict[str, Any]:
+    """MCP tool handler for reporting server performance counters.
+
+    This tool reports connection pool usage, response cache hits and misses,
+    and how many concurrent identical tool calls were coalesced.
+    """
+    print("📈 Retrieving server statistics...", file=sys.stderr)
+
+    try:
+        result = await get_server_stats()
+        coalescing = result["coalescing"]
+        print(
+            f"✅ Coalesced {coalescing['coalesced']} of {coalescing['calls']} tool calls",
+            file=sys.stderr,
+        )
+        return result
+
+    except Exception as e:
+        error_response = {
+            "error": f"Unexpected error: {e!s}",
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        print(f"❌ Unexpected error in MCP handler: {e}", file=sys.stderr)
+        import traceback
+        print(f"❌ Traceback: {traceback.format_exc()}", file=sys.stderr)
+        return error_response
+
+
 def main():
     """Main entry point for the MCP server"""
     print("🚀 Starting Qlik Sense MCP Server", file=sys.stderr)
@@ -0,0 +1,100 @@
+"""Coalescing of identical concurrent tool calls into one in-flight fetch"""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+class SingleFlight:
+    """Share one running call between concurrent callers with the same key
+
+    The first caller starts the call; callers arriving while it is still
+    running await the same task and receive the same result (or exception).
+    A caller being cancelled does not cancel the call for the others.
+    """
+
+    def __init__(self, enabled: bool | None = None):
+        """Initialize with configuration from arguments or environment"""
+        self.enabled = (
+            enabled if enabled is not None else os.getenv("QLIK_COALESCE_ENABLED", "true").lower() == "true"
+        )
+
+        self._in_flight: dict[tuple[int, Any], asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "calls": 0,
+            "executed": 0,
+            "coalesced": 0,
+        }
+
+    async def run(self, key: Any, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the call, or join the identical one already in flight"""
+        if not self.enabled:
+            return await call()
+
+        loop = asyncio.get_running_loop()
+        # Tasks can only be awaited on the loop that runs them
+        flight_key = (id(loop), key)
+
+        with self._lock:
+            self.stats["calls"] += 1
+            task = self._in_flight.get(flight_key)
+            if task is None:
+                task = loop.create_task(call())
+                self._in_flight[flight_key] = task
+                task.add_done_callback(functools.partial(self._finished, flight_key))
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return coalescing counters and the number of calls in flight"""
+        with self._lock:
+            return {
+                **self.stats,
+                "in_flight": len(self._in_flight),
+            }
+
+    def _finished(self, flight_key: tuple[int, Any], task: asyncio.Task):
+        """Forget a completed call so later callers start a fresh one"""
+        with self._lock:
+            if self._in_flight.get(flight_key) is task:
+                del self._in_flight[flight_key]
+
+
+_single_flight: SingleFlight | None = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group, creating it on first use"""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
+
+
+def coalesce_calls(func: Callable[..., Awaitable[dict[str, Any]]]) -> Callable[..., Awaitable[dict[str, Any]]]:
+    """Make concurrent calls of a tool with identical arguments share one fetch"""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs) -> dict[str, Any]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__qualname__, json.dumps(bound.arguments, sort_keys=True, default=str))
+
+        result = await get_single_flight().run(key, lambda: func(*args, **kwargs))
+        # Give every caller its own top-level dict
+        return dict(result)
+
+    return wrapper
@@ -1,11 +1,22 @@
 """MCP tool definitions for Qlik measure retrieval"""
 
-import re
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict
 from datetime import datetime
 from typing import Annotated, Any
 
 from pydantic import BaseModel, Field, field_validator
 
+from .cpu_pool import get_cpu_pool
+from .script_cache import ScriptIndex, get_script_index_cache, get_section_scan_cache
+from .script_lexer import scan_script
+from .script_linter import is_qvd_load, lint_script_performance
+from .script_parser import parse_script
+from .script_sanitizer import get_script_sanitizer
+from .single_flight import coalesce_calls
+
 
 class GetAppMeasuresArgs(BaseModel):
     """Retrieve all measures from a Qlik Sense application.
@@ -77,6 +88,46 @@ class GetAppVariablesArgs(BaseModel):
         return v.strip()
 
 
+class GetVariableGraphArgs(BaseModel):
+    """Build the dependency graph of a Qlik Sense application's variables.
+
+    This tool combines the application's variables with the SET and LET
+    statements of its load script, finds the $(variable) expansions between
+    them, and returns each variable's dependencies, full textual expansion and
+    nesting depth in dependency order, reporting circular expansions.
+    """
+
+    app_id: Annotated[str, Field(
+        description="Qlik Sense application ID (GUID format or app name)",
+        min_length=1,
+        max_length=255,
+    )]
+    include_script_variables: Annotated[bool, Field(
+        default=True,
+        description="Add variables defined by SET/LET statements in the load script.",
+    )] = True
+    include_expansions: Annotated[bool, Field(
+        default=True,
+        description="Include each variable's definition with all nested $(...) expansions substituted.",
+    )] = True
+    evaluate: Annotated[bool, Field(
+        default=False,
+        description="Also fetch each app variable's current value from the Engine (batched).",
+    )] = False
+    variable_names: Annotated[list[str] | None, Field(
+        default=None,
+        description="Only return these variables and the variables they depend on.",
+    )] = None
+
+    @field_validator("app_id")
+    @classmethod
+    def validate_app_id(cls, v: str) -> str:
+        """Ensure app_id is not empty and properly formatted."""
+        if not v.strip():
+            raise ValueError("app_id cannot be empty or whitespace")
+        return v.strip()
+
+
 class GetAppFieldsArgs(BaseModel):
     """Retrieve all fields and table information from a Qlik Sense application.
 
@@ -189,6 +240,34 @@ class GetSheetObjectsArgs(BaseModel):
         default=True,
         description="Resolve Master Item references to show full expressions instead of just IDs.",
     )] = True
+    use_property_tree: Annotated[bool, Field(
+        default=False,
+        description=(
+            "Fetch the sheet and all its children with one GetFullPropertyTree call, laying out only "
+            "objects that need computed values (falls back to per-object layouts if unavailable)."
+        ),
+    )] = False
+    expand_containers: Annotated[bool, Field(
+        default=True,
+        description=(
+            "Expand container contents. Set to False to get containers as stubs with their tabs and a cursor "
+            "for expand_container, for a much smaller response."
+        ),
+    )] = True
+    max_depth: Annotated[int, Field(
+        default=3,
+        description=(
+            "Levels of nested container contents to expand; containers below this level are returned as stubs."
+        ),
+        ge=0,
+        le=10,
+    )] = 3
+    max_nodes: Annotated[int, Field(
+        default=500,
+        description="Maximum number of embedded objects to fetch; containers beyond it are returned as stubs.",
+        ge=1,
+        le=5000,
+    )] = 500
 
     @field_validator("app_id", "sheet_id")
     @classmethod
@@ -199,6 +278,66 @@ class GetSheetObjectsArgs(BaseModel):
         return v.strip()
 
 
+class ExpandContainerArgs(BaseModel):
+    """Expand a container stub returned by get_sheet_objects.
+
+    This tool follows the cursor of a container that get_sheet_objects returned
+    without its contents and retrieves the embedded objects of the requested
+    tabs only, reusing the objects already opened by the first call.
+    """
+
+    app_id: Annotated[str, Field(
+        description="Qlik Sense application ID (GUID format or app name)",
+        min_length=1,
+        max_length=255,
+    )]
+    cursor: Annotated[str, Field(
+        description="Cursor of the container stub to expand",
+        min_length=1,
+        max_length=2048,
+    )]
+    tabs: Annotated[list[str] | None, Field(
+        default=None,
+        description="Tab IDs or labels to expand (all tabs when omitted).",
+    )] = None
+    max_depth: Annotated[int, Field(
+        default=1,
+        description="Levels of nested container contents to expand below this container.",
+        ge=1,
+        le=10,
+    )] = 1
+    max_nodes: Annotated[int, Field(
+        default=500,
+        description="Maximum number of embedded objects to fetch; containers beyond it are returned as stubs.",
+        ge=1,
+        le=5000,
+    )] = 500
+    include_properties: Annotated[bool, Field(
+        default=True,
+        description="Include detailed object properties (colors, settings, etc.).",
+    )] = True
+    include_layout: Annotated[bool, Field(
+        default=True,
+        description="Include position and size information for each object.",
+    )] = True
+    include_data_definition: Annotated[bool, Field(
+        default=True,
+        description="Include measures and dimensions used in visualizations.",
+    )] = True
+    resolve_master_items: Annotated[bool, Field(
+        default=True,
+        description="Resolve Master Item references to show full expressions instead of just IDs.",
+    )] = True
+
+    @field_validator("app_id", "cursor")
+    @classmethod
+    def validate_ids(cls, v: str) -> str:
+        """Ensure IDs are not empty and properly formatted."""
+        if not v.strip():
+            raise ValueError("ID cannot be empty or whitespace")
+        return v.strip()
+
+
 class GetAppDimensionsArgs(BaseModel):
     """Retrieve all dimensions from a Qlik Sense application.
 
@@ -275,6 +414,18 @@ class ScriptAnalysis(BaseModel):
     connections: list[str] = Field(default_factory=list, description="Connection strings found")
     includes: list[str] = Field(default_factory=list, description="Include/Must_Include files")
     subroutines: list[str] = Field(default_factory=list, description="Subroutine definitions")
+    connection_statements: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="CONNECT statements with target and line",
+    )
+    include_statements: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="Include/Must_Include directives with path and line",
+    )
+    subroutine_definitions: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="Subroutine definitions with name and line",
+    )
 
 
 class GetAppScriptArgs(BaseModel):
@@ -311,6 +462,35 @@ class GetAppScriptArgs(BaseModel):
         description="Maximum characters to return (useful for large scripts). None returns full script.",
         ge=100,
     )] = None
+    start_line: Annotated[int | None, Field(
+        default=None,
+        description="First line to return (1-based). Line numbers stay absolute to the full script.",
+        ge=1,
+    )] = None
+    end_line: Annotated[int | None, Field(
+        default=None,
+        description="Last line to return (inclusive). Defaults to the end of the script.",
+        ge=1,
+    )] = None
+    section: Annotated[str | None, Field(
+        default=None,
+        description="Return only the ///$tab section with this name. Cannot be combined with start_line/end_line.",
+        min_length=1,
+    )] = None
+    include_statements: Annotated[bool, Field(
+        default=False,
+        description=(
+            "Parse the script into a statement tree (LOAD/SELECT sources, STORE, DROP, "
+            "JOIN/KEEP/CONCATENATE prefixes, SET/LET, SUB/CALL, IF/FOR blocks)."
+        ),
+    )] = False
+    analyze_performance: Annotated[bool, Field(
+        default=False,
+        description=(
+            "Lint the script for reload performance: non-optimized QVD loads, RESIDENT reloads of "
+            "large tables, JOINs without key pruning and temporary tables never dropped."
+        ),
+    )] = False
 
     @field_validator("app_id")
     @classmethod
@@ -368,6 +548,148 @@ class GetAppDataSourcesArgs(BaseModel):
         return v.strip()
 
 
+class GetAppSnapshotArgs(BaseModel):
+    """Retrieve a complete metadata snapshot of a Qlik Sense application.
+
+    This tool connects to a Qlik Sense server, opens the specified application
+    once, and retrieves measures, dimensions, variables, fields, sheets, every
+    sheet's objects, the script analysis and the lineage over that single
+    session, reporting how long each section took.
+    """
+
+    app_id: Annotated[str, Field(
+        description="Qlik Sense application ID (GUID format or app name)",
+        min_length=1,
+        max_length=255,
+    )]
+    include_measures: Annotated[bool, Field(
+        default=True,
+        description="Include master measures.",
+    )] = True
+    include_dimensions: Annotated[bool, Field(
+        default=True,
+        description="Include master dimensions.",
+    )] = True
+    include_variables: Annotated[bool, Field(
+        default=True,
+        description="Include variables.",
+    )] = True
+    include_fields: Annotated[bool, Field(
+        default=True,
+        description="Include fields and their source tables.",
+    )] = True
+    include_sheets: Annotated[bool, Field(
+        default=True,
+        description="Include the sheet list.",
+    )] = True
+    include_sheet_objects: Annotated[bool, Field(
+        default=True,
+        description="Include the visualization objects of every sheet. Can be large for big apps.",
+    )] = True
+    include_script_analysis: Annotated[bool, Field(
+        default=True,
+        description="Include the load script analysis (the script text itself is not returned).",
+    )] = True
+    include_lineage: Annotated[bool, Field(
+        default=True,
+        description="Include data sources from the app lineage.",
+    )] = True
+
+    @field_validator("app_id")
+    @classmethod
+    def validate_app_id(cls, v: str) -> str:
+        """Ensure app_id is not empty and properly formatted."""
+        if not v.strip():
+            raise ValueError("app_id cannot be empty or whitespace")
+        return v.strip()
+
+
+async def cached_tool_response(
+    client: Any,
+    app_id: str,
+    tool_name: str,
+    options: dict[str, Any],
+    build_response: Callable[[], Awaitable[dict[str, Any]]],
+    use_cache: bool = True,
+) -> dict[str, Any]:
+    """Return a tool response from the metadata cache or build and cache it.
+
+    Cached responses are validated against the app's last reload and
+    modification time, so they are only reused until the app changes.
+
+    Args:
+        client: Connected client with the app opened
+        app_id: The Qlik Sense application ID
+        tool_name: Name of the tool the response belongs to
+        options: Tool options that shape the response
+        build_response: Coroutine function fetching a fresh response
+        use_cache: Whether to read and store the response in the cache at all
+
+    Returns:
+        JSON object with "served_from_cache" set unless it is an error
+
+    """
+    from .metadata_cache import get_metadata_cache
+
+    cache = get_metadata_cache()
+    if not use_cache or not cache.enabled:
+        response = await build_response()
+    else:
+        version = await client.get_app_version()
+        cached = cache.get(app_id, tool_name, options, version)
+        if cached is not None:
+            print(f"Serving {tool_name} for app {app_id} from cache")
+            return cached
+
+        response = await build_response()
+        cache.put(app_id, tool_name, options, version, response)
+
+    if "error" in response:
+        return response
+    return {**response, "served_from_cache": False}
+
+
+async def get_master_item_maps(
+    client: Any,
+    app_id: str,
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Get the master measure and dimension maps, cached per app version.
+
+    Walking many sheets of one app then fetches the master items once instead
+    of creating new MeasureList and DimensionList objects for every sheet.
+
+    Args:
+        client: Connected client with the app opened
+        app_id: The Qlik Sense application ID
+
+    Returns:
+        Tuple of (master measures map, master dimensions map) keyed by library ID,
+        both empty (and not cached) when fetching them fails
+
+    """
+    from .metadata_cache import get_metadata_cache
+
+    cache = get_metadata_cache()
+    version = await client.get_app_version()
+    cached = cache.get(app_id, "master_item_maps", None, version)
+    if cached is not None:
+        print(f"Using cached master items for app {app_id}")
+        return cached["measures"], cached["dimensions"]
+
+    try:
+        measures_map, dimensions_map = await asyncio.gather(
+            client.get_master_measures_map(raise_errors=True),
+            client.get_master_dimensions_map(raise_errors=True),
+        )
+    except Exception as e:
+        # Resolve nothing this time, but leave the cache empty so the next call retries
+        print(f"Master items unavailable for app {app_id}: {e}")
+        return {}, {}
+    cache.put(app_id, "master_item_maps", None, version, {"measures": measures_map, "dimensions": dimensions_map})
+    return measures_map, dimensions_map
+
+
+@coalesce_calls
 async def get_app_measures(
     app_id: str,
     include_expression: bool = True,
@@ -384,38 +706,52 @@ async def get_app_measures(
         JSON object containing measure information
 
     """
-    from .qlik_client import QlikClient
+    from .connection_pool import get_connection_pool
 
-    client = QlikClient()
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
 
     try:
-        # Connect to Qlik and open app
-        if not client.connect(app_id):
+        # Borrow a pooled connection with the app already opened
+        if client is None:
             return {
                 "error": "Failed to connect to Qlik Sense",
                 "app_id": app_id,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        # Get measures
-        result = client.get_measures(
-            include_expression=include_expression,
-            include_tags=include_tags,
-        )
+        async def build_response() -> dict[str, Any]:
+            # Get measures
+            result = await client.get_measures(
+                include_expression=include_expression,
+                include_tags=include_tags,
+            )
 
-        # Add metadata to response
-        response = {
-            "app_id": app_id,
-            "measures": result["measures"],
-            "count": result["count"],
-            "retrieved_at": datetime.utcnow().isoformat(),
-            "options": {
+            # Add metadata to response
+            response = {
+                "app_id": app_id,
+                "measures": result["measures"],
+                "count": result["count"],
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "options": {
+                    "include_expression": include_expression,
+                    "include_tags": include_tags,
+                },
+            }
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_app_measures",
+            {
                 "include_expression": include_expression,
                 "include_tags": include_tags,
             },
-        }
-
-        return response
+            build_response,
+        )
 
     except Exception as e:
         return {
@@ -425,10 +761,11 @@ async def get_app_measures(
         }
 
     finally:
-        # Always disconnect
-        client.disconnect()
+        # Return the connection to the pool for reuse
+        await pool.release(client)
 
 
+@coalesce_calls
 async def list_qlik_applications() -> dict[str, Any]:
     """Retrieve a list of all available Qlik Sense applications.
 
@@ -436,20 +773,20 @@ async def list_qlik_applications() -> dict[str, Any]:
         JSON object containing application list with names and IDs
 
     """
-    from .qlik_client import QlikClient
+    from .qlik_client import AsyncQlikClient
 
-    client = QlikClient()
+    client = AsyncQlikClient()
 
     try:
         # Connect to Qlik global context
-        if not client.connect_global():
+        if not await client.connect_global():
             return {
                 "error": "Failed to connect to Qlik Sense",
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
         # Get application list
-        result = client.get_doc_list()
+        result = await client.get_doc_list()
 
         # Add metadata to response
         response = {
@@ -468,9 +805,10 @@ async def list_qlik_applications() -> dict[str, Any]:
 
     finally:
         # Always disconnect
-        client.disconnect()
+        await client.disconnect()
 
 
+@coalesce_calls
 async def get_app_variables(
     app_id: str,
     include_definition: bool = True,
@@ -491,42 +829,211 @@ async def get_app_variables(
         JSON object containing variable information
 
     """
-    from .qlik_client import QlikClient
+    from .connection_pool import get_connection_pool
 
-    client = QlikClient()
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
 
     try:
-        # Connect to Qlik and open app
-        if not client.connect(app_id):
+        # Borrow a pooled connection with the app already opened
+        if client is None:
             return {
                 "error": "Failed to connect to Qlik Sense",
                 "app_id": app_id,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        # Get variables
-        result = client.get_variables(
-            include_definition=include_definition,
-            include_tags=include_tags,
-            show_reserved=show_reserved,
-            show_config=show_config,
-        )
+        async def build_response() -> dict[str, Any]:
+            # Get variables
+            result = await client.get_variables(
+                include_definition=include_definition,
+                include_tags=include_tags,
+                show_reserved=show_reserved,
+                show_config=show_config,
+            )
 
-        # Add metadata to response
-        response = {
-            "app_id": app_id,
-            "variables": result["variables"],
-            "count": result["count"],
-            "retrieved_at": datetime.utcnow().isoformat(),
-            "options": {
+            # Add metadata to response
+            response = {
+                "app_id": app_id,
+                "variables": result["variables"],
+                "count": result["count"],
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "options": {
+                    "include_definition": include_definition,
+                    "include_tags": include_tags,
+                    "show_reserved": show_reserved,
+                    "show_config": show_config,
+                },
+            }
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_app_variables",
+            {
                 "include_definition": include_definition,
                 "include_tags": include_tags,
                 "show_reserved": show_reserved,
                 "show_config": show_config,
             },
+            build_response,
+        )
+
+    except Exception as e:
+        return {
+            "error": str(e),
+            "app_id": app_id,
+            "timestamp": datetime.utcnow().isoformat(),
         }
 
-        return response
+    finally:
+        # Return the connection to the pool for reuse
+        await pool.release(client)
+
+
+@coalesce_calls
+async def get_variable_graph(
+    app_id: str,
+    include_script_variables: bool = True,
+    include_expansions: bool = True,
+    evaluate: bool = False,
+    variable_names: list[str] | None = None,
+) -> dict[str, Any]:
+    """Build the dependency graph of an app's variables and script SET/LET statements.
+
+    The variable list and the script are fetched concurrently. Expansions are
+    memoized in dependency order, so deeply nested variables are expanded once.
+    With evaluate, app variables are evaluated in pipelined bursts instead of
+    one round trip per variable.
+
+    Args:
+        app_id: The Qlik Sense application ID
+        include_script_variables: Whether to add variables set in the load script
+        include_expansions: Whether to include fully expanded definitions
+        evaluate: Whether to fetch the Engine's current value of each app variable
+        variable_names: Restrict the result to these variables and their dependencies
+
+    Returns:
+        JSON object with the variables in dependency order, cycles and references
+        to undefined variables
+
+    """
+    from .connection_pool import get_connection_pool
+    from .variable_graph import VariableGraph, build_variable_definitions
+
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
+
+    try:
+        # Borrow a pooled connection with the app already opened
+        if client is None:
+            return {
+                "error": "Failed to connect to Qlik Sense",
+                "app_id": app_id,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+        async def build_response() -> dict[str, Any]:
+            if include_script_variables:
+                variables_data, script_data = await asyncio.gather(client.get_variables(), client.get_script())
+                scan, _cache_info = get_section_scan_cache().scan(script_data["script"])
+                definitions = build_variable_definitions(
+                    variables_data["variables"], scan.set_variables, scan.let_variables,
+                )
+            else:
+                variables_data = await client.get_variables()
+                definitions = build_variable_definitions(variables_data["variables"], [], [])
+
+            graph = VariableGraph(definitions)
+            order = graph.topological_order()
+            depths = graph.depths()
+            expansions = graph.expand_all() if include_expansions else {}
+            dependents = graph.dependents()
+            on_cycle = {name for cycle in graph.cycles for name in cycle}
+
+            selected = set(definitions)
+            if variable_names:
+                # Keep the requested variables and everything they expand, transitively
+                selected = set()
+                pending = [graph.resolve(name) for name in variable_names]
+                while pending:
+                    name = pending.pop()
+                    if name is not None and name not in selected:
+                        selected.add(name)
+                        pending.extend(graph.known_dependencies(name))
+
+            variables = {}
+            for name in [*order, *sorted(on_cycle)]:
+                if name not in selected:
+                    continue
+                variable = {
+                    **definitions[name],
+                    "dependencies": graph.known_dependencies(name),
+                    "dependents": [dependent for dependent in dependents[name] if dependent in selected],
+                    "depth": depths.get(name),
+                    "on_cycle": name in on_cycle,
+                }
+                if include_expansions:
+                    variable["expansion"] = expansions[name]
+                variables[name] = variable
+
+            response = {
+                "app_id": app_id,
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "variables": variables,
+                "order": [name for name in order if name in selected],
+                "variable_count": len(variables),
+                "max_depth": max((depths[name] for name in order if name in selected), default=0),
+                "cycles": [cycle for cycle in graph.cycles if selected.intersection(cycle)],
+                "unresolved_references": {
+                    name: references
+                    for name, references in graph.unresolved_references().items()
+                    if name in selected
+                },
+                "options": {
+                    "include_script_variables": include_script_variables,
+                    "include_expansions": include_expansions,
+                    "evaluate": False,
+                    "variable_names": variable_names,
+                },
+            }
+
+            return response
+
+        # Serve the graph from cache while the app has not been saved or reloaded
+        response = await cached_tool_response(
+            client,
+            app_id,
+            "get_variable_graph",
+            {
+                "include_script_variables": include_script_variables,
+                "include_expansions": include_expansions,
+                "variable_names": variable_names,
+            },
+            build_response,
+        )
+        if not evaluate or "error" in response:
+            return response
+
+        # Values depend on selections and the clock, so they are never cached;
+        # copy the variables to keep them out of the cached graph
+        variables = {name: dict(variable) for name, variable in response["variables"].items()}
+        app_names = [name for name in variables if "app" in variables[name]["sources"]]
+        evaluation = await client.get_variable_values(app_names)
+        for name, value in evaluation["values"].items():
+            variables[name]["value"] = value
+        return {
+            **response,
+            "variables": variables,
+            "options": {**response["options"], "evaluate": True},
+            "evaluation": {
+                "evaluated": len(app_names),
+                "round_trips": evaluation["round_trips"],
+            },
+        }
 
     except Exception as e:
         return {
@@ -536,10 +1043,11 @@ async def get_app_variables(
         }
 
     finally:
-        # Always disconnect
-        client.disconnect()
+        # Return the connection to the pool for reuse
+        await pool.release(client)
 
 
+@coalesce_calls
 async def get_app_fields(
     app_id: str,
     show_system: bool = True,
@@ -564,38 +1072,57 @@ async def get_app_fields(
         JSON object containing field information and data model insights
 
     """
-    from .qlik_client import QlikClient
+    from .connection_pool import get_connection_pool
 
-    client = QlikClient()
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
 
     try:
-        # Connect to Qlik and open app
-        if not client.connect(app_id):
+        # Borrow a pooled connection with the app already opened
+        if client is None:
             return {
                 "error": "Failed to connect to Qlik Sense",
                 "app_id": app_id,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        # Get fields
-        result = client.get_fields(
-            show_system=show_system,
-            show_hidden=show_hidden,
-            show_derived_fields=show_derived_fields,
-            show_semantic=show_semantic,
-            show_src_tables=show_src_tables,
-            show_implicit=show_implicit,
-        )
+        async def build_response() -> dict[str, Any]:
+            # Get fields
+            result = await client.get_fields(
+                show_system=show_system,
+                show_hidden=show_hidden,
+                show_derived_fields=show_derived_fields,
+                show_semantic=show_semantic,
+                show_src_tables=show_src_tables,
+                show_implicit=show_implicit,
+            )
 
-        # Add metadata to response
-        response = {
-            "app_id": app_id,
-            "fields": result["fields"],
-            "tables": result.get("tables", []),
-            "field_count": result["field_count"],
-            "table_count": result.get("table_count", 0),
-            "retrieved_at": datetime.utcnow().isoformat(),
-            "options": {
+            # Add metadata to response
+            response = {
+                "app_id": app_id,
+                "fields": result["fields"],
+                "tables": result.get("tables", []),
+                "field_count": result["field_count"],
+                "table_count": result.get("table_count", 0),
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "options": {
+                    "show_system": show_system,
+                    "show_hidden": show_hidden,
+                    "show_derived_fields": show_derived_fields,
+                    "show_semantic": show_semantic,
+                    "show_src_tables": show_src_tables,
+                    "show_implicit": show_implicit,
+                },
+            }
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_app_fields",
+            {
                 "show_system": show_system,
                 "show_hidden": show_hidden,
                 "show_derived_fields": show_derived_fields,
@@ -603,9 +1130,8 @@ async def get_app_fields(
                 "show_src_tables": show_src_tables,
                 "show_implicit": show_implicit,
             },
-        }
-
-        return response
+            build_response,
+        )
 
     except Exception as e:
         return {
@@ -615,10 +1141,11 @@ async def get_app_fields(
         }
 
     finally:
-        # Always disconnect
-        client.disconnect()
+        # Return the connection to the pool for reuse
+        await pool.release(client)
 
 
+@coalesce_calls
 async def get_app_sheets(
     app_id: str,
     include_thumbnail: bool = False,
@@ -635,38 +1162,53 @@ async def get_app_sheets(
         JSON object containing sheet information
 
     """
-    from .qlik_client import QlikClient
+    from .connection_pool import get_connection_pool
 
-    client = QlikClient()
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
 
     try:
-        # Connect to Qlik and open app
-        if not client.connect(app_id):
+        # Borrow a pooled connection with the app already opened
+        if client is None:
             return {
                 "error": "Failed to connect to Qlik Sense",
                 "app_id": app_id,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        # Get sheets
-        result = client.get_sheets(
-            include_thumbnail=include_thumbnail,
-            include_metadata=include_metadata,
-        )
+        async def build_response() -> dict[str, Any]:
+            # Get sheets
+            result = await client.get_sheets(
+                include_thumbnail=include_thumbnail,
+                include_metadata=include_metadata,
+            )
 
-        # Add metadata to response
-        response = {
-            "app_id": app_id,
-            "sheets": result["sheets"],
-            "sheet_count": result["sheet_count"],
-            "retrieved_at": datetime.utcnow().isoformat(),
-            "options": {
+            # Add metadata to response
+            response = {
+                "app_id": app_id,
+                "sheets": result["sheets"],
+                "sheet_count": result["sheet_count"],
+                "retrieval_method": result["retrieval_method"],
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "options": {
+                    "include_thumbnail": include_thumbnail,
+                    "include_metadata": include_metadata,
+                },
+            }
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_app_sheets",
+            {
                 "include_thumbnail": include_thumbnail,
                 "include_metadata": include_metadata,
             },
-        }
-
-        return response
+            build_response,
+        )
 
     except Exception as e:
         return {
@@ -676,10 +1218,11 @@ async def get_app_sheets(
         }
 
     finally:
-        # Always disconnect
-        client.disconnect()
+        # Return the connection to the pool for reuse
+        await pool.release(client)
 
 
+@coalesce_calls
 async def get_sheet_objects(
     app_id: str,
     sheet_id: str,
@@ -687,6 +1230,10 @@ async def get_sheet_objects(
     include_layout: bool = True,
     include_data_definition: bool = True,
     resolve_master_items: bool = True,
+    use_property_tree: bool = False,
+    expand_containers: bool = True,
+    max_depth: int = 3,
+    max_nodes: int = 500,
 ) -> dict[str, Any]:
     """Retrieve all visualization objects from a specific sheet.
 
@@ -697,18 +1244,23 @@ async def get_sheet_objects(
         include_layout: Whether to include position/size info
         include_data_definition: Whether to include measures/dimensions
         resolve_master_items: Whether to resolve Master Item references
+        use_property_tree: Whether to read the sheet from its full property tree
+        expand_containers: Whether to expand container contents or return stubs
+        max_depth: Levels of nested container contents to expand
+        max_nodes: Maximum number of embedded objects to fetch
 
     Returns:
         JSON object containing visualization object details
 
     """
-    from .qlik_client import QlikClient
+    from .connection_pool import get_connection_pool
 
-    client = QlikClient()
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
 
     try:
-        # Connect to Qlik and open app
-        if not client.connect(app_id):
+        # Borrow a pooled connection with the app already opened
+        if client is None:
             return {
                 "error": "Failed to connect to Qlik Sense",
                 "app_id": app_id,
@@ -716,46 +1268,221 @@ async def get_sheet_objects(
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        # Get sheet objects
-        result = client.get_sheet_objects(
-            sheet_id=sheet_id,
-            include_properties=include_properties,
-            include_layout=include_layout,
-            include_data_definition=include_data_definition,
-            resolve_master_items=resolve_master_items,
+        async def build_response() -> dict[str, Any]:
+            # Master item maps are shared across calls until the app changes
+            master_measures, master_dimensions = None, None
+            if resolve_master_items:
+                master_measures, master_dimensions = await get_master_item_maps(client, app_id)
+
+            # Get sheet objects
+            result = await client.get_sheet_objects(
+                sheet_id=sheet_id,
+                include_properties=include_properties,
+                include_layout=include_layout,
+                include_data_definition=include_data_definition,
+                resolve_master_items=resolve_master_items,
+                master_measures_map=master_measures,
+                master_dimensions_map=master_dimensions,
+                use_property_tree=use_property_tree,
+                expand_containers=expand_containers,
+                max_depth=max_depth,
+                max_nodes=max_nodes,
+            )
+
+            # Add metadata to response
+            response = {
+                "app_id": app_id,
+                "sheet_id": sheet_id,
+                "sheet_title": result.get("sheet_title", ""),
+                "objects": result["objects"],
+                "object_count": result["object_count"],
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "options": {
+                    "include_properties": include_properties,
+                    "include_layout": include_layout,
+                    "include_data_definition": include_data_definition,
+                    "resolve_master_items": resolve_master_items,
+                    "use_property_tree": use_property_tree,
+                    "expand_containers": expand_containers,
+                    "max_depth": max_depth,
+                    "max_nodes": max_nodes,
+                },
+            }
+
+            if "container_traversal" in result:
+                response["container_traversal"] = result["container_traversal"]
+            if "property_tree" in result:
+                response["property_tree"] = result["property_tree"]
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_sheet_objects",
+            {
+                "sheet_id": sheet_id,
+                "include_properties": include_properties,
+                "include_layout": include_layout,
+                "include_data_definition": include_data_definition,
+                "resolve_master_items": resolve_master_items,
+                "use_property_tree": use_property_tree,
+                "expand_containers": expand_containers,
+                "max_depth": max_depth,
+                "max_nodes": max_nodes,
+            },
+            build_response,
         )
 
-        # Add metadata to response
-        response = {
+    except Exception as e:
+        return {
+            "error": str(e),
             "app_id": app_id,
             "sheet_id": sheet_id,
-            "sheet_title": result.get("sheet_title", ""),
-            "objects": result["objects"],
-            "object_count": result["object_count"],
-            "retrieved_at": datetime.utcnow().isoformat(),
-            "options": {
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    finally:
+        # Return the connection to the pool for reuse
+        await pool.release(client)
+
+
+@coalesce_calls
+async def expand_container(
+    app_id: str,
+    cursor: str,
+    tabs: list[str] | None = None,
+    include_properties: bool = True,
+    include_layout: bool = True,
+    include_data_definition: bool = True,
+    resolve_master_items: bool = True,
+    max_depth: int = 1,
+    max_nodes: int = 500,
+) -> dict[str, Any]:
+    """Expand a container stub returned by get_sheet_objects.
+
+    The pooled connection that served the first call still has the container
+    and its properties in its object cache, so usually only the embedded
+    objects of the requested tabs are fetched.
+
+    Args:
+        app_id: The Qlik Sense application ID
+        cursor: The cursor of the container stub
+        tabs: Tab IDs or labels to expand, or None for all tabs
+        include_properties: Whether to include object properties
+        include_layout: Whether to include position/size info
+        include_data_definition: Whether to include measures/dimensions
+        resolve_master_items: Whether to resolve Master Item references
+        max_depth: Levels of nested container contents to expand below the container
+        max_nodes: Maximum number of embedded objects to fetch
+
+    Returns:
+        JSON object containing the container's structure and embedded objects
+
+    """
+    from .connection_pool import get_connection_pool
+    from .qlik_client import decode_container_cursor
+
+    try:
+        position = decode_container_cursor(cursor)
+    except ValueError as e:
+        return {"error": str(e), "app_id": app_id, "timestamp": datetime.utcnow().isoformat()}
+    if position["app_id"] != app_id:
+        return {
+            "error": f"Cursor belongs to app {position['app_id']}",
+            "app_id": app_id,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    container_id = position["container_id"]
+    sheet_id = position.get("sheet_id", "")
+
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
+
+    try:
+        # Borrow a pooled connection with the app already opened
+        if client is None:
+            return {
+                "error": "Failed to connect to Qlik Sense",
+                "app_id": app_id,
+                "container_id": container_id,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+        async def build_response() -> dict[str, Any]:
+            # Master item maps are shared across calls until the app changes
+            master_measures, master_dimensions = None, None
+            if resolve_master_items:
+                master_measures, master_dimensions = await get_master_item_maps(client, app_id)
+
+            result = await client.expand_container(
+                container_id,
+                tabs=tabs,
+                include_properties=include_properties,
+                include_layout=include_layout,
+                include_data_definition=include_data_definition,
+                resolve_master_items=resolve_master_items,
+                master_measures_map=master_measures,
+                master_dimensions_map=master_dimensions,
+                sheet_id=sheet_id,
+                depth=position["depth"],
+                max_depth=max_depth,
+                max_nodes=max_nodes,
+            )
+
+            return {
+                "app_id": app_id,
+                "sheet_id": sheet_id,
+                **result,
+                "depth": position["depth"],
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "options": {
+                    "tabs": tabs,
+                    "include_properties": include_properties,
+                    "include_layout": include_layout,
+                    "include_data_definition": include_data_definition,
+                    "resolve_master_items": resolve_master_items,
+                    "max_depth": max_depth,
+                    "max_nodes": max_nodes,
+                },
+            }
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "expand_container",
+            {
+                "container_id": container_id,
+                "sheet_id": sheet_id,
+                "depth": position["depth"],
+                "tabs": tabs,
                 "include_properties": include_properties,
                 "include_layout": include_layout,
                 "include_data_definition": include_data_definition,
                 "resolve_master_items": resolve_master_items,
+                "max_depth": max_depth,
+                "max_nodes": max_nodes,
             },
-        }
-
-        return response
+            build_response,
+        )
 
     except Exception as e:
         return {
             "error": str(e),
             "app_id": app_id,
-            "sheet_id": sheet_id,
+            "container_id": container_id,
             "timestamp": datetime.utcnow().isoformat(),
         }
 
     finally:
-        # Always disconnect
-        client.disconnect()
+        # Return the connection to the pool for reuse
+        await pool.release(client)
 
 
+@coalesce_calls
 async def get_app_dimensions(
     app_id: str,
     include_title: bool = True,
@@ -764,42 +1491,58 @@ async def get_app_dimensions(
     include_info: bool = True,
 ) -> dict[str, Any]:
     """Retrieve all dimensions from a Qlik Sense application"""
-    from .qlik_client import QlikClient
+    from .connection_pool import get_connection_pool
 
-    client = QlikClient()
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
 
     try:
-        # Connect to Qlik and open the specified app
-        if not client.connect(app_id):
+        # Borrow a pooled connection with the app already opened
+        if client is None:
             return {
                 "error": "Failed to connect to Qlik Engine",
                 "app_id": app_id,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        # Get dimensions from the app
-        dimensions_data = client.get_dimensions(
-            include_title=include_title,
-            include_tags=include_tags,
-            include_grouping=include_grouping,
-            include_info=include_info,
-        )
+        async def build_response() -> dict[str, Any]:
+            # Get dimensions from the app
+            dimensions_data = await client.get_dimensions(
+                include_title=include_title,
+                include_tags=include_tags,
+                include_grouping=include_grouping,
+                include_info=include_info,
+            )
 
-        # Build response
-        response = {
-            "app_id": app_id,
-            "retrieved_at": datetime.utcnow().isoformat(),
-            "dimension_count": dimensions_data["dimension_count"],
-            "dimensions": dimensions_data["dimensions"],
-            "options": {
+            # Build response
+            response = {
+                "app_id": app_id,
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "dimension_count": dimensions_data["dimension_count"],
+                "dimensions": dimensions_data["dimensions"],
+                "options": {
+                    "include_title": include_title,
+                    "include_tags": include_tags,
+                    "include_grouping": include_grouping,
+                    "include_info": include_info,
+                },
+            }
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_app_dimensions",
+            {
                 "include_title": include_title,
                 "include_tags": include_tags,
                 "include_grouping": include_grouping,
                 "include_info": include_info,
             },
-        }
-
-        return response
+            build_response,
+        )
 
     except Exception as e:
         return {
@@ -809,46 +1552,45 @@ async def get_app_dimensions(
         }
 
     finally:
-        # Always disconnect
-        client.disconnect()
+        # Return the connection to the pool for reuse
+        await pool.release(client)
 
 
 def parse_script_sections(script: str) -> list[ScriptSection]:
     """Parse script into sections/tabs based on ///$tab markers"""
-    sections = []
     lines = script.split("\n")
-    current_section = None
-    current_content = []
-    current_start = 0
-
+    markers = []
     for i, line in enumerate(lines, 1):
         if line.strip().startswith("///$tab"):
-            # Save previous section if exists
-            if current_section:
-                sections.append(ScriptSection(
-                    name=current_section,
-                    start_line=current_start,
-                    end_line=i - 1,
-                    content="\n".join(current_content),
-                    line_count=len(current_content),
-                ))
-
-            # Start new section
             parts = line.strip().split(None, 1)
-            current_section = parts[1] if len(parts) > 1 else f"Section_{len(sections) + 1}"
-            current_content = []
-            current_start = i + 1
-        elif current_section is not None:
-            current_content.append(line)
-
-    # Save last section
-    if current_section and current_content:
+            markers.append((i, parts[1] if len(parts) > 1 else None))
+
+    return build_script_sections(script, lines, markers)
+
+
+def build_script_sections(
+    script: str,
+    lines: list[str],
+    markers: list[tuple[int, str | None]],
+) -> list[ScriptSection]:
+    """Build sections from ///$tab marker lines and their (optional) names"""
+    sections = []
+
+    for index, (marker_line, name) in enumerate(markers):
+        start = marker_line + 1
+        end = markers[index + 1][0] - 1 if index + 1 < len(markers) else len(lines)
+        content = lines[start - 1:end]
+
+        # The last section is only kept when it has content
+        if index + 1 == len(markers) and not content:
+            continue
+
         sections.append(ScriptSection(
-            name=current_section,
-            start_line=current_start,
-            end_line=len(lines),
-            content="\n".join(current_content),
-            line_count=len(current_content),
+            name=name or f"Section_{len(sections) + 1}",
+            start_line=start,
+            end_line=end,
+            content="\n".join(content),
+            line_count=len(content),
         ))
 
     # If no sections found, treat entire script as one section
@@ -866,145 +1608,191 @@ def parse_script_sections(script: str) -> list[ScriptSection]:
 
 def extract_binary_load_statements(script: str) -> list[BinaryLoadStatement]:
     """Extract BINARY LOAD statements from the script"""
-    binary_loads = []
-    lines = script.split("\n")
+    return [BinaryLoadStatement(**binary) for binary in scan_script(script).binary_loads]
 
-    # Pattern to match BINARY LOAD statements (case-insensitive)
-    # Matches: BINARY [path];  or  BINARY LOAD FROM [path];
-    binary_pattern = re.compile(
-        r"^\s*BINARY\s+(?:LOAD\s+FROM\s+)?([^;]+);?\s*$",
-        re.IGNORECASE | re.MULTILINE,
-    )
 
-    for i, line in enumerate(lines, 1):
-        match = binary_pattern.match(line)
-        if match:
-            # Clean up the source app path - remove quotes, brackets, and whitespace
-            source_app = match.group(1).strip()
-            # Remove surrounding brackets if present
-            if source_app.startswith("[") and source_app.endswith("]"):
-                source_app = source_app[1:-1]
-            # Remove surrounding quotes
-            source_app = source_app.strip('"').strip("'")
+def perform_script_analysis(script: str, include_sections: bool = False) -> ScriptAnalysis:
+    """Perform comprehensive analysis of the Qlik script
 
-            binary_loads.append(BinaryLoadStatement(
-                line_number=i,
-                source_app=source_app,
-                full_statement=line.strip(),
-            ))
+    Every count and extraction comes from one lexer pass, so keywords inside
+    comments, string literals and [bracketed] names are ignored.
+    """
+    return analyze_script_incrementally(script, include_sections=include_sections)[0]
 
-    return binary_loads
 
+def analyze_script_incrementally(
+    script: str,
+    include_sections: bool = False,
+) -> tuple[ScriptAnalysis, dict[str, int]]:
+    """Analyze the script reusing cached scans of unchanged ///$tab sections
 
-def perform_script_analysis(script: str, include_sections: bool = False) -> ScriptAnalysis:
-    """Perform comprehensive analysis of the Qlik script"""
-    lines = script.split("\n")
+    Returns the analysis and how many sections were scanned and served from cache.
+    """
+    scan, cache_info = get_section_scan_cache().scan(script)
 
-    # Initialize counters
-    empty_lines = sum(1 for line in lines if not line.strip())
-    comment_lines = sum(1 for line in lines if line.strip().startswith("//") or line.strip().startswith("/*"))
-
-    # Parse sections if requested
-    sections = parse_script_sections(script) if include_sections else []
-
-    # Extract BINARY LOAD statements
-    binary_loads = extract_binary_load_statements(script)
-
-    # Count statement types (case-insensitive)
-    script_upper = script.upper()
-    load_statements = len(re.findall(r"\bLOAD\b", script_upper))
-    store_statements = len(re.findall(r"\bSTORE\b", script_upper))
-    drop_statements = len(re.findall(r"\bDROP\b", script_upper))
-
-    # Extract SET and LET variables
-    set_pattern = re.compile(r"^\s*SET\s+(\w+)\s*=\s*(.+?);?\s*$", re.IGNORECASE | re.MULTILINE)
-    let_pattern = re.compile(r"^\s*LET\s+(\w+)\s*=\s*(.+?);?\s*$", re.IGNORECASE | re.MULTILINE)
-
-    set_variables = []
-    for match in set_pattern.finditer(script):
-        set_variables.append({
-            "name": match.group(1),
-            "value": match.group(2).strip(),
-            "line": script[:match.start()].count("\n") + 1,
-        })
-
-    let_variables = []
-    for match in let_pattern.finditer(script):
-        let_variables.append({
-            "name": match.group(1),
-            "value": match.group(2).strip(),
-            "line": script[:match.start()].count("\n") + 1,
-        })
-
-    # Extract connection strings (simplified - matches CONNECT TO statements)
-    connection_pattern = re.compile(r"^\s*(?:LIB\s+)?CONNECT\s+TO\s+(.+?);?\s*$", re.IGNORECASE | re.MULTILINE)
-    connections = [match.group(1).strip().strip('"').strip("'") for match in connection_pattern.finditer(script)]
-
-    # Extract includes
-    include_pattern = re.compile(r"^\s*\$\((?:Must_)?Include\s*=\s*(.+?)\);?\s*$", re.IGNORECASE | re.MULTILINE)
-    includes = [match.group(1).strip().strip('"').strip("'") for match in include_pattern.finditer(script)]
-
-    # Extract subroutines
-    sub_pattern = re.compile(r"^\s*SUB\s+(\w+)", re.IGNORECASE | re.MULTILINE)
-    subroutines = [match.group(1) for match in sub_pattern.finditer(script)]
+    # Parse sections if requested, reusing the ///$tab markers found by the lexer
+    sections = build_script_sections(script, script.split("\n"), scan.tab_markers) if include_sections else []
 
     return ScriptAnalysis(
-        total_lines=len(lines),
-        empty_lines=empty_lines,
-        comment_lines=comment_lines,
+        total_lines=scan.total_lines,
+        empty_lines=scan.empty_lines,
+        comment_lines=scan.comment_lines,
         sections=sections,
-        load_statements=load_statements,
-        store_statements=store_statements,
-        drop_statements=drop_statements,
-        binary_load_statements=binary_loads,
-        set_variables=set_variables,
-        let_variables=let_variables,
-        connections=connections,
-        includes=includes,
-        subroutines=subroutines,
-    )
-
-
-def add_line_numbers(script: str) -> str:
-    """Add line numbers to script content"""
+        load_statements=scan.load_statements,
+        store_statements=scan.store_statements,
+        drop_statements=scan.drop_statements,
+        binary_load_statements=[BinaryLoadStatement(**binary) for binary in scan.binary_loads],
+        set_variables=scan.set_variables,
+        let_variables=scan.let_variables,
+        # ODBC/OLEDB CONNECT targets are connection strings, so mask their credentials
+        connections=[sanitize_script(connection) for connection in scan.connections],
+        includes=scan.includes,
+        subroutines=scan.subroutines,
+        connection_statements=[
+            {**statement, "target": sanitize_script(statement["target"])} for statement in scan.connection_statements
+        ],
+        include_statements=scan.include_statements,
+        subroutine_definitions=scan.subroutine_definitions,
+    ), cache_info
+
+
+def analyze_script_performance(script: str, table_rows: dict[str, int] | None = None) -> dict[str, Any]:
+    """Lint the script for statements that slow down a reload
+
+    Findings come from the parsed statement tree, so LOADs inside comments or
+    strings are never reported, and each one carries its line and section.
+    """
+    ast = parse_script(script)
+    findings = lint_script_performance(ast, table_rows)
+    qvd_loads = [statement for statement in ast.walk() if statement.kind == "LOAD" and is_qvd_load(statement)]
+
+    by_rule: dict[str, int] = {}
+    by_severity: dict[str, int] = {}
+    for finding in findings:
+        by_rule[finding["rule"]] = by_rule.get(finding["rule"], 0) + 1
+        by_severity[finding["severity"]] = by_severity.get(finding["severity"], 0) + 1
+
+    return {
+        "findings": findings,
+        "finding_count": len(findings),
+        "by_rule": by_rule,
+        "by_severity": by_severity,
+        "qvd_loads": len(qvd_loads),
+        # One finding per non-optimized statement, so loads sharing a line are counted apart
+        "optimized_qvd_loads": len(qvd_loads) - by_rule.get("non_optimized_qvd_load", 0),
+        "row_counts_available": table_rows is not None,
+    }
+
+
+def add_line_numbers(script: str, first_line: int = 1) -> str:
+    """Add line numbers to script content, numbering from first_line"""
     lines = script.split("\n")
     numbered_lines = []
-    max_line_num = len(lines)
+    max_line_num = first_line + len(lines) - 1
     padding = len(str(max_line_num))
 
-    for i, line in enumerate(lines, 1):
+    for i, line in enumerate(lines, first_line):
         numbered_lines.append(f"{i:>{padding}}: {line}")
 
     return "\n".join(numbered_lines)
 
 
 def sanitize_script(script: str) -> str:
-    """Sanitize sensitive information from script"""
-    # Mask passwords in connection strings
-    script = re.sub(
-        r'(PASSWORD\s*=\s*)[\'"]?[^\'";\s]+[\'"]?',
-        r"\1[MASKED]",
-        script,
-        flags=re.IGNORECASE,
-    )
+    """Sanitize sensitive information from script
 
-    # Mask user credentials
-    script = re.sub(
-        r'(USER\s+ID\s*=\s*)[\'"]?[^\'";\s]+[\'"]?',
-        r"\1[MASKED]",
-        script,
-        flags=re.IGNORECASE,
-    )
+    Passwords, user IDs, secrets, tokens, API keys and bearer credentials are
+    masked in one scan (see script_sanitizer for the configurable rules).
+    """
+    return get_script_sanitizer().sanitize(script)
+
+
+def sanitize_statement(statement: dict[str, Any]) -> dict[str, Any]:
+    """Mask credentials in a serialized statement, its attributes and nested blocks
+
+    Statement text and attributes such as a CONNECT target repeat the raw
+    script, so they go through the same sanitizer as the script itself.
+    """
+
+    def mask(value: Any) -> Any:
+        if isinstance(value, str):
+            return sanitize_script(value)
+        if isinstance(value, list):
+            return [mask(item) for item in value]
+        if isinstance(value, dict):
+            return {key: mask(item) for key, item in value.items()}
+        return value
+
+    return {
+        **statement,
+        "text": sanitize_script(statement["text"]),
+        "attributes": mask(statement["attributes"]),
+        "body": [sanitize_statement(child) for child in statement["body"]],
+        "branches": [sanitize_statement(branch) for branch in statement["branches"]],
+    }
+
+
+def map_script_sections(script: str) -> dict[str, tuple[int, int]]:
+    """Map the script's section names to their line ranges (CPU pool worker)"""
+    sections = {}
+    for section in parse_script_sections(script):
+        sections.setdefault(section.name, (section.start_line, section.end_line))
+    return sections
+
+
+def analyze_script_to_dict(script: str) -> dict[str, Any]:
+    """Full script analysis as a plain dict (CPU pool worker)
+
+    Sections keep their names and line ranges but not their content, so the
+    raw script text never ends up in a snapshot.
+    """
+    analysis = perform_script_analysis(script, include_sections=True)
+    return analysis.model_dump(exclude={"sections": {"__all__": {"content"}}})
 
-    return script
 
+async def get_script_index(client: Any, app_id: str) -> ScriptIndex | dict[str, Any]:
+    """Get the app's script with its line index, cached per app version.
 
+    Slicing many line ranges or sections of one script then downloads and
+    splits it once until the app is saved or reloaded.
+
+    Args:
+        client: Connected client with the app opened
+        app_id: The Qlik Sense application ID
+
+    Returns:
+        ScriptIndex, or the error response of GetScript
+
+    """
+    cache = get_script_index_cache()
+    version = await client.get_app_version()
+    index = cache.get(app_id, version)
+    if index is not None:
+        return index
+
+    script_data = await client.get_script()
+    if "error" in script_data:
+        return script_data
+
+    script = script_data["script"]
+    sections = await get_cpu_pool().run(map_script_sections, script, size=len(script))
+
+    index = ScriptIndex(script, sections)
+    cache.put(app_id, version, index)
+    return index
+
+
+@coalesce_calls
 async def get_app_script(
     app_id: str,
     analyze_script: bool = False,
     include_sections: bool = False,
     include_line_numbers: bool = False,
     max_preview_length: int | None = None,
+    start_line: int | None = None,
+    end_line: int | None = None,
+    section: str | None = None,
+    include_statements: bool = False,
+    analyze_performance: bool = False,
 ) -> dict[str, Any]:
     """Retrieve and optionally analyze the script from a Qlik Sense application.
 
@@ -1014,100 +1802,194 @@ async def get_app_script(
         include_sections: Parse and return script sections/tabs
         include_line_numbers: Add line numbers to script output
         max_preview_length: Maximum characters to return for script preview
+        start_line: First line of the window to return (1-based)
+        end_line: Last line of the window to return (inclusive)
+        section: Name of the ///$tab section to return
+        include_statements: Parse and return the statement tree (within the window, if any)
+        analyze_performance: Lint the script for reload performance problems
 
     Returns:
         JSON object containing script content and optional analysis
 
     """
-    from .qlik_client import QlikClient
+    from .connection_pool import get_connection_pool
 
-    client = QlikClient()
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
 
     try:
-        # Connect to Qlik and open the specified app
-        if not client.connect(app_id):
+        # Borrow a pooled connection with the app already opened
+        if client is None:
             return {
                 "error": "Failed to connect to Qlik Engine",
                 "app_id": app_id,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        # Get script from the app
-        script_data = client.get_script()
-
-        if "error" in script_data:
-            return {
-                "error": script_data["error"],
-                "app_id": app_id,
-                "timestamp": datetime.utcnow().isoformat(),
-            }
-
-        script_content = script_data["script"]
-
-        # Sanitize sensitive information
-        script_content = sanitize_script(script_content)
-
-        # Apply preview length limit if specified
-        original_length = len(script_content)
-        if max_preview_length and len(script_content) > max_preview_length:
-            script_content = script_content[:max_preview_length]
-            is_truncated = True
-        else:
-            is_truncated = False
-
-        # Add line numbers if requested
-        if include_line_numbers:
-            script_content = add_line_numbers(script_content)
-
-        # Build response
-        response = {
-            "app_id": app_id,
-            "retrieved_at": datetime.utcnow().isoformat(),
-            "script": script_content,
-            "script_length": original_length,
-            "is_truncated": is_truncated,
-        }
-
-        # Add truncation info if applicable
-        if is_truncated:
-            response["truncated_at"] = max_preview_length
-            response["truncation_note"] = (
-                f"Script truncated to {max_preview_length:,} characters "
-                f"(original: {original_length:,} characters)"
-            )
+        async def build_response() -> dict[str, Any]:
+            # Get the script and its line index (cached per app version)
+            index = await get_script_index(client, app_id)
+
+            if isinstance(index, dict):
+                return {
+                    "error": index["error"],
+                    "app_id": app_id,
+                    "timestamp": datetime.utcnow().isoformat(),
+                }
+
+            script_data = {"script": index.script}
+            script_content = index.script
+            original_length = len(script_content)
+
+            # Select the requested window of lines
+            window = None
+            if section is not None:
+                if start_line is not None or end_line is not None:
+                    return {
+                        "error": "section cannot be combined with start_line/end_line",
+                        "app_id": app_id,
+                        "timestamp": datetime.utcnow().isoformat(),
+                    }
+                if section not in index.sections:
+                    return {
+                        "error": f"Section '{section}' not found",
+                        "available_sections": list(index.sections),
+                        "app_id": app_id,
+                        "timestamp": datetime.utcnow().isoformat(),
+                    }
+                window = index.sections[section]
+            elif start_line is not None or end_line is not None:
+                first = start_line or 1
+                last = min(end_line or index.line_count, index.line_count)
+                if first > last:
+                    return {
+                        "error": f"Invalid line range {first}-{end_line or index.line_count} "
+                                 f"(script has {index.line_count} lines)",
+                        "app_id": app_id,
+                        "timestamp": datetime.utcnow().isoformat(),
+                    }
+                window = (first, last)
+
+            if window is not None:
+                script_content = index.slice_lines(*window)
+
+            # Sanitize only the text being returned (masking never changes line breaks)
+            script_content = await get_cpu_pool().run(sanitize_script, script_content, size=len(script_content))
+
+            # Apply preview length limit if specified
+            content_length = len(script_content)
+            if max_preview_length and len(script_content) > max_preview_length:
+                script_content = script_content[:max_preview_length]
+                is_truncated = True
+            else:
+                is_truncated = False
 
-        # Perform analysis if requested
-        if analyze_script or include_sections:
-            analysis_result = perform_script_analysis(script_data["script"], include_sections=include_sections)
+            # Add line numbers if requested, absolute to the full script
+            if include_line_numbers:
+                script_content = add_line_numbers(script_content, window[0] if window else 1)
 
-            # Convert Pydantic models to dict for JSON serialization
-            if hasattr(analysis_result, "model_dump"):
-                analysis_dict = analysis_result.model_dump()
-            else:
-                analysis_dict = analysis_result.dict()
-
-            # Add analysis to response
-            response["analysis"] = analysis_dict
-
-            # Add summary statistics
-            response["summary"] = {
-                "total_lines": analysis_result.total_lines,
-                "sections_count": len(analysis_result.sections),
-                "load_statements": analysis_result.load_statements,
-                "store_statements": analysis_result.store_statements,
-                "binary_load_count": len(analysis_result.binary_load_statements),
-                "variables_count": len(analysis_result.set_variables) + len(analysis_result.let_variables),
-                "connections_count": len(analysis_result.connections),
-                "subroutines_count": len(analysis_result.subroutines),
+            # Build response
+            response = {
+                "app_id": app_id,
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "script": script_content,
+                "script_length": original_length,
+                "is_truncated": is_truncated,
             }
 
-        # Add sections separately if requested (for easier access)
-        if include_sections and not analyze_script:
-            sections = parse_script_sections(script_data["script"])
-            response["sections"] = [section.dict() for section in sections]
-            response["sections_count"] = len(sections)
-
-        return response
+            if window is not None:
+                response["window"] = {
+                    "section": section,
+                    "start_line": window[0],
+                    "end_line": window[1],
+                    "total_lines": index.line_count,
+                }
+
+            # Add truncation info if applicable
+            if is_truncated:
+                response["truncated_at"] = max_preview_length
+                response["truncation_note"] = (
+                    f"Script truncated to {max_preview_length:,} characters "
+                    f"(original: {content_length:,} characters)"
+                )
+
+            # Perform analysis if requested
+            if analyze_script or include_sections:
+                analysis_result, cache_info = analyze_script_incrementally(
+                    script_data["script"],
+                    include_sections=include_sections,
+                )
+
+                # Convert Pydantic models to dict for JSON serialization
+                if hasattr(analysis_result, "model_dump"):
+                    analysis_dict = analysis_result.model_dump()
+                else:
+                    analysis_dict = analysis_result.dict()
+
+                # Add analysis to response
+                response["analysis"] = analysis_dict
+
+                # Add summary statistics
+                response["summary"] = {
+                    "total_lines": analysis_result.total_lines,
+                    "sections_count": len(analysis_result.sections),
+                    "load_statements": analysis_result.load_statements,
+                    "store_statements": analysis_result.store_statements,
+                    "binary_load_count": len(analysis_result.binary_load_statements),
+                    "variables_count": len(analysis_result.set_variables) + len(analysis_result.let_variables),
+                    "connections_count": len(analysis_result.connections),
+                    "subroutines_count": len(analysis_result.subroutines),
+                    "sections_from_cache": cache_info["from_cache"],
+                }
+                response["analysis_cache"] = cache_info
+
+            # Add the statement tree, limited to statements overlapping the window
+            if include_statements:
+                ast = parse_script(script_data["script"])
+                statements = ast.statements
+                if window is not None:
+                    statements = [
+                        statement for statement in statements
+                        if statement.end_line >= window[0] and statement.line <= window[1]
+                    ]
+                response["statements"] = [sanitize_statement(asdict(statement)) for statement in statements]
+                response["statement_counts"] = ast.count_by_kind()
+
+            # Lint for reload performance, using data model row counts when available
+            if analyze_performance:
+                try:
+                    table_rows = await client.get_table_row_counts()
+                except Exception as e:
+                    print(f"Table row counts unavailable: {e}")
+                    table_rows = None
+                response["performance"] = analyze_script_performance(script_data["script"], table_rows)
+
+            # Add sections separately if requested (for easier access)
+            if include_sections and not analyze_script:
+                sections = parse_script_sections(script_data["script"])
+                response["sections"] = [section.dict() for section in sections]
+                response["sections_count"] = len(sections)
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_app_script",
+            {
+                "analyze_script": analyze_script,
+                "include_sections": include_sections,
+                "include_line_numbers": include_line_numbers,
+                "max_preview_length": max_preview_length,
+                "start_line": start_line,
+                "end_line": end_line,
+                "section": section,
+                "include_statements": include_statements,
+                "analyze_performance": analyze_performance,
+            },
+            build_response,
+        )
 
     except Exception as e:
         import traceback
@@ -1120,10 +2002,11 @@ async def get_app_script(
         }
 
     finally:
-        # Always disconnect
-        client.disconnect()
+        # Return the connection to the pool for reuse
+        await pool.release(client)
 
 
+@coalesce_calls
 async def get_app_data_sources(
     app_id: str,
     include_resident: bool = True,
@@ -1132,44 +2015,247 @@ async def get_app_data_sources(
     include_inline_sources: bool = True,
 ) -> dict[str, Any]:
     """Retrieve data sources from a Qlik Sense application's lineage"""
-    from .qlik_client import QlikClient
+    from .connection_pool import get_connection_pool
 
-    client = QlikClient()
+    pool = get_connection_pool()
+    client = await pool.acquire(app_id)
 
     try:
-        # Connect to Qlik and open the specified app
-        if not client.connect(app_id):
+        # Borrow a pooled connection with the app already opened
+        if client is None:
             return {
                 "error": "Failed to connect to Qlik Engine",
                 "app_id": app_id,
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        # Get lineage data from the app
-        lineage_data = client.get_lineage(
-            include_resident=include_resident,
-            include_file_sources=include_file_sources,
-            include_binary_sources=include_binary_sources,
-            include_inline_sources=include_inline_sources,
-        )
+        async def build_response() -> dict[str, Any]:
+            # Get lineage data from the app
+            lineage_data = await client.get_lineage(
+                include_resident=include_resident,
+                include_file_sources=include_file_sources,
+                include_binary_sources=include_binary_sources,
+                include_inline_sources=include_inline_sources,
+            )
 
-        # Build response
-        response = {
-            "app_id": app_id,
-            "retrieved_at": datetime.utcnow().isoformat(),
-            "source_count": lineage_data["source_count"],
-            "data_sources": lineage_data["data_sources"],
-            "categories": lineage_data["categories"],
-            "by_category": lineage_data["by_category"],
-            "options": {
+            # Build response
+            response = {
+                "app_id": app_id,
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "source_count": lineage_data["source_count"],
+                "data_sources": lineage_data["data_sources"],
+                "categories": lineage_data["categories"],
+                "by_category": lineage_data["by_category"],
+                "options": {
+                    "include_resident": include_resident,
+                    "include_file_sources": include_file_sources,
+                    "include_binary_sources": include_binary_sources,
+                    "include_inline_sources": include_inline_sources,
+                },
+            }
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_app_data_sources",
+            {
                 "include_resident": include_resident,
                 "include_file_sources": include_file_sources,
                 "include_binary_sources": include_binary_sources,
                 "include_inline_sources": include_inline_sources,
             },
+            build_response,
+        )
+
+    except Exception as e:
+        return {
+            "error": str(e),
+            "app_id": app_id,
+            "timestamp": datetime.utcnow().isoformat(),
         }
 
-        return response
+    finally:
+        # Return the connection to the pool for reuse
+        await pool.release(client)
+
+
+@coalesce_calls
+async def get_app_snapshot(
+    app_id: str,
+    include_measures: bool = True,
+    include_dimensions: bool = True,
+    include_variables: bool = True,
+    include_fields: bool = True,
+    include_sheets: bool = True,
+    include_sheet_objects: bool = True,
+    include_script_analysis: bool = True,
+    include_lineage: bool = True,
+    use_cache: bool = True,
+) -> dict[str, Any]:
+    """Retrieve a whole-app metadata snapshot over a single connection.
+
+    All selected sections are requested concurrently on one opened app, so
+    their Engine calls are pipelined over the same WebSocket. Master items are
+    fetched once and shared by every sheet's object resolution. A failing
+    section is reported under "errors" without discarding the others.
+
+    Args:
+        app_id: The Qlik Sense application ID
+        include_measures: Whether to include master measures
+        include_dimensions: Whether to include master dimensions
+        include_variables: Whether to include variables
+        include_fields: Whether to include fields
+        include_sheets: Whether to include the sheet list
+        include_sheet_objects: Whether to include every sheet's objects
+        include_script_analysis: Whether to include the script analysis
+        include_lineage: Whether to include lineage data sources
+        use_cache: Whether to serve and store the snapshot through the metadata cache
+
+    Returns:
+        JSON object containing the selected sections and per-section timings
+
+    """
+    from .connection_pool import get_connection_pool
+
+    pool = get_connection_pool()
+    started = time.perf_counter()
+    client = await pool.acquire(app_id)
+    connect_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    try:
+        # Borrow a pooled connection with the app already opened
+        if client is None:
+            return {
+                "error": "Failed to connect to Qlik Sense",
+                "app_id": app_id,
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+
+        async def build_response() -> dict[str, Any]:
+            sections: dict[str, Any] = {}
+            timings_ms: dict[str, float] = {"connect": connect_ms}
+            errors: dict[str, str] = {}
+
+            async def run_section(name: str, coro) -> Any:
+                section_started = time.perf_counter()
+                try:
+                    result = await coro
+                    if isinstance(result, dict) and "error" in result:
+                        raise ValueError(result["error"])
+                    sections[name] = result
+                    return result
+                except Exception as e:
+                    errors[name] = str(e)
+                    return None
+                finally:
+                    timings_ms[name] = round((time.perf_counter() - section_started) * 1000, 1)
+
+            async def fetch_script_analysis() -> dict[str, Any]:
+                script_data = await client.get_script()
+                if "error" in script_data:
+                    raise ValueError(script_data["error"])
+                script = script_data["script"]
+                return await get_cpu_pool().run(analyze_script_to_dict, script, size=len(script))
+
+            async def fetch_sheet_objects(sheets: list[dict[str, Any]]) -> dict[str, Any]:
+                # Fetch master items once instead of once per sheet
+                master_measures, master_dimensions = await get_master_item_maps(client, app_id)
+                results = await asyncio.gather(
+                    *(
+                        client.get_sheet_objects(
+                            sheet_id=sheet["sheet_id"],
+                            master_measures_map=master_measures,
+                            master_dimensions_map=master_dimensions,
+                        )
+                        for sheet in sheets
+                    ),
+                    return_exceptions=True,
+                )
+
+                sheet_objects = {}
+                for sheet, result in zip(sheets, results):
+                    if isinstance(result, Exception):
+                        sheet_objects[sheet["sheet_id"]] = {"error": str(result)}
+                        errors[f"sheet_objects.{sheet['sheet_id']}"] = str(result)
+                    else:
+                        sheet_objects[sheet["sheet_id"]] = {
+                            "sheet_title": result.get("sheet_title", ""),
+                            "objects": result["objects"],
+                            "object_count": result["object_count"],
+                        }
+                return sheet_objects
+
+            async def fetch_sheets() -> None:
+                result = await run_section("sheets", client.get_sheets())
+                if not include_sheets:
+                    sections.pop("sheets", None)
+                    timings_ms.pop("sheets", None)
+                if include_sheet_objects and result is not None:
+                    await run_section("sheet_objects", fetch_sheet_objects(result["sheets"]))
+
+            tasks = []
+            if include_measures:
+                tasks.append(run_section("measures", client.get_measures()))
+            if include_dimensions:
+                tasks.append(run_section("dimensions", client.get_dimensions()))
+            if include_variables:
+                tasks.append(run_section("variables", client.get_variables()))
+            if include_fields:
+                tasks.append(run_section("fields", client.get_fields()))
+            if include_sheets or include_sheet_objects:
+                tasks.append(fetch_sheets())
+            if include_script_analysis:
+                tasks.append(run_section("script_analysis", fetch_script_analysis()))
+            if include_lineage:
+                tasks.append(run_section("lineage", client.get_lineage()))
+
+            await asyncio.gather(*tasks)
+            timings_ms["total"] = round((time.perf_counter() - started) * 1000, 1)
+
+            response = {
+                "app_id": app_id,
+                "retrieved_at": datetime.utcnow().isoformat(),
+                "sections": sections,
+                "timings_ms": timings_ms,
+                "options": {
+                    "include_measures": include_measures,
+                    "include_dimensions": include_dimensions,
+                    "include_variables": include_variables,
+                    "include_fields": include_fields,
+                    "include_sheets": include_sheets,
+                    "include_sheet_objects": include_sheet_objects,
+                    "include_script_analysis": include_script_analysis,
+                    "include_lineage": include_lineage,
+                },
+            }
+
+            # Partial snapshots carry "errors" and are not cached, so failed sections are refetched
+            if errors:
+                response["errors"] = errors
+
+            return response
+
+        # Serve from cache while the app has not been saved or reloaded
+        return await cached_tool_response(
+            client,
+            app_id,
+            "get_app_snapshot",
+            {
+                "include_measures": include_measures,
+                "include_dimensions": include_dimensions,
+                "include_variables": include_variables,
+                "include_fields": include_fields,
+                "include_sheets": include_sheets,
+                "include_sheet_objects": include_sheet_objects,
+                "include_script_analysis": include_script_analysis,
+                "include_lineage": include_lineage,
+            },
+            build_response,
+            use_cache=use_cache,
+        )
 
     except Exception as e:
         return {
@@ -1179,5 +2265,28 @@ async def get_app_data_sources(
         }
 
     finally:
-        # Always disconnect
-        client.disconnect()
+        # Return the connection to the pool for reuse
+        await pool.release(client)
+
+
+async def get_server_stats() -> dict[str, Any]:
+    """Report connection pool, response cache and call coalescing counters.
+
+    Returns:
+        JSON object with one entry per component
+
+    """
+    from .connection_pool import get_connection_pool
+    from .metadata_cache import get_metadata_cache
+    from .single_flight import get_single_flight
+
+    return {
+        "connection_pool": get_connection_pool().get_stats(),
+        "metadata_cache": get_metadata_cache().get_stats(),
+        "script_section_cache": get_section_scan_cache().get_stats(),
+        "script_index_cache": get_script_index_cache().get_stats(),
+        "cpu_pool": get_cpu_pool().get_stats(),
+        "sanitizer": get_script_sanitizer().get_stats(),
+        "coalescing": get_single_flight().get_stats(),
+        "retrieved_at": datetime.utcnow().isoformat(),
+    }
@@ -0,0 +1,197 @@
+"""Dependency graph of dollar-sign expansions between app and script variables"""
+
+import re
+from typing import Any
+
+# $(vName) and $(vName(arg1, arg2)); calculated expansions $(=...) are scanned for
+# the references nested inside them
+EXPANSION_PATTERN = re.compile(r"\$\(\s*([A-Za-z_][\w.]*)\s*(?:\(([^()]*)\))?\s*\)")
+
+PARAMETER_PATTERN = re.compile(r"\$(\d)")
+
+
+def find_variable_references(definition: str) -> list[str]:
+    """Names of the variables a definition expands, in order of first use"""
+    return list(dict.fromkeys(match.group(1) for match in EXPANSION_PATTERN.finditer(definition or "")))
+
+
+class VariableGraph:
+    """Variables and the dollar-sign expansions between them
+
+    Names are matched case-insensitively like the Engine does. Expansions are
+    memoized, so a variable used by many others is expanded once however deep
+    the nesting; references to variables on a cycle are left unexpanded.
+    """
+
+    def __init__(self, definitions: dict[str, dict[str, Any]]):
+        """Build the graph
+
+        Args:
+            definitions: Variable name to {"definition", "sources", "line"}
+
+        """
+        self.definitions = definitions
+        self._names = {name.lower(): name for name in definitions}
+        self.dependencies = {
+            name: find_variable_references(variable["definition"]) for name, variable in definitions.items()
+        }
+        self.cycles = self._find_cycles()
+        self._on_cycle = {name for cycle in self.cycles for name in cycle}
+        self._expanded: dict[str, str] = {}
+
+    def resolve(self, reference: str) -> str | None:
+        """Name of the defined variable a reference expands, if any"""
+        return self._names.get(reference.lower())
+
+    def known_dependencies(self, name: str) -> list[str]:
+        """Defined variables the variable expands"""
+        resolved = (self.resolve(reference) for reference in self.dependencies[name])
+        return [dependency for dependency in resolved if dependency is not None]
+
+    def _acyclic_dependencies(self, name: str) -> list[str]:
+        """Defined variables the variable expands, leaving out those on a cycle"""
+        return [dependency for dependency in self.known_dependencies(name) if dependency not in self._on_cycle]
+
+    def unresolved_references(self) -> dict[str, list[str]]:
+        """References to undefined variables, by referencing variable"""
+        unresolved = {}
+        for name, references in self.dependencies.items():
+            missing = [reference for reference in references if self.resolve(reference) is None]
+            if missing:
+                unresolved[name] = missing
+        return unresolved
+
+    def dependents(self) -> dict[str, list[str]]:
+        """Variables expanding each variable"""
+        dependents: dict[str, list[str]] = {name: [] for name in self.definitions}
+        for name in self.definitions:
+            for dependency in self.known_dependencies(name):
+                dependents[dependency].append(name)
+        return dependents
+
+    def topological_order(self) -> list[str]:
+        """Variables ordered so each comes after the variables it expands
+
+        Variables on a cycle have no valid position and are left out; their
+        dependents are ordered as if those references were undefined.
+        """
+        remaining = {
+            name: len(set(self._acyclic_dependencies(name))) for name in self.definitions if name not in self._on_cycle
+        }
+        dependents = self.dependents()
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in dict.fromkeys(dependents[name]):
+                if dependent in remaining:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        ready.append(dependent)
+        return order
+
+    def depths(self) -> dict[str, int]:
+        """Longest chain of expansions below each variable (0 = expands nothing)"""
+        depths: dict[str, int] = {}
+        for name in self.topological_order():
+            dependencies = self._acyclic_dependencies(name)
+            depths[name] = 1 + max((depths[dependency] for dependency in dependencies), default=-1)
+        return depths
+
+    def expand(self, name: str) -> str:
+        """Definition of the variable with every nested expansion substituted"""
+        if name in self._expanded:
+            return self._expanded[name]
+
+        def substitute(match: re.Match) -> str:
+            dependency = self.resolve(match.group(1))
+            if dependency is None or dependency in self._on_cycle:
+                return match.group(0)
+            expansion = self.expand(dependency)
+            if match.group(2) is not None:
+                arguments = [argument.strip() for argument in match.group(2).split(",")]
+                expansion = PARAMETER_PATTERN.sub(
+                    lambda parameter: (
+                        arguments[int(parameter.group(1)) - 1]
+                        if 0 < int(parameter.group(1)) <= len(arguments)
+                        else parameter.group(0)
+                    ),
+                    expansion,
+                )
+            return expansion
+
+        expanded = self.definitions[name]["definition"] or ""
+        if name not in self._on_cycle:
+            expanded = EXPANSION_PATTERN.sub(substitute, expanded)
+        self._expanded[name] = expanded
+        return expanded
+
+    def expand_all(self) -> dict[str, str]:
+        """Expansions of every variable, dependencies first so each is expanded once"""
+        for name in self.topological_order():
+            self.expand(name)
+        return {name: self.expand(name) for name in self.definitions}
+
+    def _find_cycles(self) -> list[list[str]]:
+        """Circular expansions, each listed from and back to the same variable"""
+        cycles = []
+        state: dict[str, str] = {}
+        path: list[str] = []
+
+        for start in self.definitions:
+            if start in state:
+                continue
+            # Iterative depth-first search, deep chains must not hit the recursion limit
+            stack = [(start, iter(self.known_dependencies(start)))]
+            state[start] = "active"
+            path.append(start)
+            while stack:
+                name, dependencies = stack[-1]
+                dependency = next(dependencies, None)
+                if dependency is None:
+                    stack.pop()
+                    path.pop()
+                    state[name] = "done"
+                elif state.get(dependency) == "active":
+                    cycles.append([*path[path.index(dependency):], dependency])
+                elif dependency not in state:
+                    state[dependency] = "active"
+                    path.append(dependency)
+                    stack.append((dependency, iter(self.known_dependencies(dependency))))
+        return cycles
+
+
+def build_variable_definitions(
+    app_variables: list[dict[str, Any]],
+    set_variables: list[dict[str, Any]],
+    let_variables: list[dict[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    """Merge app variables with the script's SET/LET statements
+
+    The app's definition wins when a variable is also set by the script, since
+    that is what expansions see after the reload; the script's last SET/LET of a
+    variable only fills in variables the app does not define.
+    """
+    definitions: dict[str, dict[str, Any]] = {}
+    names: dict[str, str] = {}
+
+    for variable in app_variables:
+        name = variable["name"]
+        names[name.lower()] = name
+        definitions[name] = {"definition": variable.get("definition", ""), "sources": ["app"], "line": None}
+
+    script_statements = sorted(
+        [("SET", variable) for variable in set_variables] + [("LET", variable) for variable in let_variables],
+        key=lambda item: item[1]["line"],
+    )
+    for keyword, variable in script_statements:
+        name = names.setdefault(variable["name"].lower(), variable["name"])
+        entry = definitions.setdefault(name, {"definition": variable["value"], "sources": [], "line": None})
+        if keyword not in entry["sources"]:
+            entry["sources"].append(keyword)
+        entry["line"] = variable["line"]
+        if "app" not in entry["sources"]:
+            entry["definition"] = variable["value"]
+
+    return definitions
@@ -1,6 +1,7 @@
 """Pytest configuration and shared fixtures for Qlik MCP Server tests."""
 
 import asyncio
+import json
 import os
 import sys
 from pathlib import Path
@@ -212,6 +213,116 @@ LET vLastReloadTime = Now();
     }
 
 
+class FakeEngine:
+    """Minimal in-process Engine API endpoint answering JSON-RPC requests
+
+    Handlers map a method name to a callable taking the request and returning
+    the result (or an awaitable of it). Every request received is recorded.
+    """
+
+    def __init__(self, handlers: dict[str, Any] | None = None):
+        self.handlers = {
+            "OpenDoc": lambda request: {"qReturn": {"qHandle": 1, "qType": "Doc"}},
+            "GetAppLayout": lambda request: {"qLayout": {"qTitle": "Test App"}},
+        }
+        self.handlers.update(handlers or {})
+        self.requests: list[dict[str, Any]] = []
+        self.url = ""
+        self._server = None
+        self._connections: set = set()
+
+    async def _respond(self, websocket, request: dict[str, Any]):
+        handler = self.handlers.get(request["method"])
+        if handler is None:
+            error = {"message": f"Unknown method {request['method']}"}
+            response = {"jsonrpc": "2.0", "id": request["id"], "error": error}
+        else:
+            try:
+                result = handler(request)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                response = {"jsonrpc": "2.0", "id": request["id"], "result": result}
+            except Exception as e:
+                # A raising handler answers with an Engine error
+                response = {"jsonrpc": "2.0", "id": request["id"], "error": {"message": str(e)}}
+        await websocket.send(json.dumps(response))
+
+    async def _serve(self, websocket):
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "method": "OnConnected", "params": {}}))
+        self._connections.add(websocket)
+        tasks = set()
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                self.requests.append(request)
+                task = asyncio.create_task(self._respond(websocket, request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            self._connections.discard(websocket)
+
+    async def push(self, message: dict[str, Any]):
+        """Send an unsolicited message (e.g. a change push) to every connected client"""
+        for websocket in list(self._connections):
+            await websocket.send(json.dumps({"jsonrpc": "2.0", **message}))
+
+    async def start(self):
+        from websockets.asyncio.server import serve
+
+        self._server = await serve(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def attach(self, client):
+        """Point a client at this endpoint instead of a real Qlik server"""
+        from websockets.asyncio.client import connect
+
+        async def _create_websocket(url):
+            return await connect(self.url, max_size=None)
+
+        client._create_websocket = _create_websocket
+        return client
+
+
+@pytest.fixture
+async def fake_engine():
+    """Provide a running FakeEngine for client tests without a Qlik server."""
+    engine = FakeEngine()
+    await engine.start()
+    yield engine
+    await engine.stop()
+
+
+@pytest.fixture
+def fake_engine_pool(fake_engine, monkeypatch):
+    """Route the tools' pooled connections to the FakeEngine."""
+    from src import connection_pool
+    from src.qlik_client import AsyncQlikClient
+
+    pool = connection_pool.QlikConnectionPool(max_size=2, idle_timeout=60, health_check_interval=60, enabled=False)
+    monkeypatch.setattr(connection_pool, "AsyncQlikClient", lambda: fake_engine.attach(AsyncQlikClient()))
+    monkeypatch.setattr(connection_pool, "get_connection_pool", lambda: pool)
+    return pool
+
+
+@pytest.fixture(autouse=True)
+def fresh_metadata_cache(monkeypatch):
+    """Give every test empty process-wide caches and coalescing group."""
+    from src import cpu_pool, metadata_cache, script_cache, script_parser, script_sanitizer, single_flight
+
+    monkeypatch.setattr(metadata_cache, "_cache", None)
+    monkeypatch.setattr(script_cache, "_section_cache", None)
+    monkeypatch.setattr(script_cache, "_index_cache", None)
+    monkeypatch.setattr(script_parser, "_parse_cache", script_parser.OrderedDict())
+    monkeypatch.setattr(single_flight, "_single_flight", None)
+    monkeypatch.setattr(cpu_pool, "_cpu_pool", None)
+    monkeypatch.setattr(script_sanitizer, "_sanitizer", None)
+
+
 # Markers for test categorization
 def pytest_configure(config):
     """Configure pytest with custom markers."""
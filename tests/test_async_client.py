@@ -0,0 +1,193 @@
+"""Test the asyncio Engine client against an in-process fake Engine"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.qlik_client import AsyncQlikClient, QlikClient
+
+
+def measure_list_handlers(delay: float = 0.0):
+    """Handlers serving a MeasureList with one measure, optionally slowed down"""
+
+    async def create_session_object(request):
+        await asyncio.sleep(delay)
+        return {"qReturn": {"qHandle": 2, "qType": "GenericObject"}}
+
+    async def get_layout(request):
+        await asyncio.sleep(delay)
+        return {
+            "qLayout": {
+                "qMeasureList": {
+                    "qItems": [
+                        {
+                            "qInfo": {"qId": "m1"},
+                            "qData": {
+                                "id": "m1",
+                                "title": "Total Sales",
+                                "description": "",
+                                "expression": {"qDef": "Sum(Sales)"},
+                                "label": {"qExpr": ""},
+                                "tags": ["kpi"],
+                            },
+                        },
+                    ],
+                },
+            },
+        }
+
+    return {"CreateSessionObject": create_session_object, "GetLayout": get_layout}
+
+
+@pytest.mark.unit
+async def test_async_client_get_measures(fake_engine):
+    """Measures are retrieved through awaited Engine calls"""
+    fake_engine.handlers.update(measure_list_handlers())
+    client = fake_engine.attach(AsyncQlikClient())
+
+    assert await client.connect("app-1")
+    try:
+        result = await client.get_measures()
+    finally:
+        await client.disconnect()
+
+    assert result["count"] == 1
+    assert result["measures"][0]["expression"] == "Sum(Sales)"
+    assert result["measures"][0]["tags"] == ["kpi"]
+
+
+@pytest.mark.unit
+async def test_async_clients_run_concurrently(fake_engine):
+    """Slow Engine calls on separate clients overlap instead of queueing"""
+    fake_engine.handlers.update(measure_list_handlers(delay=0.2))
+    clients = [fake_engine.attach(AsyncQlikClient()) for _ in range(3)]
+    await asyncio.gather(*(client.connect("app-1") for client in clients))
+
+    started = time.monotonic()
+    results = await asyncio.gather(*(client.get_measures() for client in clients))
+    elapsed = time.monotonic() - started
+
+    await asyncio.gather(*(client.disconnect() for client in clients))
+
+    assert all(result["count"] == 1 for result in results)
+    # Two sequential 0.2s calls per client; serialized clients would take ~1.2s
+    assert elapsed < 0.8
+
+
+@pytest.mark.unit
+async def test_engine_error_is_raised(fake_engine):
+    """Engine API errors surface as exceptions"""
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+
+    try:
+        with pytest.raises(Exception, match="Engine API Error"):
+            await client.get_script()
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.unit
+async def test_blocking_client_wraps_async_client(fake_engine):
+    """QlikClient exposes the same calls synchronously"""
+    fake_engine.handlers.update(measure_list_handlers())
+    client = QlikClient()
+    fake_engine.attach(client._client)
+
+    connected = await asyncio.to_thread(client.connect, "app-1")
+    try:
+        assert connected
+        assert client.app_id == "app-1"
+        result = await asyncio.to_thread(client.get_measures)
+    finally:
+        await asyncio.to_thread(client.disconnect)
+
+    assert result["count"] == 1
+    assert client.ws is None
+
+
+def sheet_handlers(delay: float = 0.1):
+    """Handlers serving three sheets whose layouts come back in reverse order"""
+    sheet_ids = ["s1", "s2", "missing"]
+    handles = {"s1": 11, "s2": 12}
+
+    def get_all_infos(request):
+        return {"qInfos": [{"qId": sheet_id, "qType": "sheet"} for sheet_id in sheet_ids]}
+
+    async def get_object(request):
+        await asyncio.sleep(delay)
+        handle = handles.get(request["params"][0])
+        return {"qReturn": {"qHandle": handle, "qType": "GenericObject"}} if handle else {}
+
+    async def get_layout(request):
+        # Later handles answer first so responses arrive out of order
+        await asyncio.sleep(delay * (13 - request["handle"]))
+        rank = request["handle"] - 10
+        return {"qLayout": {"rank": rank, "qMeta": {"title": f"Sheet {rank}"}}}
+
+    return {"GetAllInfos": get_all_infos, "GetObject": get_object, "GetLayout": get_layout}
+
+
+@pytest.mark.unit
+async def test_get_sheets_pipelines_object_requests(fake_engine):
+    """Sheet objects and layouts are requested in bursts and matched by id"""
+    fake_engine.handlers.update(sheet_handlers(delay=0.2))
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+
+    started = time.monotonic()
+    try:
+        result = await client.get_sheets()
+    finally:
+        await client.disconnect()
+    elapsed = time.monotonic() - started
+
+    titles = {sheet["sheet_id"]: sheet["title"] for sheet in result["sheets"]}
+    assert titles == {"s1": "Sheet 1", "s2": "Sheet 2", "missing": "missing"}
+    assert result["retrieval_method"] == "per_sheet"
+    # One GetObject burst (0.2s) plus the slowest layout (0.4s); sequential calls take ~1.2s
+    assert elapsed < 0.9
+
+
+@pytest.mark.unit
+async def test_get_sheets_uses_sheet_list(fake_engine):
+    """Sheet metadata comes from one SheetList layout when available"""
+
+    def get_layout(request):
+        return {
+            "qLayout": {
+                "qAppObjectList": {
+                    "qItems": [
+                        {
+                            "qInfo": {"qId": "s2", "qType": "sheet"},
+                            "qMeta": {"createdDate": "2024-01-01", "published": True},
+                            "qData": {"title": "Details", "description": "", "rank": 2},
+                        },
+                        {
+                            "qInfo": {"qId": "s1", "qType": "sheet"},
+                            "qMeta": {},
+                            "qData": {"title": "Overview", "description": "Start here", "rank": 1},
+                        },
+                    ],
+                },
+            },
+        }
+
+    fake_engine.handlers.update({
+        "CreateSessionObject": lambda request: {"qReturn": {"qHandle": 2, "qType": "GenericObject"}},
+        "GetLayout": get_layout,
+    })
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+
+    try:
+        result = await client.get_sheets()
+    finally:
+        await client.disconnect()
+
+    assert result["retrieval_method"] == "sheet_list"
+    assert [sheet["title"] for sheet in result["sheets"]] == ["Overview", "Details"]
+    assert result["sheets"][1]["published"] is True
+    methods = [request["method"] for request in fake_engine.requests]
+    assert "GetObject" not in methods
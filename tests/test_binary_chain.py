@@ -0,0 +1,88 @@
+"""Test recursive BINARY chain resolution against an in-process fake Engine"""
+
+import pytest
+
+from src import binary_chain
+from src.binary_chain import find_binary_cycles, find_binary_source_apps, get_binary_chain
+
+APPLICATIONS = [
+    {"app_id": "11111111-1111-1111-1111-111111111111", "name": "Dashboard"},
+    {"app_id": "22222222-2222-2222-2222-222222222222", "name": "Model"},
+    {"app_id": "33333333-3333-3333-3333-333333333333", "name": "Extract"},
+    {"app_id": "44444444-4444-4444-4444-444444444444", "name": "Twin"},
+    {"app_id": "55555555-5555-5555-5555-555555555555", "name": "Twin"},
+]
+
+SCRIPTS = {
+    "11111111-1111-1111-1111-111111111111": "BINARY [lib://Apps/Model.qvf];\nLOAD * FROM [lib://Data/extra.csv];",
+    "22222222-2222-2222-2222-222222222222": "Binary [33333333-3333-3333-3333-333333333333];",
+    "33333333-3333-3333-3333-333333333333": (
+        "BINARY [lib://Apps/Dashboard.qvf];\n"
+        "LOAD * FROM [lib://Data/raw.qvd] (qvd);"
+    ),
+}
+
+
+@pytest.fixture
+def chain_pool(fake_engine, fake_engine_pool, monkeypatch):
+    """Serve one script and lineage per app, told apart by their document handle"""
+    app_ids = list(SCRIPTS)
+
+    async def list_applications():
+        return {"applications": APPLICATIONS, "count": len(APPLICATIONS)}
+
+    def script_of(request):
+        return SCRIPTS[app_ids[request["handle"] - 1]]
+
+    fake_engine.handlers.update({
+        "OpenDoc": lambda request: {"qReturn": {"qHandle": app_ids.index(request["params"][0]) + 1}},
+        "GetScript": lambda request: {"qScript": script_of(request)},
+        "GetLineage": lambda request: {"qLineage": [
+            {"qDiscriminator": line.split("[")[1].split("]")[0], "qStatement": line}
+            for line in script_of(request).split("\n")
+            if line.startswith("LOAD")
+        ]},
+    })
+    monkeypatch.setattr(binary_chain, "list_qlik_applications", list_applications)
+    return fake_engine_pool
+
+
+@pytest.mark.unit
+def test_binary_sources_resolve_by_id_path_and_name():
+    """Sources match the app ID they contain, then the app title"""
+    assert find_binary_source_apps("lib://Apps/Model.qvf", APPLICATIONS)[0]["name"] == "Model"
+    assert find_binary_source_apps("33333333-3333-3333-3333-333333333333", APPLICATIONS)[0]["name"] == "Extract"
+    assert len(find_binary_source_apps("C:\\Apps\\twin.qvw", APPLICATIONS)) == 2
+    assert find_binary_source_apps("lib://Apps/Unknown.qvf", APPLICATIONS) == []
+    assert find_binary_cycles({"a": ["b"], "b": ["c", "a"], "c": []}, "a") == [["a", "b", "a"]]
+
+
+@pytest.mark.unit
+async def test_chain_follows_hops_and_reports_cycle(fake_engine, chain_pool):
+    """Every hop is fetched once, with its data sources, and the cycle is reported"""
+    result = await get_binary_chain("11111111-1111-1111-1111-111111111111")
+
+    assert "error" not in result
+    assert [hop["app_name"] for hop in result["chain"]] == ["Dashboard", "Model", "Extract"]
+    assert [hop["depth"] for hop in result["chain"]] == [0, 1, 2]
+    assert result["chain"][2]["binary_loads"][0]["resolved_app_name"] == "Dashboard"
+    assert result["chain"][2]["data_sources"][0]["discriminator"] == "lib://Data/raw.qvd"
+    assert result["cycles"] == [[
+        "11111111-1111-1111-1111-111111111111",
+        "22222222-2222-2222-2222-222222222222",
+        "33333333-3333-3333-3333-333333333333",
+        "11111111-1111-1111-1111-111111111111",
+    ]]
+
+    scripts_fetched = [request for request in fake_engine.requests if request["method"] == "GetScript"]
+    assert len(scripts_fetched) == 3
+
+
+@pytest.mark.unit
+async def test_chain_stops_at_max_depth(chain_pool):
+    """Hops beyond max_depth are not fetched and the chain is marked truncated"""
+    result = await get_binary_chain("11111111-1111-1111-1111-111111111111", max_depth=1, include_data_sources=False)
+
+    assert [hop["app_name"] for hop in result["chain"]] == ["Dashboard", "Model"]
+    assert result["truncated"] is True
+    assert "data_sources" not in result["chain"][0]
@@ -0,0 +1,76 @@
+"""Test fleet-wide metadata extraction"""
+
+import asyncio
+import io
+import json
+
+import pytest
+
+from src import bulk
+from src.bulk import extract_fleet, filter_applications, resolve_output_path
+
+APPLICATIONS = [
+    {"app_id": "a1", "name": "Sales Overview", "meta": {"stream": {"name": "Finance"}}},
+    {"app_id": "a2", "name": "Sales Detail", "meta": {"stream": {"name": "Operations"}}},
+    {"app_id": "a3", "name": "HR Dashboard", "meta": {}},
+]
+
+
+@pytest.mark.unit
+def test_filter_applications_by_name_and_stream():
+    """Name and stream wildcards are combined case-insensitively"""
+    assert [app["app_id"] for app in filter_applications(APPLICATIONS, name_filter="sales*")] == ["a1", "a2"]
+    assert [app["app_id"] for app in filter_applications(APPLICATIONS, stream_filter="fin*")] == ["a1"]
+    assert [app["app_id"] for app in filter_applications(APPLICATIONS, app_ids=["a3"])] == ["a3"]
+    assert len(filter_applications(APPLICATIONS, limit=2)) == 2
+
+
+@pytest.mark.unit
+async def test_extract_fleet_streams_results_and_survives_failures(monkeypatch):
+    """Every app gets a JSONL line, failures included, within the parallelism limit"""
+    running = 0
+    peak = 0
+
+    async def fake_snapshot(app_id, **options):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        if app_id == "a2":
+            raise RuntimeError("app unavailable")
+        return {"app_id": app_id, "sections": {}, "options": options}
+
+    monkeypatch.setattr(bulk, "get_app_snapshot", fake_snapshot)
+    output = io.StringIO()
+
+    summary = await extract_fleet(APPLICATIONS, output, sections=("measures",), parallelism=2)
+
+    records = {record["app_id"]: record for record in map(json.loads, output.getvalue().splitlines())}
+    assert set(records) == {"a1", "a2", "a3"}
+    assert records["a2"]["error"] == "app unavailable"
+    assert records["a1"]["options"]["include_measures"] is True
+    assert records["a1"]["options"]["include_lineage"] is False
+    assert records["a1"]["options"]["use_cache"] is False
+    assert summary["succeeded"] == 2
+    assert summary["failed"] == 1
+    assert peak == 2
+
+
+@pytest.mark.unit
+def test_output_path_stays_in_output_directory(tmp_path, monkeypatch):
+    """MCP output paths resolve under QLIK_BULK_OUTPUT_DIR and never replace files unasked"""
+    monkeypatch.setenv("QLIK_BULK_OUTPUT_DIR", str(tmp_path / "exports"))
+
+    path = resolve_output_path("runs/fleet.jsonl")
+    assert path == (tmp_path / "exports" / "runs" / "fleet.jsonl").resolve()
+    assert path.parent.is_dir()
+
+    for unsafe in (str(tmp_path / "other.jsonl"), "../other.jsonl", "runs/../../other.jsonl"):
+        with pytest.raises(ValueError):
+            resolve_output_path(unsafe)
+
+    path.write_text("{}\n")
+    with pytest.raises(ValueError, match="already exists"):
+        resolve_output_path("runs/fleet.jsonl")
+    assert resolve_output_path("runs/fleet.jsonl", overwrite=True) == path
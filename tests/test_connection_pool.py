@@ -0,0 +1,155 @@
+"""Test connection pooling of opened Qlik apps"""
+
+import asyncio
+
+import pytest
+
+from src import connection_pool
+from src.connection_pool import QlikConnectionPool
+
+
+class FakeClient:
+    """Stand-in for AsyncQlikClient that records connects and disconnects"""
+
+    instances = []
+
+    def __init__(self):
+        self.server_url = "qlik.example.com"
+        self.server_port = "4747"
+        self.user_directory = "INTERNAL"
+        self.user_id = "sa_engine"
+        self.ws = None
+        self.loop = None
+        self.app_id = None
+        self.healthy = True
+        self.connect_calls = 0
+        self.disconnect_calls = 0
+        FakeClient.instances.append(self)
+
+    async def connect(self, app_id):
+        self.connect_calls += 1
+        self.ws = object()
+        self.loop = asyncio.get_running_loop()
+        self.app_id = app_id
+        return app_id != "broken-app"
+
+    async def disconnect(self):
+        self.disconnect_calls += 1
+        self.ws = None
+
+    async def ping(self):
+        return self.healthy
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Patch the pool to build FakeClient instances"""
+    FakeClient.instances = []
+    monkeypatch.setattr(connection_pool, "AsyncQlikClient", FakeClient)
+    return FakeClient
+
+
+@pytest.mark.unit
+async def test_pool_reuses_released_connection(fake_client):
+    """A released connection is handed out again for the same app"""
+    pool = QlikConnectionPool(max_size=2, idle_timeout=60, health_check_interval=60, enabled=True)
+
+    first = await pool.acquire("app-1")
+    await pool.release(first)
+    second = await pool.acquire("app-1")
+
+    assert second is first
+    assert first.connect_calls == 1
+    assert pool.get_stats()["reused"] == 1
+
+
+@pytest.mark.unit
+async def test_pool_keys_by_app(fake_client):
+    """Different apps never share a connection"""
+    pool = QlikConnectionPool(max_size=2, idle_timeout=60, health_check_interval=60, enabled=True)
+
+    first = await pool.acquire("app-1")
+    await pool.release(first)
+    other = await pool.acquire("app-2")
+
+    assert other is not first
+    assert other.app_id == "app-2"
+
+
+@pytest.mark.unit
+async def test_pool_evicts_least_recently_used(fake_client):
+    """Idle connections beyond max_size are closed oldest first"""
+    pool = QlikConnectionPool(max_size=1, idle_timeout=60, health_check_interval=60, enabled=True)
+
+    first = await pool.acquire("app-1")
+    second = await pool.acquire("app-2")
+    await pool.release(first)
+    await pool.release(second)
+
+    assert first.disconnect_calls == 1
+    assert second.disconnect_calls == 0
+    assert pool.get_stats()["evicted"] == 1
+
+
+@pytest.mark.unit
+async def test_pool_expires_idle_connections(fake_client):
+    """Connections idle past the timeout are closed instead of reused"""
+    pool = QlikConnectionPool(max_size=2, idle_timeout=0, health_check_interval=60, enabled=True)
+
+    first = await pool.acquire("app-1")
+    await pool.release(first)
+    second = await pool.acquire("app-1")
+
+    assert second is not first
+    assert first.disconnect_calls == 1
+
+
+@pytest.mark.unit
+async def test_pool_replaces_unhealthy_connection(fake_client):
+    """A connection failing its health check is replaced"""
+    pool = QlikConnectionPool(max_size=2, idle_timeout=60, health_check_interval=0, enabled=True)
+
+    first = await pool.acquire("app-1")
+    await pool.release(first)
+    first.healthy = False
+    second = await pool.acquire("app-1")
+
+    assert second is not first
+    assert pool.get_stats()["unhealthy"] == 1
+
+
+@pytest.mark.unit
+async def test_pool_returns_none_when_connect_fails(fake_client):
+    """Failed connections are reported as None"""
+    pool = QlikConnectionPool(max_size=2, idle_timeout=60, health_check_interval=60, enabled=True)
+
+    assert await pool.acquire("broken-app") is None
+
+
+@pytest.mark.unit
+async def test_disabled_pool_closes_on_release(fake_client):
+    """With pooling disabled every release disconnects"""
+    pool = QlikConnectionPool(max_size=2, idle_timeout=60, health_check_interval=60, enabled=False)
+
+    first = await pool.acquire("app-1")
+    await pool.release(first)
+
+    assert first.disconnect_calls == 1
+    assert pool.get_stats()["idle"] == 0
+
+
+@pytest.mark.unit
+async def test_server_shutdown_closes_idle_connections(fake_client, monkeypatch):
+    """Leaving the MCP server's lifespan disconnects the pooled sessions"""
+    from src import server
+
+    pool = QlikConnectionPool(max_size=2, idle_timeout=60, health_check_interval=60, enabled=True)
+    monkeypatch.setattr(server, "get_connection_pool", lambda: pool)
+    client = await pool.acquire("app-1")
+    await pool.release(client)
+
+    async with server.lifespan(server.mcp):
+        assert client.disconnect_calls == 0
+
+    assert client.disconnect_calls == 1
+    assert pool.get_stats()["idle"] == 0
@@ -0,0 +1,82 @@
+"""Test the process pool for CPU-bound script work"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.cpu_pool import CpuPool
+from src.tools import analyze_script_to_dict, sanitize_script
+
+TAB = """///$tab Load {index}
+SET vPath{index} = 'lib://Data/';
+T{index}: LOAD Id, Name, Amount FROM [lib://Data/t{index}.qvd] (qvd);
+ODBC CONNECT TO Sales (PASSWORD=secret{index});
+"""
+
+
+def make_script(tabs: int, app: int = 0) -> str:
+    """Build a script with the given number of tabs, distinct per app"""
+    return "".join(TAB.format(index=f"{app}_{index}" if app else index) for index in range(tabs))
+
+
+@pytest.mark.unit
+async def test_small_inputs_stay_in_process():
+    """Inputs under the threshold never start worker processes"""
+    pool = CpuPool(workers=2, threshold_bytes=1024 * 1024)
+    script = make_script(3)
+
+    sanitized = await pool.run(sanitize_script, script, size=len(script))
+
+    assert "secret" not in sanitized
+    assert pool.get_stats()["in_process"] == 1
+    assert pool.get_stats()["running"] is False
+
+
+@pytest.mark.unit
+async def test_offloaded_analysis_matches_in_process():
+    """Worker processes return the same analysis as the event loop thread"""
+    pool = CpuPool(workers=1, threshold_bytes=0)
+    script = make_script(20)
+    try:
+        offloaded = await pool.run(analyze_script_to_dict, script, size=len(script))
+    finally:
+        pool.shutdown()
+
+    assert offloaded == analyze_script_to_dict(script)
+    assert pool.get_stats()["offloaded"] == 1
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+async def test_pool_throughput_across_apps():
+    """Benchmark analyzing many large scripts in-process and across all cores"""
+    scripts = [make_script(2000, app) for app in range(1, 17)]
+    megabytes = sum(len(script) for script in scripts) / 1024 / 1024
+
+    async def analyze_all(pool: CpuPool) -> tuple[list[dict], float]:
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(pool.run(analyze_script_to_dict, script, size=len(script)) for script in scripts),
+        )
+        return results, time.perf_counter() - started
+
+    in_process, in_process_seconds = await analyze_all(CpuPool(workers=0))
+
+    workers = os.cpu_count() or 1
+    pool = CpuPool(workers=workers, threshold_bytes=0)
+    try:
+        # Start the workers before timing
+        await pool.run(analyze_script_to_dict, scripts[0][:1000], size=1)
+        offloaded, pool_seconds = await analyze_all(pool)
+    finally:
+        pool.shutdown()
+
+    print(
+        f"{megabytes:.1f} MB in 16 scripts: in-process {megabytes / in_process_seconds:.1f} MB/s, "
+        f"{workers} workers {megabytes / pool_seconds:.1f} MB/s",
+    )
+    assert offloaded == in_process
+    if workers >= 4:
+        assert pool_seconds < in_process_seconds / 2
@@ -0,0 +1,176 @@
+"""Test the version-aware metadata cache"""
+
+import pytest
+
+from src.metadata_cache import DiskCache, MetadataCache
+from src.tools import get_app_measures, get_sheet_objects
+from tests.test_async_client import measure_list_handlers
+
+
+@pytest.mark.unit
+def test_cache_hit_requires_same_version():
+    """Entries are served only for the app version they were built from"""
+    cache = MetadataCache(max_entries=4, enabled=True)
+    cache.put("app-1", "get_app_measures", {"include_tags": True}, "v1", {"count": 3})
+
+    hit = cache.get("app-1", "get_app_measures", {"include_tags": True}, "v1")
+    assert hit["count"] == 3
+    assert hit["served_from_cache"] is True
+
+    assert cache.get("app-1", "get_app_measures", {"include_tags": True}, "v2") is None
+    assert cache.get("app-1", "get_app_measures", {"include_tags": True}, "v1") is None
+    assert cache.get_stats()["stale"] == 1
+
+
+@pytest.mark.unit
+def test_cache_normalizes_options_and_evicts_lru():
+    """Option order does not matter and the least recently used entry goes first"""
+    cache = MetadataCache(max_entries=2, enabled=True)
+    cache.put("app-1", "tool", {"a": 1, "b": 2}, "v1", {"n": 1})
+    cache.put("app-2", "tool", {}, "v1", {"n": 2})
+
+    assert cache.get("app-1", "tool", {"b": 2, "a": 1}, "v1")["n"] == 1
+
+    cache.put("app-3", "tool", {}, "v1", {"n": 3})
+    assert cache.get("app-2", "tool", {}, "v1") is None
+    assert cache.get("app-1", "tool", {"a": 1, "b": 2}, "v1") is not None
+    assert cache.get_stats()["evicted"] == 1
+
+
+@pytest.mark.unit
+def test_cache_skips_error_responses():
+    """Failed responses are never cached"""
+    cache = MetadataCache(max_entries=2, enabled=True)
+    cache.put("app-1", "tool", {}, "v1", {"error": "boom"})
+
+    assert cache.get("app-1", "tool", {}, "v1") is None
+
+
+@pytest.mark.unit
+async def test_tool_served_from_cache_until_reload(fake_engine, fake_engine_pool):
+    """A repeated tool call is cached until the app's reload time changes"""
+    reload_time = {"value": "2025-01-01T00:00:00Z"}
+    fake_engine.handlers.update(measure_list_handlers())
+    fake_engine.handlers["GetAppLayout"] = lambda request: {
+        "qLayout": {"qTitle": "Test App", "qLastReloadTime": reload_time["value"]},
+    }
+
+    first = await get_app_measures("app-1")
+    second = await get_app_measures("app-1")
+    reload_time["value"] = "2025-01-02T00:00:00Z"
+    third = await get_app_measures("app-1")
+
+    assert first["served_from_cache"] is False
+    assert second["served_from_cache"] is True
+    assert second["measures"] == first["measures"]
+    assert third["served_from_cache"] is False
+
+
+@pytest.mark.unit
+def test_disk_cache_survives_restart(tmp_path):
+    """A new cache instance reads responses persisted by an earlier one"""
+    first = MetadataCache(max_entries=4, enabled=True, disk_cache=DiskCache(tmp_path))
+    first.put("app-1", "get_app_script", {"analyze_script": True}, "v1", {"script": "LOAD 1;"})
+
+    restarted = MetadataCache(max_entries=4, enabled=True, disk_cache=DiskCache(tmp_path))
+    hit = restarted.get("app-1", "get_app_script", {"analyze_script": True}, "v1")
+
+    assert hit["script"] == "LOAD 1;"
+    assert hit["served_from_cache"] is True
+    assert restarted.get_stats()["disk_hits"] == 1
+    assert restarted.get("app-1", "get_app_script", {"analyze_script": True}, "v2") is None
+    assert DiskCache(tmp_path).get_stats()["entries"] == 0
+
+
+@pytest.mark.unit
+def test_disk_cache_is_separate_per_server_and_user(tmp_path):
+    """Responses persisted for one Engine user are not served to another"""
+    alice = DiskCache(tmp_path, identity="qlik.example.com:4747|CORP\\alice")
+    alice.put(("app-1", "tool", "{}"), "v1", {"data": "alice"}, "t1")
+
+    bob = DiskCache(tmp_path, identity="qlik.example.com:4747|CORP\\bob")
+    other_server = DiskCache(tmp_path, identity="qlik2.example.com:4747|CORP\\alice")
+
+    assert bob.get(("app-1", "tool", "{}"), "v1") is None
+    assert other_server.get(("app-1", "tool", "{}"), "v1") is None
+    assert DiskCache(tmp_path, identity="qlik.example.com:4747|CORP\\alice").get(
+        ("app-1", "tool", "{}"), "v1",
+    )["response"] == {"data": "alice"}
+
+
+@pytest.mark.unit
+def test_disk_cache_evicts_beyond_size_limit_and_rebuilds(tmp_path):
+    """Least recently read entries go first and rebuild empties the store"""
+    disk = DiskCache(tmp_path, max_bytes=2500, compress=False)
+    payload = {"data": "x" * 1000}
+    disk.put(("app-1", "tool", "{}"), "v1", payload, "t1")
+    disk.put(("app-2", "tool", "{}"), "v1", payload, "t2")
+    disk.get(("app-1", "tool", "{}"), "v1")
+    disk.put(("app-3", "tool", "{}"), "v1", payload, "t3")
+
+    assert disk.get(("app-2", "tool", "{}"), "v1") is None
+    assert disk.get(("app-1", "tool", "{}"), "v1") is not None
+    assert disk.get_stats()["entries"] == 2
+
+    assert DiskCache(tmp_path, rebuild=True).get_stats()["entries"] == 0
+
+
+@pytest.mark.unit
+async def test_master_items_fetched_once_across_sheets(fake_engine, fake_engine_pool):
+    """Walking several sheets of one app builds the master item maps once"""
+    list_handles = {"MeasureList": 2, "DimensionList": 3}
+    layouts = {
+        2: {"qLayout": {"qMeasureList": {"qItems": []}}},
+        3: {"qLayout": {"qDimensionList": {"qItems": []}}},
+        10: {"qLayout": {"qMeta": {"title": "Sheet"}, "qChildList": {"qItems": []}}},
+    }
+    fake_engine.handlers.update({
+        "CreateSessionObject": lambda request: {
+            "qReturn": {"qHandle": list_handles[request["params"][0]["qInfo"]["qType"]]},
+        },
+        "GetObject": lambda request: {"qReturn": {"qHandle": 10, "qType": "sheet"}},
+        "GetLayout": lambda request: layouts[request["handle"]],
+    })
+
+    for sheet_id in ("sheet-1", "sheet-2", "sheet-3"):
+        result = await get_sheet_objects("app-1", sheet_id)
+        assert result["sheet_title"] == "Sheet"
+
+    created = [request["params"][0]["qInfo"]["qType"] for request in fake_engine.requests
+               if request["method"] == "CreateSessionObject"]
+    assert created.count("MeasureList") == 1
+    assert created.count("DimensionList") == 1
+
+
+@pytest.mark.unit
+async def test_failed_master_item_fetch_is_not_cached(fake_engine, fake_engine_pool):
+    """A transient MeasureList failure is retried by the next sheet walk"""
+    list_handles = {"MeasureList": 2, "DimensionList": 3}
+    layouts = {
+        2: {"qLayout": {"qMeasureList": {"qItems": []}}},
+        3: {"qLayout": {"qDimensionList": {"qItems": []}}},
+        10: {"qLayout": {"qMeta": {"title": "Sheet"}, "qChildList": {"qItems": []}}},
+    }
+    failures = {"MeasureList": 1}
+
+    def create_session_object(request):
+        list_type = request["params"][0]["qInfo"]["qType"]
+        if failures.get(list_type):
+            failures[list_type] -= 1
+            raise RuntimeError("Engine busy")
+        return {"qReturn": {"qHandle": list_handles[list_type]}}
+
+    fake_engine.handlers.update({
+        "CreateSessionObject": create_session_object,
+        "GetObject": lambda request: {"qReturn": {"qHandle": 10, "qType": "sheet"}},
+        "GetLayout": lambda request: layouts[request["handle"]],
+    })
+
+    for sheet_id in ("sheet-1", "sheet-2", "sheet-3"):
+        result = await get_sheet_objects("app-1", sheet_id)
+        assert result["sheet_title"] == "Sheet"
+
+    created = [request["params"][0]["qInfo"]["qType"] for request in fake_engine.requests
+               if request["method"] == "CreateSessionObject"]
+    assert created.count("MeasureList") == 2
+    assert created.count("DimensionList") == 2
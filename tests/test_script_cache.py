@@ -0,0 +1,117 @@
+"""Test incremental script analysis cached per ///$tab section"""
+
+import pytest
+
+from src.script_cache import SectionScanCache, split_script_sections
+from src.script_lexer import scan_script
+from src.tools import analyze_script_incrementally, get_app_script, perform_script_analysis
+
+
+def make_script(tabs: int) -> str:
+    """Build a script with one LOAD, SET and SUB per tab"""
+    parts = ["// preamble"]
+    for index in range(tabs):
+        parts.append(
+            f"///$tab Tab{index}\n"
+            f"SET v{index} = {index};\n"
+            f"SUB Sub{index}\nEND SUB\n"
+            f"T{index}: LOAD * FROM lib://Data/t{index}.qvd (qvd);\n",
+        )
+    return "\n".join(parts)
+
+
+@pytest.mark.unit
+def test_split_sections_round_trips():
+    """Chunks start at marker lines and rejoin to the original script"""
+    script = make_script(3)
+    chunks = split_script_sections(script)
+
+    assert [start for start, _ in chunks] == [1, 2, 8, 14]
+    assert "\n".join(text for _, text in chunks) == script
+
+
+@pytest.mark.unit
+def test_merged_scan_matches_whole_script_scan():
+    """Per-section scans merge into the same result as one full scan"""
+    script = make_script(5)
+    merged, info = SectionScanCache().scan(script)
+
+    assert merged == scan_script(script)
+    assert info == {"sections": 6, "from_cache": 0}
+
+
+@pytest.mark.unit
+def test_only_edited_section_is_rescanned():
+    """After a one-tab edit every other tab comes from cache"""
+    cache = SectionScanCache()
+    script = make_script(40)
+    cache.scan(script)
+
+    edited = script.replace("SET v30 = 30;", "SET v30 = 31;\nLOAD 1 AS x AUTOGENERATE 1;")
+    scan, info = cache.scan(edited)
+
+    assert info == {"sections": 41, "from_cache": 40}
+    assert scan == scan_script(edited)
+    assert scan.set_variables[30]["value"] == "31"
+
+
+@pytest.mark.unit
+def test_analysis_reports_sections_from_cache():
+    """The analysis helper reports cache use and keeps the public result unchanged"""
+    script = make_script(3)
+
+    first, first_info = analyze_script_incrementally(script, include_sections=True)
+    second, second_info = analyze_script_incrementally(script, include_sections=True)
+
+    assert first_info["from_cache"] == 0
+    assert second_info == {"sections": 4, "from_cache": 4}
+    assert first == second == perform_script_analysis(script, include_sections=True)
+
+
+@pytest.fixture
+def script_pool(fake_engine, fake_engine_pool):
+    """Serve a three-tab script from the fake Engine"""
+    fake_engine.handlers["GetScript"] = lambda request: {"qScript": make_script(3)}
+    return fake_engine_pool
+
+
+@pytest.mark.unit
+async def test_script_window_by_lines_keeps_absolute_numbers(fake_engine, script_pool):
+    """A line range is sliced with line numbers of the full script"""
+    result = await get_app_script("app-1", start_line=9, end_line=10, include_line_numbers=True)
+
+    assert result["script"] == " 9: SET v1 = 1;\n10: SUB Sub1"
+    assert result["window"] == {"section": None, "start_line": 9, "end_line": 10, "total_lines": 19}
+
+
+@pytest.mark.unit
+async def test_script_window_by_section_downloads_script_once(fake_engine, script_pool):
+    """Sections and ranges of one app version reuse the cached script index"""
+    tab = await get_app_script("app-1", section="Tab2")
+    lines = await get_app_script("app-1", start_line=1, end_line=2)
+    missing = await get_app_script("app-1", section="Nope")
+
+    assert tab["script"].splitlines()[0] == "SET v2 = 2;"
+    assert (tab["window"]["start_line"], tab["window"]["end_line"]) == (15, 19)
+    assert lines["script"] == "// preamble\n///$tab Tab0"
+    assert missing["available_sections"] == ["Tab0", "Tab1", "Tab2"]
+    assert [request["method"] for request in fake_engine.requests].count("GetScript") == 1
+
+
+@pytest.mark.unit
+async def test_statement_tree_masks_connection_credentials(fake_engine, fake_engine_pool):
+    """CONNECT text and targets in the statement tree never carry passwords"""
+    fake_engine.handlers["GetScript"] = lambda request: {
+        "qScript": (
+            "SUB Connect\n"
+            "  OLEDB CONNECT TO [Provider=SQLOLEDB;User ID=sa;Password=hunter2];\n"
+            "END SUB\n"
+            "ODBC CONNECT TO [Sales;PWD=hunter2];"
+        ),
+    }
+
+    result = await get_app_script("app-1", include_statements=True)
+
+    assert "hunter2" not in str(result["statements"])
+    assert [statement["kind"] for statement in result["statements"]] == ["SUB", "CONNECT"]
+    assert result["statements"][0]["body"][0]["kind"] == "CONNECT"
@@ -0,0 +1,119 @@
+"""Test the single-pass script lexer and analysis"""
+
+import pytest
+
+from src.script_lexer import LineIndex, scan_script, tokenize
+from src.tools import parse_script_sections, perform_script_analysis
+
+SCRIPT = """///$tab Main
+SET ThousandSep=';';
+LET vToday = Date(Today()); // LOAD in a comment
+/* STORE and DROP
+   inside a block comment */
+REM LOAD this whole statement;
+LIB CONNECT TO 'Sales DB';
+$(Must_Include=lib://Scripts/common.qvs);
+
+///$tab Load
+SUB Utils.Log(msg)
+  TRACE $(msg);
+END SUB
+BINARY [lib://DataFiles/BaseApp.qvf];
+Facts: LOAD 'LOAD' as Keyword, [Drop Date] FROM lib://Data/facts.qvd (qvd);
+STORE Facts INTO [lib://Data/out.qvd] (qvd);
+DROP TABLE Facts;
+"""
+
+
+@pytest.mark.unit
+def test_tokenize_keeps_comments_strings_and_brackets_whole():
+    """Comments, strings and bracketed names are single tokens"""
+    tokens = list(tokenize("LOAD [a;b], 'x//y' // note\n/* c\nd */\nREM skip;"))
+
+    assert [(token.kind, token.text) for token in tokens] == [
+        ("word", "LOAD"),
+        ("bracket", "[a;b]"),
+        ("symbol", ","),
+        ("string", "'x//y'"),
+        ("comment", "// note"),
+        ("comment", "/* c\nd */"),
+        ("comment", "REM skip;"),
+    ]
+    assert tokens[-1].line == 4
+
+
+@pytest.mark.unit
+def test_scan_ignores_keywords_in_comments_and_strings():
+    """Only code keywords are counted"""
+    scan = scan_script(SCRIPT)
+
+    assert scan.load_statements == 1
+    assert scan.store_statements == 1
+    assert scan.drop_statements == 1
+
+
+@pytest.mark.unit
+def test_scan_extracts_declarations():
+    """Variables, connections, includes, subroutines and binaries in one pass"""
+    scan = scan_script(SCRIPT)
+
+    assert scan.set_variables == [{"name": "ThousandSep", "value": "';'", "line": 2}]
+    assert scan.let_variables == [{"name": "vToday", "value": "Date(Today())", "line": 3}]
+    assert scan.connections == ["Sales DB"]
+    assert scan.includes == ["lib://Scripts/common.qvs"]
+    assert scan.subroutines == ["Utils.Log"]
+    assert scan.binary_loads[0]["source_app"] == "lib://DataFiles/BaseApp.qvf"
+    assert scan.binary_loads[0]["line_number"] == 14
+
+
+@pytest.mark.unit
+def test_scan_counts_lines():
+    """Comment-only lines include block comment and REM lines"""
+    scan = scan_script(SCRIPT)
+
+    assert scan.total_lines == 18
+    assert scan.empty_lines == 2
+    assert scan.comment_lines == 5
+
+
+@pytest.mark.unit
+def test_analysis_sections_match_section_parser():
+    """Sections built from lexer markers equal the standalone parser"""
+    analysis = perform_script_analysis(SCRIPT, include_sections=True)
+
+    assert [section.name for section in analysis.sections] == ["Main", "Load"]
+    assert analysis.sections == parse_script_sections(SCRIPT)
+
+
+@pytest.mark.unit
+def test_line_index_maps_offsets_to_lines():
+    """Offsets resolve to 1-based lines, including line boundaries"""
+    index = LineIndex("ab\ncd\n\nef")
+
+    assert index.line_count == 4
+    assert [index.line_of(offset) for offset in (0, 2, 3, 6, 7, 9)] == [1, 1, 2, 3, 4, 4]
+    assert (index.line_start(2), index.line_end(2)) == (3, 5)
+    assert index.line_end(4) == 9
+
+
+@pytest.mark.unit
+def test_every_extracted_item_carries_its_line():
+    """Connections, includes and subroutines report where they are declared"""
+    scan = scan_script(SCRIPT)
+
+    assert scan.connection_statements == [{"target": "Sales DB", "line": 7}]
+    assert scan.include_statements == [{"path": "lib://Scripts/common.qvs", "line": 8}]
+    assert scan.subroutine_definitions == [{"name": "Utils.Log", "line": 11}]
+
+
+@pytest.mark.unit
+def test_analysis_masks_credentials_in_connections():
+    """Passwords in ODBC/OLEDB connection strings never reach the analysis"""
+    analysis = perform_script_analysis(
+        "OLEDB CONNECT TO [Provider=SQLOLEDB;User ID=sa;Password=hunter2];\nLIB CONNECT TO 'Sales DB';",
+    )
+
+    assert not any("hunter2" in connection for connection in analysis.connections)
+    assert not any("hunter2" in statement["target"] for statement in analysis.connection_statements)
+    assert analysis.connections[1] == "Sales DB"
+    assert [statement["line"] for statement in analysis.connection_statements] == [1, 2]
@@ -0,0 +1,79 @@
+"""Test the reload performance linter"""
+
+import pytest
+
+from src.script_linter import lint_script_performance
+from src.script_parser import parse_script
+from src.tools import analyze_script_performance
+
+SCRIPT = """///$tab Extract
+Facts:
+LOAD Id, Amount, Date(OrderDate) as OrderDate
+FROM [lib://Data/facts.qvd] (qvd)
+WHERE Year(OrderDate) > 2020;
+Customers:
+LOAD Id as CustomerId, ApplyMap('CountryMap', Code) as Country FROM lib://Data/customers.qvd (qvd);
+Products:
+LOAD ProductId, [Product Name] as Product FROM lib://Data/products.qvd (qvd) WHERE Exists(ProductId);
+///$tab Transform
+TmpOrders:
+LOAD * FROM lib://Data/orders.csv (txt);
+LEFT JOIN (Facts) LOAD * RESIDENT TmpOrders;
+Summary:
+LOAD Id, Sum(Amount) as Total RESIDENT Facts GROUP BY Id;
+// DROP TABLE TmpOrders;
+"""
+
+
+@pytest.mark.unit
+def test_flags_non_optimized_qvd_loads_only():
+    """WHERE expressions, computed fields and ApplyMap break the optimized load"""
+    findings = lint_script_performance(parse_script(SCRIPT))
+    qvd = [finding for finding in findings if finding["rule"] == "non_optimized_qvd_load"]
+
+    assert [(finding["table"], finding["line"], finding["section"]) for finding in qvd] == [
+        ("Facts", 2, "Extract"),
+        ("Customers", 6, "Extract"),
+    ]
+    assert "WHERE clause" in qvd[0]["message"] and "computed field: Date(OrderDate)" in qvd[0]["message"]
+    assert "ApplyMap in field list" in qvd[1]["message"]
+
+
+@pytest.mark.unit
+def test_flags_joins_residents_and_undropped_temp_tables():
+    """Every rule reports its line and section"""
+    findings = lint_script_performance(parse_script(SCRIPT), table_rows={"Facts": 5_000_000})
+    by_rule = {(finding["rule"], finding["line"]): finding for finding in findings}
+
+    assert by_rule[("join_without_key_pruning", 13)]["severity"] == "warning"
+    assert by_rule[("resident_large_table", 14)]["table"] == "Facts"
+    assert by_rule[("resident_large_table", 14)]["section"] == "Transform"
+    assert by_rule[("missing_drop_temp_table", 11)]["table"] == "TmpOrders"
+    assert by_rule[("missing_drop_temp_table", 2)]["severity"] == "info"
+
+
+@pytest.mark.unit
+def test_performance_summary():
+    """The tool summary counts QVD loads and findings by rule"""
+    result = analyze_script_performance(SCRIPT.replace("// DROP", "DROP"), table_rows={"Facts": 10})
+
+    assert result["qvd_loads"] == 3
+    assert result["optimized_qvd_loads"] == 1
+    # Facts is small; the dropped TmpOrders has no row count and came from a file
+    assert [finding["table"] for finding in result["findings"] if finding["rule"] == "resident_large_table"] == [
+        "TmpOrders",
+    ]
+    assert result["by_rule"]["missing_drop_temp_table"] == 1
+
+
+@pytest.mark.unit
+def test_performance_summary_counts_loads_sharing_a_line():
+    """Non-optimized QVD loads on one line are each subtracted from the optimized count"""
+    script = (
+        "A: LOAD * FROM a.qvd (qvd) WHERE x > 1; B: LOAD * FROM b.qvd (qvd) WHERE y > 1;\n"
+        "C: LOAD * FROM c.qvd (qvd) WHERE z > 1;"
+    )
+    result = analyze_script_performance(script)
+
+    assert result["qvd_loads"] == 3
+    assert result["optimized_qvd_loads"] == 0
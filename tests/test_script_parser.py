@@ -0,0 +1,99 @@
+"""Test the statement-level load script parser"""
+
+import time
+
+import pytest
+
+from src.script_parser import parse_script
+
+SCRIPT = """SET ThousandSep=',';
+///$tab Load
+Map: MAPPING LOAD Code, Name FROM [lib://Data/map.qvd] (qvd);
+Facts:
+NoConcatenate
+LOAD Id, ApplyMap('Map', Code) as Country, [Load Date]
+FROM lib://Data/facts.qvd (qvd)
+WHERE Exists(Id);
+LEFT JOIN (Facts) LOAD Id, Amount RESIDENT Tmp;
+SQL SELECT * FROM dbo.Orders;
+STORE Facts INTO [lib://Data/out.qvd] (qvd);
+DROP TABLES Tmp, [Map X];
+///$tab Control
+IF vMode = 1 THEN
+  LOAD 1 as One AUTOGENERATE 1;
+ELSE
+  TRACE other;
+END IF
+FOR i = 1 TO 3
+  CALL Log('step', i);
+NEXT i
+SUB Log(msg, n)
+  TRACE $(msg);
+END SUB
+"""
+
+
+@pytest.mark.unit
+def test_parse_load_sources_fields_and_prefixes():
+    """LOAD statements carry label, prefixes, fields, source and clauses"""
+    statements = parse_script(SCRIPT).statements
+
+    mapping, facts, join = statements[1:4]
+    assert (mapping.label, mapping.prefixes) == ("Map", [{"keyword": "MAPPING", "argument": None}])
+    assert facts.attributes["source"] == {"type": "FROM", "target": "lib://Data/facts.qvd", "format": "qvd"}
+    assert facts.attributes["fields"][1] == {"expression": "ApplyMap('Map', Code)", "alias": "Country"}
+    assert facts.attributes["where"] == "Exists(Id)"
+    assert (facts.line, facts.end_line, facts.section) == (4, 8, "Load")
+    assert join.prefixes == [{"keyword": "LEFT JOIN", "argument": "Facts"}]
+    assert join.attributes["source"] == {"type": "RESIDENT", "target": "Tmp"}
+
+
+@pytest.mark.unit
+def test_parse_other_statement_kinds():
+    """SELECT, STORE, DROP and SET are parsed into their parts"""
+    statements = parse_script(SCRIPT).statements
+
+    assert statements[0].attributes == {"name": "ThousandSep", "value": "','"}
+    assert statements[4].attributes["source"] == {"type": "SQL", "target": "dbo.Orders"}
+    assert statements[5].attributes["table"] == "Facts"
+    assert statements[5].attributes["target"]["target"] == "lib://Data/out.qvd"
+    assert statements[6].attributes == {"target": "TABLE", "names": ["Tmp", "Map X"]}
+
+
+@pytest.mark.unit
+def test_parse_nests_control_flow_blocks():
+    """IF/ELSE, FOR/NEXT and SUB/END SUB hold their statements"""
+    ast = parse_script(SCRIPT)
+    if_block, for_block, sub_block = ast.statements[7:]
+
+    assert if_block.attributes["condition"] == "vMode = 1"
+    assert [statement.kind for statement in if_block.body] == ["LOAD"]
+    assert [branch.kind for branch in if_block.branches] == ["ELSE"]
+    assert (if_block.line, if_block.end_line) == (14, 18)
+    assert for_block.attributes == {"variable": "i", "from": "1", "to": "3", "step": None}
+    assert for_block.body[0].attributes == {"name": "Log", "arguments": ["'step'", "i"]}
+    assert sub_block.attributes == {"name": "Log", "parameters": ["msg", "n"]}
+    assert ast.count_by_kind()["LOAD"] == 4
+
+
+@pytest.mark.unit
+def test_parse_is_memoized_per_script():
+    """The same script text returns the same tree without parsing again"""
+    assert parse_script(SCRIPT) is parse_script(SCRIPT)
+    assert parse_script(SCRIPT) is not parse_script(SCRIPT + "\n")
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+def test_parse_throughput_on_multi_megabyte_script():
+    """Benchmark parsing a script of several megabytes"""
+    script = SCRIPT * 6000
+    started = time.perf_counter()
+    ast = parse_script(script)
+    elapsed = time.perf_counter() - started
+
+    megabytes = len(script) / 1024 / 1024
+    print(f"Parsed {megabytes:.1f} MB ({ast.total_lines:,} lines) in {elapsed:.2f}s: {megabytes / elapsed:.1f} MB/s")
+    assert ast.count_by_kind()["LOAD"] == 4 * 6000
+    assert megabytes > 3
+    assert megabytes / elapsed > 0.25
@@ -0,0 +1,45 @@
+"""Test the single-pass script sanitizer"""
+
+import pytest
+
+from src.script_sanitizer import ScriptSanitizer, SanitizerRule
+from src.tools import sanitize_script
+
+SCRIPT = """LIB CONNECT TO 'Sales';
+ODBC CONNECT TO [DSN=Sales;UID=report;Pwd=s3cr3t;] (XUserId is abc);
+OLEDB CONNECT TO [Provider=SQLOLEDB;User ID=sa;Password="p w";Data Source=db];
+LET vClientSecret = 'abc123';
+SET vAuth = 'Bearer eyJhbGciOi';
+REST CONNECT TO (api_key=k-123, access_token=t-456);
+"""
+
+
+@pytest.mark.unit
+def test_masks_all_default_credentials():
+    """Passwords, user IDs, secrets, tokens, keys and bearer values are masked"""
+    sanitized = sanitize_script(SCRIPT)
+
+    for secret in ("report", "s3cr3t", "sa;", "p w", "abc123", "eyJhbGciOi", "k-123", "t-456"):
+        assert secret not in sanitized
+    assert "ODBC CONNECT TO [DSN=Sales;UID=[MASKED];Pwd=[MASKED];]" in sanitized
+    assert "LET vClientSecret = [MASKED];" in sanitized
+    assert sanitized.count("\n") == SCRIPT.count("\n")
+    assert "LIB CONNECT TO 'Sales';" in sanitized
+
+
+@pytest.mark.unit
+def test_custom_rules_and_stats():
+    """Rules are configurable and masked values are counted per rule"""
+    sanitizer = ScriptSanitizer([SanitizerRule("pin", ("PIN CODE",))])
+
+    assert sanitizer.sanitize("Pin  Code=1234; Pwd=x") == "Pin  Code=[MASKED]; Pwd=x"
+    assert sanitizer.get_stats()["masked"] == {"pin": 1}
+
+
+@pytest.mark.unit
+def test_chunked_sanitizing_matches_whole_text():
+    """Credentials split across chunk boundaries are still masked"""
+    sanitizer = ScriptSanitizer()
+    chunks = [SCRIPT[start:start + 7] for start in range(0, len(SCRIPT), 7)]
+
+    assert "".join(sanitizer.sanitize_chunks(chunks)) == sanitizer.sanitize(SCRIPT)
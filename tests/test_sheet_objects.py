@@ -0,0 +1,435 @@
+"""Test sheet object and container traversal against an in-process fake Engine"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.qlik_client import AsyncQlikClient
+
+
+def chart(object_id: str, measure: str) -> dict:
+    """A bar chart with one measure"""
+    return {
+        "type": "barchart",
+        "layout": {
+            "qInfo": {"qId": object_id, "qType": "barchart"},
+            "title": object_id.title(),
+            "qHyperCubeDef": {"qMeasures": [{"qDef": {"qLabel": measure, "qDef": f"Sum({measure})"}}]},
+        },
+    }
+
+
+def container(object_id: str, object_type: str, props: dict) -> dict:
+    """A container with the given effective properties"""
+    return {
+        "type": object_type,
+        "layout": {"qInfo": {"qId": object_id, "qType": object_type}, "title": object_id.title()},
+        "props": props,
+    }
+
+
+def sheet_objects() -> dict[str, dict]:
+    """A sheet with a chart, a VizlibContainer and a tabbed container sharing one chart"""
+    objects = {
+        "kpi": chart("kpi", "Sales"),
+        "vizlib": container("vizlib", "VizlibContainer", {"qProp": {"containerObjects": [
+            {"label": "Trend", "cId": "t1", "gridView": {"masterItems": [
+                {"masterItemId": "trend", "label": "Cell A"},
+                {"masterItemId": "shared", "label": "Cell B"},
+            ]}},
+        ]}}),
+        "tabs": container("tabs", "container", {"tabs": [
+            {
+                "label": "One",
+                "id": "tab1",
+                "objects": [{"id": "shared", "type": "barchart"}, {"id": "gone", "type": "table"}],
+            },
+            {"label": "Two", "id": "tab2", "objectId": "margin"},
+        ]}),
+        "trend": chart("trend", "Orders"),
+        "shared": chart("shared", "Cost"),
+        "margin": chart("margin", "Margin"),
+    }
+    objects["sheet"] = {
+        "type": "sheet",
+        "layout": {
+            "qInfo": {"qId": "sheet", "qType": "sheet"},
+            "qMeta": {"title": "Overview"},
+            "qChildList": {"qItems": [
+                {"qInfo": {"qId": object_id, "qType": objects[object_id]["type"]}, "qData": {"col": index}}
+                for index, object_id in enumerate(["kpi", "vizlib", "tabs"])
+            ]},
+        },
+    }
+    return objects
+
+
+def sheet_handlers(objects: dict[str, dict], delay: float = 0.0) -> dict:
+    """Handlers serving the objects by handle, each call taking delay seconds"""
+    ids = list(objects)
+
+    async def respond(result):
+        await asyncio.sleep(delay)
+        return result
+
+    def get_object(request):
+        object_id = request["params"][0]
+        if object_id not in objects:
+            return respond({})
+        return respond({"qReturn": {"qHandle": 10 + ids.index(object_id), "qType": "GenericObject"}})
+
+    def entry(request) -> dict:
+        return objects[ids[request["handle"] - 10]]
+
+    def property_entry(object_id: str) -> dict:
+        obj = objects[object_id]
+        props = obj.get("props", {})
+        properties = obj.get("properties", {
+            **obj["layout"], **{key: value for key, value in props.items() if key != "qProp"}, **props.get("qProp", {}),
+        })
+        return {"qProperty": properties, "qChildren": [property_entry(child) for child in obj.get("children", [])]}
+
+    def full_property_tree(request):
+        sheet = objects[ids[request["handle"] - 10]]
+        children = [item["qInfo"]["qId"] for item in sheet["layout"]["qChildList"]["qItems"]]
+        properties = {
+            "qInfo": sheet["layout"]["qInfo"],
+            "qMetaDef": sheet["layout"]["qMeta"],
+            "cells": [{"name": child, "col": index} for index, child in enumerate(children)],
+        }
+        return respond({"qPropEntry": {"qProperty": properties, "qChildren": [
+            property_entry(child) for child in children
+        ]}})
+
+    return {
+        "GetObject": get_object,
+        "GetLayout": lambda request: respond({"qLayout": entry(request)["layout"]}),
+        "GetEffectiveProperties": lambda request: respond(entry(request).get("props", {})),
+        "GetChildInfos": lambda request: respond({"qInfos": [
+            {"qId": child} for child in entry(request).get("children", [])
+        ]}),
+        "GetFullPropertyTree": full_property_tree,
+    }
+
+
+async def fetch_sheet(fake_engine, objects: dict[str, dict], delay: float = 0.0, **options) -> dict:
+    """Fetch the sheet's objects on a new client"""
+    fake_engine.handlers.update(sheet_handlers(objects, delay))
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+    try:
+        return await client.get_sheet_objects("sheet", resolve_master_items=False, **options)
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.unit
+async def test_containers_are_expanded_with_tabs_in_order(fake_engine):
+    """Embedded objects keep their container, tab and cell in reported order"""
+    result = await fetch_sheet(fake_engine, sheet_objects())
+
+    assert result["sheet_title"] == "Overview"
+    assert [obj["object_id"] for obj in result["objects"]] == ["kpi", "vizlib", "tabs"]
+
+    vizlib = result["objects"][1]
+    assert vizlib["is_container"] is True
+    assert [(obj["object_id"], obj["container_tab"], obj["cell_label"]) for obj in vizlib["embedded_objects"]] == [
+        ("trend", "Trend", "Cell A"),
+        ("shared", "Trend", "Cell B"),
+    ]
+    assert vizlib["container_structure"]["tabs"][0]["master_items"] == ["trend", "shared"]
+
+    tabs = result["objects"][2]["embedded_objects"]
+    assert [(obj["object_id"], obj["container_tab_id"]) for obj in tabs] == [
+        ("shared", "tab1"), ("gone", "tab1"), ("margin", "tab2"),
+    ]
+    assert tabs[0]["measures"] == [{"label": "Cost", "expression": "Sum(Cost)"}]
+    assert tabs[1] == {
+        "object_id": "gone",
+        "object_type": "table",
+        "parent_container": "tabs",
+        "is_embedded": True,
+        "container_tab": "One",
+        "container_tab_id": "tab1",
+    }
+
+
+@pytest.mark.unit
+async def test_container_levels_are_pipelined(fake_engine):
+    """Round trips grow with the nesting depth, not with the number of objects"""
+    started = time.monotonic()
+    result = await fetch_sheet(fake_engine, sheet_objects(), delay=0.1)
+    elapsed = time.monotonic() - started
+
+    assert result["object_count"] == 3
+    # Sheet (2), children (2), container properties (1), embedded objects (2);
+    # one request at a time takes 19 round trips
+    assert elapsed < 1.2
+
+    opened = [request["params"][0] for request in fake_engine.requests if request["method"] == "GetObject"]
+    assert opened.count("shared") == 1
+
+
+def native_container_sheet() -> dict[str, dict]:
+    """The sample sheet with its tabbed container replaced by a native container
+
+    The container's children are part of the property tree; the margin chart
+    has an expression title that only its layout evaluates.
+    """
+    objects = sheet_objects()
+    objects["tabs"] = {
+        **container("tabs", "container", {}),
+        "props": {"qProp": {"qInfo": {"qId": "tabs", "qType": "container"}, "children": []}},
+        "children": ["shared", "margin"],
+    }
+    objects["margin"]["properties"] = {
+        **objects["margin"]["layout"],
+        "title": {"qStringExpression": {"qExpr": "='Margin'"}},
+    }
+    return objects
+
+
+@pytest.mark.unit
+async def test_property_tree_matches_layout_walk(fake_engine):
+    """The property tree gives the same objects with fewer round trips"""
+    from_layouts = await fetch_sheet(fake_engine, native_container_sheet())
+    fake_engine.requests.clear()
+    from_tree = await fetch_sheet(fake_engine, native_container_sheet(), use_property_tree=True)
+
+    assert from_tree["objects"] == from_layouts["objects"]
+    assert from_tree["sheet_title"] == "Overview"
+    assert [obj["object_id"] for obj in from_tree["objects"][2]["embedded_objects"]] == ["shared", "margin"]
+
+    stats = from_tree["property_tree"]
+    assert stats["layout_fallbacks"] == ["trend", "margin"]
+    assert stats["round_trips"] == 4
+    assert stats["round_trips_saved"] == 3
+    methods = [request["method"] for request in fake_engine.requests]
+    assert "GetEffectiveProperties" not in methods
+    assert methods.count("GetLayout") == 2
+
+
+@pytest.mark.unit
+async def test_property_tree_falls_back_to_layouts(fake_engine):
+    """Without GetFullPropertyTree the sheet is walked through layouts"""
+    objects = sheet_objects()
+    fake_engine.handlers.update(sheet_handlers(objects))
+    del fake_engine.handlers["GetFullPropertyTree"]
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+    try:
+        result = await client.get_sheet_objects("sheet", resolve_master_items=False, use_property_tree=True)
+    finally:
+        await client.disconnect()
+
+    assert "property_tree" not in result
+    assert [obj["object_id"] for obj in result["objects"]] == ["kpi", "vizlib", "tabs"]
+
+
+@pytest.mark.unit
+async def test_repeated_traversal_is_served_from_object_cache(fake_engine):
+    """A second walk of an unchanged sheet on the same session sends nothing"""
+    fake_engine.handlers.update(sheet_handlers(sheet_objects()))
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+    try:
+        first = await client.get_sheet_objects("sheet", resolve_master_items=False)
+        sent = len(fake_engine.requests)
+        second = await client.get_sheet_objects("sheet", resolve_master_items=False)
+        stats = client.object_cache.get_stats()
+    finally:
+        await client.disconnect()
+
+    assert second == first
+    # Only the object that failed to open is tried again
+    assert [(request["method"], request["params"]) for request in fake_engine.requests[sent:]] == [
+        ("GetObject", ["gone"]),
+    ]
+    assert stats["handles"] == 7
+    # Sheet, three children, two containers (properties and child infos), three embedded objects
+    assert stats["result_hits"] == 11
+    assert client.object_cache.get_stats()["handles"] == 0
+
+
+@pytest.mark.unit
+async def test_change_push_invalidates_cached_layouts(fake_engine):
+    """Layouts of handles in a change push are fetched again, their handles are kept"""
+    objects = sheet_objects()
+    fake_engine.handlers.update(sheet_handlers(objects))
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+    try:
+        await client.get_sheet_objects("sheet", resolve_master_items=False)
+        fake_engine.requests.clear()
+
+        kpi_handle = 10 + list(objects).index("kpi")
+        objects["kpi"]["layout"]["title"] = "Renamed"
+        await fake_engine.push({"change": [kpi_handle]})
+        await asyncio.sleep(0.05)
+
+        result = await client.get_sheet_objects("sheet", resolve_master_items=False)
+    finally:
+        await client.disconnect()
+
+    assert result["objects"][0]["title"] == "Renamed"
+    sent = [(request["method"], request["handle"]) for request in fake_engine.requests]
+    assert sorted(sent) == [("GetLayout", kpi_handle), ("GetObject", 1)]
+
+
+@pytest.mark.unit
+async def test_close_push_reopens_object(fake_engine):
+    """A closed handle is opened again the next time the object is needed"""
+    objects = sheet_objects()
+    fake_engine.handlers.update(sheet_handlers(objects))
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+    try:
+        await client.get_sheet_objects("sheet", resolve_master_items=False)
+        fake_engine.requests.clear()
+
+        await fake_engine.push({"close": [10 + list(objects).index("margin")]})
+        await asyncio.sleep(0.05)
+
+        await client.get_sheet_objects("sheet", resolve_master_items=False)
+    finally:
+        await client.disconnect()
+
+    assert [(request["method"], request["params"]) for request in fake_engine.requests] == [
+        ("GetObject", ["gone"]), ("GetObject", ["margin"]), ("GetLayout", {}),
+    ]
+
+
+@pytest.mark.unit
+async def test_container_stubs_expand_selected_tabs(fake_engine):
+    """Stubs carry a cursor; expanding one tab reuses the cached container"""
+    from src.qlik_client import decode_container_cursor
+
+    objects = sheet_objects()
+    fake_engine.handlers.update(sheet_handlers(objects))
+    client = fake_engine.attach(AsyncQlikClient())
+    assert await client.connect("app-1")
+    try:
+        result = await client.get_sheet_objects("sheet", resolve_master_items=False, expand_containers=False)
+        opened = [request["params"][0] for request in fake_engine.requests if request["method"] == "GetObject"]
+        fake_engine.requests.clear()
+
+        tabs = result["objects"][2]
+        expanded = await client.expand_container(
+            "tabs", tabs=["Two", "missing"], resolve_master_items=False, sheet_id="sheet",
+        )
+    finally:
+        await client.disconnect()
+
+    assert opened == ["sheet", "kpi", "vizlib", "tabs"]
+    assert tabs["expanded"] is False
+    assert "embedded_objects" not in tabs
+    assert [tab["id"] for tab in tabs["container_structure"]["tabs"]] == ["tab1", "tab2"]
+    assert decode_container_cursor(tabs["cursor"]) == {
+        "app_id": "app-1", "sheet_id": "sheet", "container_id": "tabs", "depth": 1,
+    }
+
+    assert [obj["object_id"] for obj in expanded["embedded_objects"]] == ["margin"]
+    assert expanded["unmatched_tabs"] == ["missing"]
+    assert [(request["method"], request["params"]) for request in fake_engine.requests] == [
+        ("GetObject", ["margin"]), ("GetLayout", {}),
+    ]
+
+
+@pytest.mark.unit
+async def test_nested_containers_are_returned_as_stubs(fake_engine):
+    """A container inside an expanded container gets a cursor one level deeper"""
+    from src.qlik_client import decode_container_cursor
+
+    objects = sheet_objects()
+    objects["inner"] = container("inner", "container", {"tabs": [{"label": "Inner", "id": "i1", "objectId": "kpi"}]})
+    objects["tabs"]["props"]["tabs"][1]["objectId"] = "inner"
+    result = await fetch_sheet(fake_engine, objects, max_depth=1)
+
+    inner = result["objects"][2]["embedded_objects"][2]
+    assert inner["object_id"] == "inner"
+    assert inner["is_container"] is True
+    assert decode_container_cursor(inner["cursor"])["depth"] == 2
+
+
+@pytest.mark.unit
+async def test_expand_container_tool_checks_cursor(fake_engine, fake_engine_pool):
+    """The tool rejects malformed cursors and cursors of other apps"""
+    from src.qlik_client import encode_container_cursor
+    from src.tools import expand_container
+
+    malformed = await expand_container("app-1", "not a cursor!")
+    assert malformed["error"].startswith("Invalid container cursor")
+
+    other_app = await expand_container("app-1", encode_container_cursor("app-2", "sheet", "tabs", 1))
+    assert other_app["error"] == "Cursor belongs to app app-2"
+
+    fake_engine.handlers.update(sheet_handlers(sheet_objects()))
+    expanded = await expand_container(
+        "app-1", encode_container_cursor("app-1", "sheet", "vizlib", 1), tabs=["t1"], resolve_master_items=False,
+    )
+    assert expanded["sheet_id"] == "sheet"
+    assert [obj["object_id"] for obj in expanded["embedded_objects"]] == ["trend", "shared"]
+
+
+def nested_container_sheet() -> dict[str, dict]:
+    """The sample sheet with a VizlibContainer inside the tabbed container's second tab
+
+    The inner container shows a chart in one cell and itself in another.
+    """
+    objects = sheet_objects()
+    objects["inner"] = container("inner", "VizlibContainer", {"qProp": {"containerObjects": [
+        {"label": "Deep", "cId": "d1", "gridView": {"masterItems": [
+            {"masterItemId": "deep", "label": "Cell"},
+            {"masterItemId": "inner", "label": "Loop"},
+        ]}},
+    ]}})
+    objects["deep"] = chart("deep", "Units")
+    objects["tabs"]["props"]["tabs"][1]["objectId"] = "inner"
+    return objects
+
+
+@pytest.mark.unit
+async def test_nested_containers_are_expanded_recursively(fake_engine):
+    """Containers inside container tabs are expanded level by level, each once"""
+    result = await fetch_sheet(fake_engine, nested_container_sheet())
+
+    inner = result["objects"][2]["embedded_objects"][2]
+    assert inner["object_id"] == "inner"
+    assert inner["container_structure"]["tabs"][0]["master_items"] == ["deep", "inner"]
+    deep, loop = inner["embedded_objects"]
+    assert deep["measures"] == [{"label": "Units", "expression": "Sum(Units)"}]
+    assert loop["circular_reference"] is True
+    assert "embedded_objects" not in loop
+
+    traversal = result["container_traversal"]
+    assert traversal["levels"] == 2
+    assert traversal["containers_expanded"] == 3
+    assert traversal["circular_references"] == ["inner"]
+    assert traversal["truncated"] is False
+
+    opened = [request["params"][0] for request in fake_engine.requests if request["method"] == "GetObject"]
+    assert opened.count("inner") == 1
+
+
+@pytest.mark.unit
+async def test_property_tree_expands_nested_containers(fake_engine):
+    """Containers nested below the sheet's own containers continue through the layout walk"""
+    from_layouts = await fetch_sheet(fake_engine, nested_container_sheet())
+    from_tree = await fetch_sheet(fake_engine, nested_container_sheet(), use_property_tree=True)
+
+    assert from_tree["objects"] == from_layouts["objects"]
+    assert from_tree["container_traversal"]["levels"] == 2
+
+
+@pytest.mark.unit
+async def test_traversal_stops_at_node_budget(fake_engine):
+    """Containers whose contents exceed max_nodes are returned as stubs"""
+    result = await fetch_sheet(fake_engine, nested_container_sheet(), max_nodes=2)
+
+    vizlib, tabs = result["objects"][1], result["objects"][2]
+    assert vizlib["embedded_object_count"] == 2
+    assert tabs["expanded"] is False
+    assert "cursor" in tabs
+    assert result["container_traversal"]["truncated"] is True
+    assert result["container_traversal"]["objects"] == 2
@@ -0,0 +1,61 @@
+"""Test coalescing of identical concurrent tool calls"""
+
+import asyncio
+
+import pytest
+
+from src.single_flight import SingleFlight, get_single_flight
+from src.tools import get_app_measures
+from tests.test_async_client import measure_list_handlers
+
+
+@pytest.mark.unit
+async def test_concurrent_identical_calls_share_one_run():
+    """Callers with the same key await one execution"""
+    group = SingleFlight(enabled=True)
+    runs = 0
+
+    async def fetch():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.05)
+        return {"value": runs}
+
+    results = await asyncio.gather(*(group.run("key", fetch) for _ in range(5)))
+    other = await group.run("key", fetch)
+
+    assert [result["value"] for result in results] == [1] * 5
+    assert other["value"] == 2
+    assert group.get_stats() == {"calls": 6, "executed": 2, "coalesced": 4, "in_flight": 0}
+
+
+@pytest.mark.unit
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    """The shared call keeps running for the remaining callers"""
+    group = SingleFlight(enabled=True)
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.create_task(group.run("key", fetch))
+    second = asyncio.create_task(group.run("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+
+
+@pytest.mark.unit
+async def test_tool_calls_coalesce_into_one_engine_session(fake_engine, fake_engine_pool):
+    """Identical concurrent tool calls open a single app session"""
+    fake_engine.handlers.update(measure_list_handlers(delay=0.05))
+
+    results = await asyncio.gather(*(get_app_measures("app-1") for _ in range(3)))
+    different = await get_app_measures("app-1", include_tags=False)
+
+    assert all(result["count"] == 1 for result in results)
+    assert different["count"] == 1
+    open_docs = [request for request in fake_engine.requests if request["method"] == "OpenDoc"]
+    assert len(open_docs) == 2
+    assert get_single_flight().get_stats()["coalesced"] == 2
@@ -0,0 +1,122 @@
+"""Test the whole-app snapshot tool against an in-process fake Engine"""
+
+import pytest
+
+from src.tools import get_app_snapshot
+
+
+def snapshot_handlers():
+    """Handlers serving a measure list, a sheet list and a short script"""
+    list_handles = {"MeasureList": 2, "SheetList": 3}
+
+    def create_session_object(request):
+        handle = list_handles[request["params"][0]["qInfo"]["qType"]]
+        return {"qReturn": {"qHandle": handle, "qType": "GenericObject"}}
+
+    def get_layout(request):
+        if request["handle"] == 2:
+            item = {"qInfo": {"qId": "m1"}, "qData": {"id": "m1", "title": "Sales", "expression": {"qDef": "Sum(x)"}}}
+            return {"qLayout": {"qMeasureList": {"qItems": [item]}}}
+        item = {"qInfo": {"qId": "s1"}, "qMeta": {}, "qData": {"title": "Overview", "rank": 1}}
+        return {"qLayout": {"qAppObjectList": {"qItems": [item]}}}
+
+    return {
+        "CreateSessionObject": create_session_object,
+        "GetLayout": get_layout,
+        "GetScript": lambda request: {
+            "qScript": (
+                "///$tab Main\n"
+                "OLEDB CONNECT TO [Provider=SQLOLEDB;User ID=sa;Password=hunter2];\n"
+                "LOAD * FROM [lib://Data/a.qvd] (qvd);"
+            ),
+        },
+    }
+
+
+@pytest.fixture
+def snapshot_pool(fake_engine, fake_engine_pool):
+    """Serve snapshot sections from the fake Engine"""
+    fake_engine.handlers.update(snapshot_handlers())
+    return fake_engine_pool
+
+
+@pytest.mark.unit
+async def test_snapshot_collects_selected_sections(fake_engine, snapshot_pool):
+    """Selected sections share one connection and each reports its timing"""
+    result = await get_app_snapshot(
+        "app-1",
+        include_dimensions=False,
+        include_variables=False,
+        include_fields=False,
+        include_sheet_objects=False,
+        include_lineage=False,
+    )
+
+    assert "error" not in result
+    assert set(result["sections"]) == {"measures", "sheets", "script_analysis"}
+    assert result["sections"]["measures"]["count"] == 1
+    assert result["sections"]["sheets"]["retrieval_method"] == "sheet_list"
+    assert result["sections"]["script_analysis"]["sections"][0]["name"] == "Main"
+    assert "content" not in result["sections"]["script_analysis"]["sections"][0]
+    assert "hunter2" not in str(result)
+    assert {"connect", "measures", "sheets", "script_analysis", "total"} <= set(result["timings_ms"])
+
+    open_docs = [request for request in fake_engine.requests if request["method"] == "OpenDoc"]
+    assert len(open_docs) == 1
+
+
+@pytest.mark.unit
+async def test_snapshot_reports_failed_sections(fake_engine, snapshot_pool):
+    """A failing section is reported without discarding the others"""
+    result = await get_app_snapshot(
+        "app-1",
+        include_dimensions=False,
+        include_variables=False,
+        include_fields=False,
+        include_sheets=False,
+        include_sheet_objects=False,
+        include_script_analysis=False,
+    )
+
+    assert set(result["sections"]) == {"measures"}
+    assert "Engine API Error" in result["errors"]["lineage"]
+
+
+@pytest.mark.unit
+async def test_snapshot_with_failed_section_is_not_cached(fake_engine, snapshot_pool):
+    """A partial snapshot is refetched on the next call instead of served from cache"""
+    options = {
+        "include_dimensions": False,
+        "include_variables": False,
+        "include_fields": False,
+        "include_sheets": False,
+        "include_sheet_objects": False,
+        "include_script_analysis": False,
+    }
+
+    first = await get_app_snapshot("app-1", **options)
+    fake_engine.handlers["GetLineage"] = lambda request: {
+        "qLineage": [{"qDiscriminator": "lib://Data/a.qvd", "qStatement": ""}],
+    }
+    second = await get_app_snapshot("app-1", **options)
+    third = await get_app_snapshot("app-1", **options)
+
+    assert "lineage" in first["errors"]
+    assert second["served_from_cache"] is False
+    assert "errors" not in second
+    assert "lineage" in second["sections"]
+    assert third["served_from_cache"] is True
+
+
+@pytest.mark.unit
+async def test_uncached_snapshot_leaves_metadata_cache_alone(fake_engine, snapshot_pool):
+    """Snapshots taken with use_cache=False are neither served from nor stored in the cache"""
+    from src.metadata_cache import get_metadata_cache
+
+    options = {"include_sheet_objects": False, "include_lineage": False, "use_cache": False}
+    first = await get_app_snapshot("app-1", **options)
+    second = await get_app_snapshot("app-1", **options)
+
+    assert first["served_from_cache"] is False
+    assert second["served_from_cache"] is False
+    assert get_metadata_cache().get_stats()["entries"] == 0
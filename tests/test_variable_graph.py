@@ -0,0 +1,134 @@
+"""Test the variable dependency graph and its tool against a fake Engine"""
+
+import pytest
+
+from src.tools import get_variable_graph
+from src.variable_graph import VariableGraph, build_variable_definitions
+
+
+def make_graph(definitions: dict[str, str]) -> VariableGraph:
+    """Graph of app variables with the given definitions"""
+    return VariableGraph(build_variable_definitions(
+        [{"name": name, "definition": definition} for name, definition in definitions.items()], [], [],
+    ))
+
+
+@pytest.mark.unit
+def test_order_depth_and_expansion():
+    """Dependencies come first and nested expansions are substituted"""
+    graph = make_graph({
+        "vTotal": "Sum({<Year={$(vYear)}>} $(vField))",
+        "vYear": "$(vBase)+1",
+        "vBase": "2024",
+        "vField": "Sales",
+        "vScaled": "$(vMul(vTotal, 2))",
+        "vMul": "$1*$2",
+    })
+
+    order = graph.topological_order()
+    assert order.index("vBase") < order.index("vYear") < order.index("vTotal")
+    assert graph.depths()["vTotal"] == 2
+    assert graph.expand("vTotal") == "Sum({<Year={2024+1}>} Sales)"
+    assert graph.expand("vScaled") == "vTotal*2"
+
+
+@pytest.mark.unit
+def test_cycles_and_undefined_references():
+    """Circular expansions are reported and left unexpanded"""
+    graph = make_graph({"vA": "$(vB)", "vB": "$(VA)", "vC": "$(vA) + $(vMissing)"})
+
+    assert graph.cycles == [["vA", "vB", "vA"]]
+    assert graph.topological_order() == ["vC"]
+    assert graph.expand("vC") == "$(vA) + $(vMissing)"
+    assert graph.unresolved_references() == {"vC": ["vMissing"]}
+
+
+@pytest.mark.unit
+def test_deep_chain_expands_without_recursion_limit():
+    """A 5,000-level chain is ordered and expanded once per variable"""
+    definitions = {f"v{index}": f"$(v{index + 1})" for index in range(5000)}
+    definitions["v5000"] = "1"
+    graph = make_graph(definitions)
+
+    assert graph.expand_all()["v0"] == "1"
+    assert graph.depths()["v0"] == 5000
+
+
+@pytest.mark.unit
+def test_script_definitions_fill_in_app_variables():
+    """App definitions win; script SET/LET adds variables the app lacks"""
+    definitions = build_variable_definitions(
+        [{"name": "vYear", "definition": "2025"}],
+        [{"name": "VYEAR", "value": "2024", "line": 3}, {"name": "vPath", "value": "lib://Data/", "line": 4}],
+        [{"name": "vNow", "value": "Now()", "line": 5}],
+    )
+
+    assert definitions["vYear"] == {"definition": "2025", "sources": ["app", "SET"], "line": 3}
+    assert definitions["vPath"]["sources"] == ["SET"]
+    assert definitions["vNow"]["definition"] == "Now()"
+
+
+@pytest.fixture
+def variable_pool(fake_engine, fake_engine_pool):
+    """Serve a variable list, a script and variable values from the fake Engine"""
+    names = ["vTotal", "vYear"]
+    items = [
+        {"qInfo": {"qId": "v1"}, "qData": {"name": "vTotal", "definition": "=Sum({<Year={$(vYear)}>} Sales)"}},
+        {"qInfo": {"qId": "v2"}, "qData": {"name": "vYear", "definition": "$(vBase)+1"}},
+    ]
+
+    def get_layout(request):
+        if request["handle"] == 2:
+            return {"qLayout": {"qVariableList": {"qItems": items}}}
+        return {"qLayout": {"qText": f"value of {names[request['handle'] - 100]}", "qNum": 1}}
+
+    fake_engine.handlers.update({
+        "CreateSessionObject": lambda request: {"qReturn": {"qHandle": 2, "qType": "GenericObject"}},
+        "GetLayout": get_layout,
+        "GetScript": lambda request: {"qScript": "SET vBase = 2024;"},
+        "GetVariableByName": lambda request: {"qReturn": {"qHandle": 100 + names.index(request["params"]["qName"])}},
+    })
+    return fake_engine_pool
+
+
+@pytest.mark.unit
+async def test_tool_evaluates_variables_in_two_round_trips(fake_engine, variable_pool):
+    """App variables are evaluated in one burst of lookups and one of layouts"""
+    result = await get_variable_graph("app-1", evaluate=True)
+
+    assert "error" not in result
+    assert result["order"] == ["vBase", "vYear", "vTotal"]
+    assert result["variables"]["vTotal"]["expansion"] == "=Sum({<Year={2024+1}>} Sales)"
+    assert result["variables"]["vTotal"]["value"]["text"] == "value of vTotal"
+    assert "value" not in result["variables"]["vBase"]
+    assert result["evaluation"] == {"evaluated": 2, "round_trips": 2}
+
+    lookups = [request for request in fake_engine.requests if request["method"] == "GetVariableByName"]
+    assert len(lookups) == 2
+
+
+@pytest.mark.unit
+async def test_tool_caches_graph_but_evaluates_fresh(fake_engine, variable_pool):
+    """Repeated evaluations reuse the cached graph and fetch current values"""
+    layout = fake_engine.handlers["GetLayout"]
+    calls = {"count": 0}
+
+    def changing_layout(request):
+        if request["handle"] >= 100:
+            calls["count"] += 1
+            return {"qLayout": {"qText": f"value {calls['count']}", "qNum": calls["count"]}}
+        return layout(request)
+
+    fake_engine.handlers["GetLayout"] = changing_layout
+
+    first = await get_variable_graph("app-1", evaluate=True)
+    second = await get_variable_graph("app-1", evaluate=True)
+    static = await get_variable_graph("app-1")
+
+    assert first["served_from_cache"] is False
+    assert second["served_from_cache"] is True
+    assert first["variables"]["vTotal"]["value"] != second["variables"]["vTotal"]["value"]
+    assert second["options"]["evaluate"] is True
+    assert "value" not in static["variables"]["vTotal"]
+    assert "evaluation" not in static
+    assert static["options"]["evaluate"] is False